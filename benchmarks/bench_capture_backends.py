@@ -0,0 +1,68 @@
+"""
+Screen capture time of every available capture backend, to pick the fastest one
+for "Screen Capture Backend" setting on this machine.
+
+Usage:
+    python benchmarks/bench_capture_backends.py [--repeat 20]
+
+Needs a real display. Time includes conversion to the BGR array OCR engines get.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from PyQt6.QtWidgets import QApplication
+
+from App.capture_backends import CAPTURE_BACKENDS
+
+def areas(screen):
+    geometry = screen.geometry()
+    full = (geometry.x(), geometry.y(), geometry.x() + geometry.width(), geometry.y() + geometry.height())
+    return {
+        "speech bubble 300x200": (geometry.x() + 100, geometry.y() + 100, geometry.x() + 400, geometry.y() + 300),
+        "page 900x1200": (geometry.x(), geometry.y(), geometry.x() + min(900, geometry.width()), geometry.y() + min(1200, geometry.height())),
+        f"full screen {geometry.width()}x{geometry.height()}": full,
+    }
+
+def bench(backend, bbox, repeat):
+    backend.grab(bbox)  # warm up (connections, shared memory segments)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.grab(bbox)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    backends = {}
+    for name, backend_class in CAPTURE_BACKENDS.items():
+        try:
+            backends[name] = backend_class()
+        except ImportError as e:
+            print(f"{name}: not available ({e})")
+
+    print(f"{'area':<28}" + "".join(f"{name + ' ms':>12}" for name in backends))
+    for label, bbox in areas(app.primaryScreen()).items():
+        row = f"{label:<28}"
+        for name, backend in backends.items():
+            try:
+                row += f"{bench(backend, bbox, args.repeat) * 1000:>12.2f}"
+            except Exception as e:
+                print(f"{name} failed on {label}: {e}")
+                row += f"{'-':>12}"
+        print(row)
+
+    for backend in backends.values():
+        backend.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Payload size and encode time of OpenAI OCR upload encodings.
+
+Usage:
+    python benchmarks/bench_image_encoding.py [image ...]
+
+Without images a synthetic multi-monitor sized capture with text is used.
+"""
+import argparse
+import base64
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import cv2
+import numpy as np
+
+from OCR.image_encoding import EncodingOptions, encode_image
+
+OPTIONS = {
+    "png": EncodingOptions("PNG"),
+    "png gray": EncodingOptions("PNG", grayscale=True),
+    "png 1568px": EncodingOptions("PNG", max_long_edge=1568),
+    "jpeg q90": EncodingOptions("JPEG", quality=90),
+    "jpeg q75": EncodingOptions("JPEG", quality=75),
+    "jpeg q75 1568px": EncodingOptions("JPEG", quality=75, max_long_edge=1568),
+    "jpeg q75 1MP gray": EncodingOptions("JPEG", quality=75, max_pixels=1_000_000, grayscale=True),
+    "webp q90": EncodingOptions("WEBP", quality=90),
+    "webp q75 1568px": EncodingOptions("WEBP", quality=75, max_long_edge=1568),
+}
+
+def synthetic_capture(width=3840, height=1080):
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)[None, :, None]
+    image = np.broadcast_to(gradient, (height, width, 3)).astype(np.uint8).copy()
+    image += rng.integers(0, 8, image.shape, dtype=np.uint8)
+    for i, y in enumerate(range(80, height, 60)):
+        cv2.putText(image, f"Line {i}: The quick brown fox jumps over the lazy dog 0123456789",
+                    (40, y), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 2, cv2.LINE_AA)
+    return image
+
+def bench(image, options, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded, mime_type = encode_image(image, options)
+        times.append(time.perf_counter() - start)
+    payload = len(base64.b64encode(encoded))
+    return len(encoded), payload, statistics.median(times), mime_type
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*", help="BGR images readable by OpenCV")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    images = [(path, cv2.imread(path)) for path in args.images] or [("synthetic 3840x1080", synthetic_capture())]
+    for name, image in images:
+        if image is None:
+            print(f"Couldn't read {name}, skipping")
+            continue
+        print(f"\n{name} ({image.shape[1]}x{image.shape[0]}, raw {image.nbytes / 1024:.0f} KiB)")
+        print(f"{'option':<20}{'encoded KiB':>12}{'base64 KiB':>12}{'encode ms':>11}  mime")
+        for label, options in OPTIONS.items():
+            size, payload, seconds, mime_type = bench(image, options, args.repeat)
+            print(f"{label:<20}{size / 1024:>12.1f}{payload / 1024:>12.1f}{seconds * 1000:>11.1f}  {mime_type}")
+
+if __name__ == "__main__":
+    main()
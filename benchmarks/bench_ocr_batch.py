@@ -0,0 +1,72 @@
+"""
+OCR throughput of predict() one by one vs predict_batch() at several batch sizes.
+
+Usage:
+    python benchmarks/bench_ocr_batch.py [--engine MangaOCR] [--batch-sizes 1 2 4 8 16] [image ...]
+
+Images are used as text crops (speech bubbles, lines, ...). Without images
+synthetic text lines are used. The OCR cache is bypassed, engines are called directly.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import cv2
+import numpy as np
+
+from OCR.ocr_manager import OcrManager
+
+def synthetic_crops(count):
+    crops = []
+    for i in range(count):
+        image = np.full((64, 480, 3), 255, dtype=np.uint8)
+        cv2.putText(image, f"Sample text line {i} 0123456789", (10, 44),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2, cv2.LINE_AA)
+        crops.append(image)
+    return crops
+
+def throughput(fn, images, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(images)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(images) / best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*", help="text crops readable by OpenCV")
+    parser.add_argument("--engine", default="MangaOCR", choices=sorted(OcrManager._available_engines))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    crops = [cv2.imread(path) for path in args.images]
+    crops = [crop for crop in crops if crop is not None] or synthetic_crops(max(args.batch_sizes))
+
+    engine = OcrManager._available_engines[args.engine]()
+    if not engine.isWorking:
+        print(f"Couldn't load {args.engine}")
+        return 1
+    try:
+        # Warm up lazy initialization (kernels, caches) before timing
+        engine.predict_batch(crops[:2])
+
+        print(f"{args.engine}, {len(crops)} distinct crops")
+        print(f"{'batch':>6}{'sequential img/s':>18}{'batched img/s':>15}{'speedup':>9}")
+        for batch_size in args.batch_sizes:
+            images = [crops[i % len(crops)] for i in range(batch_size)]
+            sequential = throughput(lambda batch: [engine.predict(image) for image in batch], images, args.repeat)
+            batched = throughput(engine.predict_batch, images, args.repeat)
+            print(f"{batch_size:>6}{sequential:>18.2f}{batched:>15.2f}{batched / sequential:>8.2f}x")
+    finally:
+        close = getattr(engine, "close", None)
+        if callable(close):
+            close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Screen capture backends. All of them return BGR uint8 arrays (what OCR engines take),
+converting straight into that layout instead of RGB array + cv2.cvtColor pass.
+
+    backend = create_backend(settings_service.get("capture_backend"))
+    image = backend.grab((left, top, right, bottom))
+"""
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+class CaptureBackend(ABC):
+    name = ""
+
+    @abstractmethod
+    def grab(self, bbox):
+        """
+        Args:
+            bbox (tuple): (left, top, right, bottom) in virtual desktop coordinates.
+
+        Returns:
+            np.array: BGR image of that area (may be a read-only view, don't modify in place).
+        """
+        pass
+
+    def close(self):
+        pass
+
+class PilCaptureBackend(CaptureBackend):
+    """PIL.ImageGrab, works everywhere PIL can grab (Windows, macOS, X11)."""
+    name = "pil"
+
+    def __init__(self):
+        from PIL import ImageGrab
+        self._grab = ImageGrab.grab
+
+    def grab(self, bbox):
+        screenshot = self._grab(bbox=bbox, all_screens=True)
+        if screenshot.mode != "RGB":
+            screenshot = screenshot.convert("RGB")
+        width, height = screenshot.size
+        # PIL's raw encoder swaps channels while serializing, one copy instead of asarray + cvtColor
+        return np.frombuffer(screenshot.tobytes("raw", "BGR"), dtype=np.uint8).reshape(height, width, 3)
+
+class QtCaptureBackend(CaptureBackend):
+    """QScreen.grabWindow, no extra dependencies, has to run on GUI thread."""
+    name = "qt"
+
+    def grab(self, bbox):
+        from PyQt6.QtCore import QRect
+        from PyQt6.QtGui import QImage
+        from PyQt6.QtWidgets import QApplication
+        import cv2
+
+        left, top, right, bottom = bbox
+        area = QRect(left, top, right - left, bottom - top)
+        frame = np.zeros((area.height(), area.width(), 3), dtype=np.uint8)
+        for screen in QApplication.screens():
+            part = area.intersected(screen.geometry())
+            if part.isEmpty():
+                continue
+            geometry = screen.geometry()
+            pixmap = screen.grabWindow(0, part.x() - geometry.x(), part.y() - geometry.y(), part.width(), part.height())
+            image = pixmap.toImage().convertToFormat(QImage.Format.Format_BGR888)
+            pixels = self._image_view(image)
+            # HiDPI screens return device pixels, selection is in logical ones
+            if pixels.shape[1] != part.width() or pixels.shape[0] != part.height():
+                pixels = cv2.resize(pixels, (part.width(), part.height()), interpolation=cv2.INTER_AREA)
+            x, y = part.x() - area.x(), part.y() - area.y()
+            frame[y:y + part.height(), x:x + part.width()] = pixels
+        return frame
+
+    @staticmethod
+    def _image_view(image):
+        """View of QImage (Format_BGR888) memory, valid while image lives."""
+        pointer = image.constBits()
+        pointer.setsize(image.sizeInBytes())
+        rows = np.frombuffer(pointer, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+        return rows[:, :image.width() * 3].reshape(image.height(), image.width(), 3)
+
+class MssCaptureBackend(CaptureBackend):
+    """mss (X11 shared memory / GDI / CoreGraphics), usually fastest for big areas."""
+    name = "mss"
+
+    def __init__(self):
+        import mss
+        self._mss = mss.mss()
+
+    def grab(self, bbox):
+        left, top, right, bottom = bbox
+        shot = self._mss.grab({"left": left, "top": top, "width": right - left, "height": bottom - top})
+        # BGRA buffer, dropping alpha is just a view
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return bgra[:, :, :3]
+
+    def close(self):
+        self._mss.close()
+
+CAPTURE_BACKENDS = {
+    backend.name: backend for backend in (PilCaptureBackend, QtCaptureBackend, MssCaptureBackend)
+}
+
+def create_backend(name):
+    """Create backend by name, falls back to PIL when it's unknown or its dependency is missing."""
+    backend_class = CAPTURE_BACKENDS.get(name)
+    if backend_class is None:
+        print(f"Unknown capture backend '{name}', using pil")
+        backend_class = PilCaptureBackend
+    try:
+        return backend_class()
+    except ImportError as e:
+        print(f"Capture backend '{name}' is not available ({e}), using pil")
+        return PilCaptureBackend()
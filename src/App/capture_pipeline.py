@@ -0,0 +1,188 @@
+from itertools import count
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
+
+from Util.engine_status import EngineStatus
+from App.ocr_window import format_segments
+from App.task_scheduler import task_scheduler, Priority
+
+class OcrJobSignals(QObject):
+    """Signals from a running OCR job.
+
+    finished
+        job_id, recognized text, engine name
+    batchFinished
+        job_id, list of recognized texts, engine name
+    error
+        job_id, error text
+    """
+
+    finished = pyqtSignal(int, str, str)
+    batchFinished = pyqtSignal(int, list, str)
+    error = pyqtSignal(int, str)
+
+class OcrJob(QRunnable):
+    def __init__(self, job_id, OcrManager, image):
+        super().__init__()
+        self.signals = OcrJobSignals()
+        self.job_id = job_id
+        self.OcrManager = OcrManager
+        self.image = image
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            text = self.OcrManager.predict(self.image)
+            self.signals.finished.emit(self.job_id, text or "", self.OcrManager.getCurrentEngine())
+        except Exception as e:
+            print(f"Error during OCR job {self.job_id}: {e}")
+            self.signals.error.emit(self.job_id, str(e))
+
+class OcrBatchJob(OcrJob):
+    """OCR of several regions from one capture, in one batched engine call."""
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            texts = self.OcrManager.predict_batch(self.image)
+            self.signals.batchFinished.emit(self.job_id, [text or "" for text in texts], self.OcrManager.getCurrentEngine())
+        except Exception as e:
+            print(f"Error during OCR job {self.job_id}: {e}")
+            self.signals.error.emit(self.job_id, str(e))
+
+class CapturePipeline(QObject):
+    """
+    capture -> OCR -> translate
+
+    Selection still happens on the GUI thread (it's an overlay), but OCR runs
+    on a worker so the UI and hotkeys stay responsive during inference.
+    Only the most recent job is ever shown, starting a new capture or calling
+    cancel() drops the pending one.
+    """
+    ocrStarted = pyqtSignal(int, str)        # job_id, engine_name
+    ocrFinished = pyqtSignal(int, str, str)  # job_id, text, engine_name
+    ocrFailed = pyqtSignal(int, str)         # job_id, error_message
+    ocrCancelled = pyqtSignal(int)           # job_id
+
+    def __init__(self, screenshot_controller, OcrManager, ocrWindow, parent=None):
+        super().__init__(parent)
+        self.screenshot_controller = screenshot_controller
+        self.OcrManager = OcrManager
+        self.ocrWindow = ocrWindow
+
+        # Engines aren't thread safe (torch/paddle), so jobs run one at a time ("ocr" limit).
+        # A cancelled job that is already running finishes in background and its result is dropped.
+        self.threadpool = task_scheduler.lane("ocr", Priority.INTERACTIVE)
+
+        self._job_ids = count(1)
+        self._current_job = None
+        self._translate_current = False
+
+    @property
+    def isBusy(self):
+        return self._current_job is not None
+
+    def capture(self, translate=True, multi=False):
+        """
+        Let user select region, then OCR it (and translate if requested).
+        With multi user can select several regions, they're OCR'd as numbered segments.
+        """
+        self.cancel()
+
+        if multi:
+            images = self.screenshot_controller.start_selection(multi=True)
+            if not images:
+                return None
+            return self.submit_batch(images, translate=translate)
+
+        img = self.screenshot_controller.start_selection()
+        if img is None:
+            return None
+        return self.submit(img, translate=translate)
+
+    def submit(self, image, translate=True, focus=True):
+        """
+        Queue OCR of already captured image. Returns job id.
+        With focus=False OCR window is shown without activating it (watch mode).
+        """
+        return self._start(OcrJob(next(self._job_ids), self.OcrManager, image), translate, focus)
+
+    def submit_batch(self, images, translate=True):
+        """Queue OCR of several captured regions as one batch. Returns job id."""
+        return self._start(OcrBatchJob(next(self._job_ids), self.OcrManager, list(images)), translate)
+
+    def _start(self, job, translate, focus=True):
+        self.cancel()
+
+        job.signals.finished.connect(self.on_ocr_finished)
+        job.signals.batchFinished.connect(self.on_ocr_batch_finished)
+        job.signals.error.connect(self.on_ocr_error)
+
+        self._current_job = job
+        self._translate_current = translate
+
+        engine_name = self.OcrManager.getCurrentEngine()
+        self.ocrWindow.show()
+        if focus:
+            self.ocrWindow.activateWindow()
+            self.ocrWindow.raise_()
+        if self.OcrManager.status().state == EngineStatus.LOADING:
+            self.ocrWindow.setOcrWaiting(engine_name)
+        else:
+            self.ocrWindow.setOcrPending(engine_name)
+        self.ocrStarted.emit(job.job_id, engine_name)
+
+        self.threadpool.start(job)
+        return job.job_id
+
+    def cancel(self):
+        """Cancel pending OCR job, if there's any."""
+        job = self._current_job
+        if job is None:
+            return
+        self._current_job = None
+
+        # Not started yet, we can just take it out of the queue
+        self.threadpool.tryTake(job)
+
+        self.ocrWindow.setOcrCancelled()
+        self.ocrCancelled.emit(job.job_id)
+
+    def _is_current(self, job_id):
+        return self._current_job is not None and self._current_job.job_id == job_id
+
+    @pyqtSlot(int, str, str)
+    def on_ocr_finished(self, job_id, text, engine_name):
+        if not self._is_current(job_id):
+            return
+        self._current_job = None
+
+        self.ocrWindow.setOcr(text, engine_name)
+        self.ocrFinished.emit(job_id, text, engine_name)
+        # Nothing to translate when capture had no text
+        if self._translate_current and text.strip():
+            self.ocrWindow.startRetranslate()
+        else:
+            self.ocrWindow.cancelSuperseded()
+
+    @pyqtSlot(int, list, str)
+    def on_ocr_batch_finished(self, job_id, texts, engine_name):
+        if not self._is_current(job_id):
+            return
+        self._current_job = None
+
+        self.ocrWindow.setOcrSegments(texts, engine_name)
+        self.ocrFinished.emit(job_id, format_segments(texts), engine_name)
+        if self._translate_current and any(text.strip() for text in texts):
+            self.ocrWindow.startRetranslate()
+        else:
+            self.ocrWindow.cancelSuperseded()
+
+    @pyqtSlot(int, str)
+    def on_ocr_error(self, job_id, error_text):
+        if not self._is_current(job_id):
+            return
+        self._current_job = None
+
+        self.ocrWindow.setOcrError(error_text, self.OcrManager.getCurrentEngine())
+        self.ocrFailed.emit(job_id, error_text)
@@ -0,0 +1,47 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
+
+from App.task_scheduler import task_scheduler, Priority
+
+class EngineLoadJob(QRunnable):
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            self.fn()
+        except Exception as e:
+            # Already recorded in engine status, UI shows it
+            print(f"Engine loading failed: {e}")
+
+class EngineWarmup(QObject):
+    """
+    Loads OCR and translation engines in background, so main window shows up
+    right away instead of waiting for models.
+
+    statusChanged is emitted on GUI thread whenever some engine changes state,
+    also for later engine swaps from settings.
+    """
+    statusChanged = pyqtSignal(str, str, str)  # kind ("ocr"/"translation"), engine_name, state
+
+    def __init__(self, OcrManager, TranslationManager, parent=None):
+        super().__init__(parent)
+        self.OcrManager = OcrManager
+        self.TranslationManager = TranslationManager
+        # Captures and translations made meanwhile go first
+        self.threadpool = task_scheduler.lane("warmup", Priority.BACKGROUND)
+
+        # Listeners run on loading thread, signal gets queued to GUI thread
+        OcrManager.add_status_listener(lambda status: self.statusChanged.emit("ocr", status.name, status.state))
+        TranslationManager.add_status_listener(lambda status: self.statusChanged.emit("translation", status.name, status.state))
+
+    def start(self):
+        """Start loading engines that aren't loaded yet."""
+        self.threadpool.start(EngineLoadJob(self.OcrManager.load))
+        self.threadpool.start(EngineLoadJob(self.TranslationManager.load))
+
+    def statuses(self):
+        """Returns list of (kind, EngineStatus)."""
+        return ([("ocr", self.OcrManager.status())]
+                + [("translation", status) for status in self.TranslationManager.statuses()])
@@ -1,11 +1,14 @@
 from PyQt6.QtCore import QSize, Qt
-from PyQt6.QtWidgets import QMainWindow, QPushButton, QWidget, QVBoxLayout, QTabWidget, QMessageBox
+from PyQt6.QtWidgets import QMainWindow, QPushButton, QWidget, QVBoxLayout, QTabWidget, QMessageBox, QLabel
 
 from App.tabs.settings_tab import SettingsTab
 from App.ocr_window import OcrWindow
 
 from App.hotkey_manager import HotkeyManager
 from App.screenshot import ScreenshotController
+from App.capture_pipeline import CapturePipeline
+from App.engine_warmup import EngineWarmup
+from App.watch_mode import WatchController
 
 class MainWindow(QMainWindow):
     def __init__(self, OcrManager, TranslationManager):
@@ -19,6 +22,12 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
 
+        # Engines load in background, show how far they got
+        self.engineStatusLabel = QLabel()
+        layout.addWidget(self.engineStatusLabel)
+        self.engine_warmup = EngineWarmup(self.OcrManager, self.TranslationManager, parent=self)
+        self.engine_warmup.statusChanged.connect(self.updateEngineStatus)
+
         # Initialize hotkey manager
         self.hotkey_manager = HotkeyManager()
         self.hotkey_manager.hotkey_triggered.connect(self.handleHotkey)
@@ -29,33 +38,41 @@ class MainWindow(QMainWindow):
 
         self.screenshot_controller = ScreenshotController()
         self.ocrWindow = OcrWindow(self.TranslationManager)
+        self.capture_pipeline = CapturePipeline(self.screenshot_controller, self.OcrManager, self.ocrWindow, parent=self)
+
+        self.watchStatusLabel = QLabel()
+        layout.insertWidget(1, self.watchStatusLabel)
+        self.watch_controller = WatchController(self.screenshot_controller, self.capture_pipeline, parent=self)
+        self.watch_controller.stateChanged.connect(self.updateWatchStatus)
+        self.updateWatchStatus(False)
+
+        self.updateEngineStatus()
+        self.engine_warmup.start()
+
+    def updateEngineStatus(self, *args):
+        lines = []
+        for kind, status in self.engine_warmup.statuses():
+            label = "OCR" if kind == "ocr" else "Translation"
+            lines.append(f"{label}: {status.name} - {status.describe()}")
+        self.engineStatusLabel.setText("\n".join(lines))
+
+    def updateWatchStatus(self, active):
+        self.watchStatusLabel.setText("Watch mode: on" if active else "Watch mode: off")
 
     def handleHotkey(self, action):
         """Handle hotkey actions"""
         if action == 'ocr_capture':
-            img = self.screenshot_controller.start_selection()
-
-            if img is None:
-                return
-            ocrText = self.OcrManager.predict(img)            
-            
-            self.ocrWindow.show()
-            self.ocrWindow.activateWindow()
-            self.ocrWindow.raise_()
-            self.ocrWindow.setOcr(ocrText, self.OcrManager.getCurrentEngine())
-            self.ocrWindow.startRetranslate()
+            self.capture_pipeline.capture(translate=True)
         elif action == 'only_ocr':
-            img = self.screenshot_controller.start_selection()
-
-            if img is None:
-                return
-            ocrText = self.OcrManager.predict(img)            
-            
-            self.ocrWindow.show()
-            self.ocrWindow.activateWindow()
-            self.ocrWindow.raise_()
-            self.ocrWindow.setOcr(ocrText, self.OcrManager.getCurrentEngine())
+            self.capture_pipeline.capture(translate=False)
+        elif action == 'multi_region_ocr':
+            self.capture_pipeline.capture(translate=True, multi=True)
+        elif action == 'watch_mode':
+            self.watch_controller.toggle()
+        elif action == 'watch_region':
+            self.watch_controller.start(reselect=True)
         elif action == 'cancel_selection':
             self.screenshot_controller.cancel_selection()
+            self.capture_pipeline.cancel()
         else:
             print(f"Unknown hotkey action: {action}")
\ No newline at end of file
@@ -1,7 +1,9 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QLabel, QPushButton, QSplitter
-from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot, QRunnable, QThreadPool, Qt
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot, QRunnable, Qt, QTimer
 from PyQt6.QtGui import QTextCursor
 
+from App.task_scheduler import task_scheduler, Priority
+
 class WorkerSignals(QObject):
     """Signals from a running worker thread.
 
@@ -36,15 +38,33 @@ class Worker(QRunnable):
             except Exception:
                 pass
 
+def format_segments(texts):
+    """Numbered segments in selection order, translated together so engines keep the numbering"""
+    return "\n\n".join(f"[{number}] {text.strip()}" for number, text in enumerate(texts, start=1))
+
 class OcrWindow(QWidget):
     retranslateRequested = pyqtSignal(str)
 
+    # Streamed chunks are collected and drawn at most once per frame
+    CHUNK_FLUSH_INTERVAL_MS = 16
+
     def __init__(self, TranslationManager):
         super().__init__()
         self.setWindowTitle("Kawaii Translator - OCR")
         self.TranslationManager = TranslationManager
-        self.threadpool = QThreadPool()
+        self.threadpool = task_scheduler.lane("ui")
         self.setMinimumSize(700,400)
+
+        self.pendingChunks = {}  # engine -> [chunk, ...]
+        self.translationRequests = {}  # engine -> id of the request shown in its widget
+        # (request id, engine or None for all) no longer shown, cancelled once the next request
+        # is issued, so an identical one attaches to the running translation instead of starting over
+        self.supersededRequests = set()
+        self.chunkFlushTimer = QTimer(self)
+        self.chunkFlushTimer.setSingleShot(True)
+        self.chunkFlushTimer.setInterval(self.CHUNK_FLUSH_INTERVAL_MS)
+        self.chunkFlushTimer.timeout.connect(self.flushChunks)
+
         self.setup_ui()
 
         if hasattr(self.TranslationManager, 'signals') and self.TranslationManager.signals:
@@ -52,6 +72,7 @@ class OcrWindow(QWidget):
             self.TranslationManager.signals.translationError.connect(self.on_translation_error)
             self.TranslationManager.signals.translationChunk.connect(self.on_translation_chunk)
             self.TranslationManager.signals.translationComplete.connect(self.on_translation_complete)
+            self.TranslationManager.signals.translationFailover.connect(self.on_translation_failover)
         else:
             print("ERROR: No signals in TranslationManager.")
 
@@ -65,7 +86,8 @@ class OcrWindow(QWidget):
 
 
         self.retranslateBtn = QPushButton("Re-translate")
-        self.retranslateBtn.pressed.connect(self.startRetranslate)
+        # Explicit re-translate asks for fresh result, like the per-engine buttons
+        self.retranslateBtn.pressed.connect(lambda: self.startRetranslate(Priority.RETRANSLATE, use_cache=False))
 
         self.splitter = QSplitter(Qt.Orientation.Vertical)
         # Create container for OCR components
@@ -110,8 +132,10 @@ class OcrWindow(QWidget):
         self.clearLayout(self.translationContainerLayout)
         self.translationWidgets = {}
         self.retranslateButtons = {}
+        self.pendingChunks = {}
 
-        for engine in self.TranslationManager._active_engines.keys():
+        # Also engines that are still loading, their translation shows up once they are ready
+        for engine in self.TranslationManager.engine_names():
             layout = QVBoxLayout()
             text_edit = QPlainTextEdit()
             layout.addWidget(QLabel(engine))
@@ -127,11 +151,39 @@ class OcrWindow(QWidget):
             self.retranslateButtons[engine] = retranslate_btn
     
     def clear_engine_text(self, engine_name):
+        self.pendingChunks.pop(engine_name, None)
         if engine_name in self.translationWidgets:
             self.translationWidgets[engine_name].setPlainText("")
 
+    def supersedeTranslations(self):
+        """Stop showing running translations, their late chunks get dropped"""
+        self.supersededRequests.update((request_id, None) for request_id in self.translationRequests.values())
+        self.translationRequests = {}
+
+    def takeSuperseded(self):
+        superseded, self.supersededRequests = self.supersededRequests, set()
+        return superseded
+
+    @staticmethod
+    def cancelRequests(TranslationManager, requests):
+        for request_id, engine_name in requests:
+            if engine_name is None:
+                TranslationManager.cancel(request_id)
+            else:
+                TranslationManager.cancel(request_id, engine_name=engine_name)
+
+    def cancelSuperseded(self):
+        """Abort superseded translations, when no new request is coming to take them over"""
+        self.cancelRequests(self.TranslationManager, self.takeSuperseded())
+
+    def isCurrentTranslation(self, request_id, engine):
+        return self.translationRequests.get(engine) == request_id
+
     def on_engine_retranslate_clicked(self, engine_name):
         """Handle engine-specific retranslate button clicks"""
+        previous = self.translationRequests.get(engine_name)
+        if previous is not None:
+            self.supersededRequests.add((previous, engine_name))
         self.clear_engine_text(engine_name)
 
         if engine_name in self.retranslateButtons:
@@ -139,11 +191,50 @@ class OcrWindow(QWidget):
             button.setEnabled(False)
             button.setText("Translating...")
         
-        self.TranslationManager.translate(self.ocrTextbox.toPlainText(), engine_name=engine_name)
+        # Explicit re-translate asks for fresh result, skip cache
+        request_id = self.TranslationManager.new_request_id()
+        self.translationRequests[engine_name] = request_id
+        self.TranslationManager.translate(self.ocrTextbox.toPlainText(), engine_name=engine_name,
+                                          use_cache=False, request_id=request_id,
+                                          priority=Priority.RETRANSLATE)
+        self.cancelSuperseded()
 
     def setOcr(self, text, engineName="Unknown"):
-        self.ocrTextboxLabel.setText(f"OCR ({engineName})")
+        self.ocrTextboxLabel.setText(f"OCR ({engineName})" if text.strip() else f"OCR ({engineName}) - No text found")
         self.ocrTextbox.setPlainText(text)
+        self.retranslateBtn.setEnabled(True)
+        self.retranslateBtn.setText("Re-translate")
+
+    def setOcrSegments(self, texts, engineName="Unknown"):
+        self.setOcr(format_segments(texts), engineName)
+        self.ocrTextboxLabel.setText(f"OCR ({engineName}) - {len(texts)} regions")
+
+    def setOcrPending(self, engineName="Unknown"):
+        """Show that OCR is running in background"""
+        # New capture, translations of the previous one are obsolete
+        self.supersedeTranslations()
+        self.ocrTextboxLabel.setText(f"OCR ({engineName}) - Recognizing...")
+        self.ocrTextbox.setPlainText("")
+        self.retranslateBtn.setEnabled(False)
+
+    def setOcrWaiting(self, engineName="Unknown"):
+        """Show that capture waits for OCR engine to finish loading"""
+        self.supersedeTranslations()
+        self.ocrTextboxLabel.setText(f"OCR ({engineName}) - Waiting for engine to load...")
+        self.ocrTextbox.setPlainText("")
+        self.retranslateBtn.setEnabled(False)
+
+    def setOcrCancelled(self):
+        self.cancelSuperseded()
+        self.ocrTextboxLabel.setText("OCR - Cancelled")
+        self.retranslateBtn.setEnabled(True)
+        self.retranslateBtn.setText("Re-translate")
+
+    def setOcrError(self, error_text, engineName="Unknown"):
+        self.cancelSuperseded()
+        self.ocrTextboxLabel.setText(f"OCR ({engineName}) - Error: {error_text}")
+        self.retranslateBtn.setEnabled(True)
+        self.retranslateBtn.setText("Re-translate")
     
     # we can use that for both streaming and non-streaming
     # because translation gets cleared in setup_translation_ui
@@ -152,31 +243,62 @@ class OcrWindow(QWidget):
             # TODO: set to all ig
             return
         if engine in self.translationWidgets:
-            current_text = self.translationWidgets[engine].toPlainText()
-            self.translationWidgets[engine].setPlainText(current_text+text)
+            widget = self.translationWidgets[engine]
+            # Append at the end only, instead of re-setting (and re-laying out) whole document
+            cursor = QTextCursor(widget.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(text)
 
             # Auto-scroll to bottom
-            self.translationWidgets[engine].moveCursor(QTextCursor.MoveOperation.End)
-            self.translationWidgets[engine].ensureCursorVisible()
-
-    def translateOcr(self, TranslationManager, text):
-        TranslationManager.translate(text)
+            widget.moveCursor(QTextCursor.MoveOperation.End)
+            widget.ensureCursorVisible()
+
+    def queueChunk(self, text, engine):
+        """Buffer streamed chunk, it gets drawn on next flush"""
+        self.pendingChunks.setdefault(engine, []).append(text)
+        if not self.chunkFlushTimer.isActive():
+            self.chunkFlushTimer.start()
+
+    def flushChunks(self, engine=None):
+        """Draw buffered chunks (of one engine, or all of them)"""
+        engines = [engine] if engine is not None else list(self.pendingChunks)
+        for name in engines:
+            chunks = self.pendingChunks.pop(name, None)
+            if chunks:
+                self.setTranslation("".join(chunks), engine=name)
+
+    def translateOcr(self, TranslationManager, text, request_id=None, priority=Priority.INTERACTIVE,
+                     use_cache=True, superseded=()):
+        TranslationManager.translate(text, use_cache=use_cache, request_id=request_id, priority=priority)
+        # Only now, so identical request could attach to the superseded one
+        self.cancelRequests(TranslationManager, superseded)
     
-    def startRetranslate(self):
+    def startRetranslate(self, priority=Priority.INTERACTIVE, use_cache=True):
         self.retranslateBtn.setEnabled(False)
         self.retranslateBtn.setText("Translating...")
 
+        self.supersedeTranslations()
         self.setup_translation_ui()
+        # Id is known before the request starts, so no chunk of it can be mistaken for stale
+        request_id = self.TranslationManager.new_request_id()
+        self.translationRequests = {engine: request_id for engine in self.translationWidgets}
         worker = Worker(
             fn=self.translateOcr,
             TranslationManager=self.TranslationManager,
-            text=self.ocrTextbox.toPlainText()
+            text=self.ocrTextbox.toPlainText(),
+            request_id=request_id,
+            priority=priority,
+            use_cache=use_cache,
+            superseded=self.takeSuperseded()
         )
 
-        self.threadpool.start(worker)
+        self.threadpool.start(worker, priority=priority)
 
-    @pyqtSlot(str, str)
-    def on_translation_ready(self, engine, translated_text):
+    @pyqtSlot(int, str, str)
+    def on_translation_ready(self, request_id, engine, translated_text):
+        if not self.isCurrentTranslation(request_id, engine):
+            return
+        self.flushChunks(engine)
         self.setTranslation(translated_text, engine=engine)
         self.retranslateBtn.setEnabled(True)
         self.retranslateBtn.setText("Re-translate")
@@ -185,8 +307,11 @@ class OcrWindow(QWidget):
             self.retranslateButtons[engine].setEnabled(True)
             self.retranslateButtons[engine].setText(f"Re-translate with {engine}")
 
-    @pyqtSlot(str, str)
-    def on_translation_error(self, engine, error_text):
+    @pyqtSlot(int, str, str)
+    def on_translation_error(self, request_id, engine, error_text):
+        if not self.isCurrentTranslation(request_id, engine):
+            return
+        self.flushChunks(engine)
         self.setTranslation(f"Error: {error_text}", engine=engine)
         self.retranslateBtn.setEnabled(True)
         self.retranslateBtn.setText("Re-translate")
@@ -195,15 +320,33 @@ class OcrWindow(QWidget):
             self.retranslateButtons[engine].setEnabled(True)
             self.retranslateButtons[engine].setText(f"Re-translate with {engine}")
 
-    @pyqtSlot(str, str)
-    def on_translation_chunk(self, engine, chunk):
-        self.setTranslation(chunk, engine=engine)
+    @pyqtSlot(int, str, str)
+    def on_translation_chunk(self, request_id, engine, chunk):
+        if not self.isCurrentTranslation(request_id, engine):
+            return
+        self.queueChunk(chunk, engine)
 
-    @pyqtSlot(str)
-    def on_translation_complete(self, engine):
+    @pyqtSlot(int, str)
+    def on_translation_complete(self, request_id, engine):
+        if not self.isCurrentTranslation(request_id, engine):
+            return
+        self.flushChunks(engine)
         self.retranslateBtn.setEnabled(True)
         self.retranslateBtn.setText("Re-translate")
 
         if engine in self.retranslateButtons:
             self.retranslateButtons[engine].setEnabled(True)
             self.retranslateButtons[engine].setText(f"Re-translate with {engine}")
+
+    @pyqtSlot(int, str, str)
+    def on_translation_failover(self, request_id, winner, loser):
+        """Failover request was decided, loser engine was cancelled (or never started)"""
+        if not self.isCurrentTranslation(request_id, loser):
+            return
+        del self.translationRequests[loser]
+        self.clear_engine_text(loser)
+        self.setTranslation(f"Skipped, {winner} answered first", engine=loser)
+
+        if loser in self.retranslateButtons:
+            self.retranslateButtons[loser].setEnabled(True)
+            self.retranslateButtons[loser].setText(f"Re-translate with {loser}")
@@ -1,25 +1,58 @@
 from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtGui import QMouseEvent, QPainter, QPen, QColor, QBrush
+from PyQt6.QtGui import QMouseEvent, QPainter, QPen, QColor, QBrush, QImage
 from PyQt6.QtCore import Qt, QPoint, QRect, pyqtSignal, QEventLoop
-
 import numpy as np
-import cv2
-from PIL import ImageGrab
+
+from App.capture_backends import create_backend
+from App.settings_service import CachedSetting
 
 class ScreenshotController():
     def __init__(self):
         super().__init__()
         self.screenshotOverlay = ScreenshotOverlay()
 
-    def start_selection(self):
+    def start_selection(self, multi=False):
+        """
+        Let user select screen region.
+
+        Args:
+            multi (bool): Let user draw any number of regions in one go
+                (Enter or right click finishes, Backspace removes last one).
+
+        Returns:
+            np.array BGR image or None, with multi list of images (empty when cancelled).
+        """
+        # Grab before showing, the overlay would end up in the frame otherwise
+        self.screenshotOverlay.freezeScreen()
         self.screenshotOverlay.show()
         self.screenshotOverlay.raise_()
         self.screenshotOverlay.activateWindow()
 
-        image = self.screenshotOverlay.getImage()
+        if multi:
+            result = self.screenshotOverlay.getImages()
+        else:
+            result = self.screenshotOverlay.getImage()
         self.screenshotOverlay.close()
-        return image
+        return result
     
+    def select_region(self):
+        """Let user select screen region without capturing it. Returns QRect or None."""
+        self.screenshotOverlay.show()
+        self.screenshotOverlay.raise_()
+        self.screenshotOverlay.activateWindow()
+
+        rect = self.screenshotOverlay.getRect()
+        self.screenshotOverlay.close()
+        return rect
+
+    def grab_region(self, rect):
+        """Capture region (QRect) right now, returns np.array BGR image"""
+        bbox = (rect.x(), rect.y(), rect.x() + rect.width(), rect.y() + rect.height())
+        return self.screenshotOverlay.captureBackend().grab(bbox)
+
+    def is_selecting(self):
+        return self.screenshotOverlay.isVisible()
+
     def cancel_selection(self):
         self.screenshotOverlay.cancelSelection()
 
@@ -33,6 +66,15 @@ class ScreenshotOverlay(QWidget):
         self.currentPoint = None
         self.isSelecting = False
         self.isCancelled = False
+        self.multiRegion = False
+        self.regions = []  # finished rectangles in multi region mode
+
+        self._backendSetting = CachedSetting(lambda s: s.get("capture_backend") or "pil", keys=["capture_backend"])
+        self._backendName = None
+        self._backend = None
+        self._frozenSetting = CachedSetting(lambda s: bool(s.get("frozen_capture")), keys=["frozen_capture"])
+        self.frozenFrame = None  # BGR desktop frame taken when overlay opened
+        self.frozenImage = None  # QImage view of frozenFrame for painting
 
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint |
@@ -47,6 +89,12 @@ class ScreenshotOverlay(QWidget):
 
         self.setGeometry(desktop_rect)
     def cancelSelection(self):
+        self.isCancelled = True
+        self.selectionFinished.emit()
+
+    def finishSelection(self):
+        """Multi region mode: done drawing, grab what we have"""
+        self.isSelecting = False
         self.selectionFinished.emit()
         
     def mousePressEvent(self, event):
@@ -57,11 +105,33 @@ class ScreenshotOverlay(QWidget):
                 self.currentPoint = pos
                 self.isSelecting = True
             else:
+                 self.currentPoint = pos
                  self.endPoint = self.currentPoint
                  self.isSelecting = False
-                 self.selectionFinished.emit()
+                 if self.multiRegion:
+                     rect = QRect(self.startPoint, self.endPoint).normalized()
+                     if rect.width() > 1 and rect.height() > 1:
+                         self.regions.append(rect)
+                     self.startPoint = None
+                     self.endPoint = None
+                 else:
+                     self.selectionFinished.emit()
                  
             self.update()
+        elif event.button() == Qt.MouseButton.RightButton and self.multiRegion:
+            self.finishSelection()
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key == Qt.Key.Key_Escape:
+            self.cancelSelection()
+        elif self.multiRegion and key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self.finishSelection()
+        elif self.multiRegion and key == Qt.Key.Key_Backspace and self.regions:
+            self.regions.pop()
+            self.update()
+        else:
+            super().keyPressEvent(event)
 
     def mouseMoveEvent(self, event):
         if self.isSelecting:
@@ -72,16 +142,25 @@ class ScreenshotOverlay(QWidget):
         alpha = 90 # 90 = ~0.35 opacity (0-255)
         painter = QPainter(self)
 
+        # Frozen desktop under everything, so selection shows what is going to be OCR'd
+        if self.frozenImage is not None:
+            painter.drawImage(self.rect(), self.frozenImage)
+
         # black semitransparent background
         painter.fillRect(self.rect(), QColor(0, 0, 0, alpha))  
-        
+
+        rects = list(self.regions)
         if self.isSelecting and self.startPoint and self.currentPoint:
-            rect = QRect(self.startPoint, self.currentPoint).normalized()
+            rects.append(QRect(self.startPoint, self.currentPoint).normalized())
 
+        for number, rect in enumerate(rects, start=1):
             # Clear the area under the rectangle to fully transparent
             # So our semitransparent blue doesn't blend with black
             painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
-            painter.fillRect(rect, Qt.GlobalColor.transparent)
+            if self.frozenImage is not None:
+                painter.drawImage(rect, self.frozenImage, self._frameRect(rect))
+            else:
+                painter.fillRect(rect, Qt.GlobalColor.transparent)
             painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)  # back to normal
 
             pen = QPen()
@@ -96,6 +175,11 @@ class ScreenshotOverlay(QWidget):
 
             painter.drawRect(rect)
 
+            # Number regions in multi mode, OCR segments use the same order
+            if self.multiRegion:
+                painter.setPen(QColor(255, 255, 255))
+                painter.drawText(rect.adjusted(4, 2, 0, 0), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, str(number))
+
     def reset_state(self):
         QApplication.restoreOverrideCursor()
         self.startPoint = None
@@ -103,14 +187,20 @@ class ScreenshotOverlay(QWidget):
         self.currentPoint = None
         self.isSelecting = False
         self.isCancelled = False
+        self.multiRegion = False
+        self.regions = []
+        self.frozenFrame = None
+        self.frozenImage = None
         self.update()
 
     # TODO: FIX AND UNDERSTAND WHATS GOING ON
     # I dont understand how that one is supposed to work
     # So i did it fully with an LLM
     # Should I have dispatched worker in ScreenshotController.start_selection()?
-    def getImage(self):
+    def waitForSelection(self):
         QApplication.setOverrideCursor(Qt.CursorShape.CrossCursor)
+        # Cancel hotkey pressed while overlay wasn't open doesn't count
+        self.isCancelled = False
         # waits until selectionFinished is emitted
         loop = QEventLoop()
         self.selectionFinished.connect(loop.quit)
@@ -119,6 +209,10 @@ class ScreenshotOverlay(QWidget):
         # blocks until loop.quit is called
         # While blocked the GUI processes events.
         loop.exec()
+        self.selectionFinished.disconnect(loop.quit)
+
+    def getImage(self):
+        self.waitForSelection()
 
         if self.isCancelled:
             self.reset_state()
@@ -129,19 +223,113 @@ class ScreenshotOverlay(QWidget):
         img = None
         if self.startPoint and self.endPoint:
             screenshot_rect = QRect(self.startPoint, self.endPoint).normalized()
-            
-            # ImageGrab.grab() takes a tuple of (left, top, right, bottom)
-            bbox = (
-                screenshot_rect.x(),
-                screenshot_rect.y(),
-                screenshot_rect.x() + screenshot_rect.width(),
-                screenshot_rect.y() + screenshot_rect.height()
-            )
-            screenshot = ImageGrab.grab(bbox=bbox, all_screens=True)
-            
-            # Convert to numpy array (OpenCV format)
-            img = np.array(screenshot)
-            img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+            img = self.grabRegions([screenshot_rect])[0]
+
+        self.reset_state()
+        return img # np.array image in BGR or None
+
+    def getRect(self):
+        """Single region selection, returns QRect or None when cancelled"""
+        self.waitForSelection()
+
+        rect = None
+        if not self.isCancelled and self.startPoint and self.endPoint:
+            rect = QRect(self.startPoint, self.endPoint).normalized()
+            if rect.width() <= 1 or rect.height() <= 1:
+                rect = None
+
+        self.reset_state()
+        return rect
+
+    def getImages(self):
+        """Multi region selection, returns list of BGR images in the order they were drawn"""
+        self.multiRegion = True
+        self.regions = []
+        self.update()
+        self.waitForSelection()
+
+        images = []
+        if not self.isCancelled and self.regions:
+            images = self.grabRegions(self.regions)
 
         self.reset_state()
-        return img # np.array image in BGR or None
\ No newline at end of file
+        return images
+
+    def captureBackend(self):
+        """Backend selected in settings (capture_backend), recreated when setting changes"""
+        name = self._backendSetting.get()
+        if self._backend is None or self._backendName != name:
+            if self._backend is not None:
+                self._backend.close()
+            # Can be a fallback backend, we remember what was asked for
+            self._backend = create_backend(name)
+            self._backendName = name
+        return self._backend
+
+    def freezeScreen(self):
+        """
+        Grab whole desktop now (frozen_capture setting), selection then gets cropped from
+        this frame instead of grabbing screen again once it's finished.
+        """
+        self.frozenFrame = None
+        self.frozenImage = None
+        if not self._frozenSetting.get():
+            return
+
+        geometry = self.geometry()
+        bbox = (geometry.x(), geometry.y(), geometry.x() + geometry.width(), geometry.y() + geometry.height())
+        try:
+            # QImage doesn't copy, it needs contiguous rows (mss frames are BGRA views)
+            frame = np.ascontiguousarray(self.captureBackend().grab(bbox))
+        except Exception as e:
+            print(f"Couldn't freeze screen, grabbing after selection instead: {e}")
+            return
+        height, width = frame.shape[:2]
+        self.frozenFrame = frame
+        self.frozenImage = QImage(frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888)
+
+    def _frameRect(self, rect):
+        """Overlay rect to frozen frame pixels (differ on HiDPI screens)"""
+        frame_height, frame_width = self.frozenFrame.shape[:2]
+        scale_x = frame_width / max(1, self.width())
+        scale_y = frame_height / max(1, self.height())
+        if scale_x == 1 and scale_y == 1:
+            return rect
+        return QRect(round(rect.x() * scale_x), round(rect.y() * scale_y),
+                     round(rect.width() * scale_x), round(rect.height() * scale_y))
+
+    def grabRegions(self, rects):
+        """
+        Crops of frozen frame when there is one, otherwise one screen grab of
+        area covering all rects, cropped to each of them
+        """
+        if self.frozenFrame is not None:
+            crops = []
+            for rect in rects:
+                rect = self._frameRect(rect)
+                # Copy so the whole desktop frame doesn't stay alive with the crop
+                crops.append(self.frozenFrame[rect.y():rect.y() + rect.height(), rect.x():rect.x() + rect.width()].copy())
+            return crops
+
+        bounds = QRect()
+        for rect in rects:
+            bounds = bounds.united(rect)
+
+        # (left, top, right, bottom)
+        bbox = (
+            bounds.x(),
+            bounds.y(),
+            bounds.x() + bounds.width(),
+            bounds.y() + bounds.height()
+        )
+        # Already BGR (OpenCV format)
+        img = self.captureBackend().grab(bbox)
+        if len(rects) == 1:
+            return [img]
+
+        crops = []
+        for rect in rects:
+            x = rect.x() - bounds.x()
+            y = rect.y() - bounds.y()
+            crops.append(img[y:y + rect.height(), x:x + rect.width()].copy())
+        return crops
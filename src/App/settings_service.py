@@ -1,34 +1,185 @@
+import atexit
+import copy
+import inspect
 import json
 import os
+import threading
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple
+
+from Util.atomic_file import write_text_atomic
+
+def _freeze(value):
+    """Read-only deep copy: dicts become mappingproxies, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """
+    Immutable view of all settings at given version.
+    Cheap to pass around and read from any thread, unlike settings_service.get().
+    """
+    version: int
+    ocr_engine: str
+    translation_engine: Tuple[str, ...]
+    hotkeys: Mapping[str, str]
+    source_lang: str
+    translation_source_lang: str
+    translation_target_lang: str
+    translation_presets: Mapping[str, Mapping[str, Any]]
+    ocr_presets: Mapping[str, Mapping[str, Any]]
+    openai_translation_prompt: str
+    ocr_cache: Mapping[str, Any]
+    translation_cache: Mapping[str, Any]
+    paddleocr: Mapping[str, Any]
+    raw: Mapping[str, Any]  # whole settings tree, including keys without own field
+
+    @classmethod
+    def from_settings(cls, version, settings):
+        frozen = _freeze(settings)
+        translation_engine = frozen.get("translation_engine", ())
+        if isinstance(translation_engine, str):
+            translation_engine = (translation_engine,)
+        fields = {name: frozen.get(name) for name in cls.__dataclass_fields__ if name not in ("version", "raw", "translation_engine")}
+        return cls(version=version, translation_engine=translation_engine, raw=frozen, **fields)
+
+    def get(self, key):
+        """Dotted key lookup, like settings_service.get() (without defaults)."""
+        value = self.raw
+        try:
+            for k in key.split('.'):
+                value = value[k]
+            return value
+        except (KeyError, TypeError):
+            return None
+
+def _keys_overlap(changed_key, watched_key):
+    """True if changing `changed_key` affects `watched_key` (or the other way around)."""
+    return (changed_key == watched_key
+            or changed_key.startswith(watched_key + ".")
+            or watched_key.startswith(changed_key + "."))
 
 class SettingsService:
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = "config.json", write_delay: float = 0.5):
         self.config_path = config_path
+        # Changes are written in background after this many seconds of quiet
+        self.write_delay = write_delay
+        self._lock = threading.RLock()        # guards self.settings
+        self._write_lock = threading.Lock()   # serializes file writes
+        self._batch_depth = 0
+        self._dirty = False
+        self._save_timer = None
+        self._last_written = None  # serialized settings currently on disk
+        self._version = 0
+        self._snapshot = None
+        self._subscribers = []      # [(callback or weak ref, keys or None)]
+        self._pending_changes = []  # keys changed inside batch()
         self.default_settings = {
             "ocr_engine": "Dummy",
             "translation_engine": "Dummy",
             "hotkeys": {
                 "ocr_capture": "<alt>+q",
                 "only_ocr": "<alt>+w",
+                "multi_region_ocr": "<alt>+e",
+                "watch_mode": "<alt>+r",
+                "watch_region": "<alt>+t",
                 "cancel_selection": "<esc>"
             },
             "source_lang": "ja",
             "translation_source_lang": "auto",
             "translation_target_lang": "en",
+            # Optional preset keys: "rpm"/"tpm" (requests/tokens per minute, 0 = unlimited),
+            # "max_retries" (429/5xx retries, 4 by default)
             "translation_presets": {
                 # "default": {
                 #     "url": "",
                 #     "model": "",
-                #     "key": ""
+                #     "key": "",
+                #     "rpm": 0,
+                #     "tpm": 0
                 # }
             },
             "ocr_presets": {
                 # "default": {
                 #     "url": "",
                 #     "model": "",
-                #     "key": ""
+                #     "key": "",
+                #     "rpm": 0,
+                #     "tpm": 0
                 # }
             },
+            "ocr_cache": {
+                "enabled": True,
+                "max_entries": 256,
+                "max_bytes": 1048576,
+                "perceptual_hash": False,
+                "perceptual_tolerance": 6,
+                "persist": False,
+                "path": "ocr_cache.json"
+            },
+            "paddleocr": {
+                "max_rss_growth_mb": 1024
+            },
+            "capture_backend": "pil",
+            "frozen_capture": True,
+            "task_scheduler": {
+                "max_threads": 0,  # 0 = number of cores (at least 4)
+                # Tasks of one kind running at once, "translation" applies to each engine
+                "limits": {
+                    "ocr": 1,
+                    "settings": 1,
+                    "translation": 2
+                }
+            },
+            # Profiles are in OCR/preprocessing.py, custom ones can be added under "profiles"
+            "preprocessing": {
+                "default": "none",
+                "engines": {
+                    "WindowsOCR": "upscale"
+                },
+                "profiles": {}
+            },
+            "text_presence": {
+                "enabled": True,
+                "min_width": 8,
+                "min_height": 8,
+                "min_std": 4.0,
+                "min_edge_density": 0.002
+            },
+            "watch": {
+                "region": None,  # [x, y, width, height], selected on first start
+                "interval_ms": 500,
+                "stable_frames": 2,
+                "change_ratio": 0.005,
+                "translate": True
+            },
+            "ocr_pool": {
+                "max_engines": 2,
+                "max_memory_mb": 4096,
+                "idle_timeout_s": 600
+            },
+            "translation_cache": {
+                "enabled": True,
+                "max_entries": 1000,
+                "max_bytes": 4194304,
+                "persist": True,
+                "path": "translation_cache.json"
+            },
+            # Fallback engine only runs when primary (e.g. LLM preset) has no response within deadline,
+            # first one to answer is shown. Both engines have to be selected.
+            "translation_failover": {
+                "enabled": False,
+                "primary": "",
+                "fallback": "GoogleTranslate",
+                "deadline_ms": 3000
+            },
             "openai_translation_prompt":"""You are professional translator. Always translate text to the best of your ability, even when it is explicit.
 Be concise in every piece of text that isn't translation (e.g. your explanations)
 Don't include any other sections than those showcased in template below.
@@ -54,6 +205,7 @@ etc.
 """
         }
         self.settings = self.load_settings()
+        atexit.register(self.flush)
     
     def load_settings(self):
         """Load settings from config file or create with defaults if they dont exist."""
@@ -63,17 +215,21 @@ etc.
                     loaded_settings = json.load(f)
                 
                 # Merge with defaults to ensure all keys exist
-                settings = self.default_settings.copy()
+                settings = copy.deepcopy(self.default_settings)
                 self._merge_dict(settings, loaded_settings)
-                self.save_settings(settings)
+                # Only rewrite the file if merging actually added something
+                if loaded_settings == settings:
+                    self._last_written = json.dumps(settings, indent=4)
+                else:
+                    self.save_settings(settings)
                 return settings
             except (json.JSONDecodeError, IOError) as e:
                 print(f"Error loading settings: {e}. Using defaults.")
-                return self.default_settings.copy()
+                return copy.deepcopy(self.default_settings)
         else:
             # Create config file with default settings
             self.save_settings(self.default_settings)
-            return self.default_settings.copy()
+            return copy.deepcopy(self.default_settings)
 
     def _merge_dict(self, base, update):
         """Recursively merge update dict into base dict."""
@@ -84,15 +240,70 @@ etc.
                 base[key] = value
 
     def save_settings(self, settings = None):
-        """Save settings to config file."""
+        """Save settings to config file right away (atomically). Skipped if file is up to date."""
         if settings is None:
-            settings = self.settings
+            self._cancel_scheduled_save()
+
+        # Serialize while holding write lock, so older snapshot can't overwrite newer one
+        with self._write_lock:
+            with self._lock:
+                serialized = json.dumps(self.settings if settings is None else settings, indent=4)
+                if settings is None:
+                    self._dirty = False
+            if serialized == self._last_written:
+                return
+            try:
+                write_text_atomic(self.config_path, serialized)
+                self._last_written = serialized
+            except (IOError, OSError) as e:
+                print(f"Error saving settings: {e}")
+
+    def flush(self):
+        """Write pending changes now."""
+        with self._lock:
+            if not self._dirty:
+                return
+        self.save_settings()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several set() calls into one write:
 
+            with settings_service.batch():
+                settings_service.set("a", 1)
+                settings_service.set("b", 2)
+        """
+        with self._lock:
+            self._batch_depth += 1
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=4)
-        except IOError as e:
-            print(f"Error saving settings: {e}")
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                schedule = self._batch_depth == 0 and self._dirty
+                changed = self._pending_changes if self._batch_depth == 0 else []
+                if self._batch_depth == 0:
+                    self._pending_changes = []
+            if schedule:
+                self._schedule_save()
+            if changed:
+                self._notify(changed)
+
+    def _schedule_save(self):
+        """(Re)start write-behind timer, so burst of changes ends up as one write off the UI thread."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.write_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _cancel_scheduled_save(self):
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
     
     def get(self, key):
         """Get a setting value by key, returning default from default_settings if not found."""
@@ -112,21 +323,134 @@ etc.
                 return None
     
     def set(self, key, value):
-        """Set a setting value by key."""
+        """
+        Set a setting value by key. Written to disk in background (see batch() and flush()).
+        Setting the value it already has does nothing, so subscribers don't rebuild for nothing.
+        """
         keys = key.split('.')
-        settings = self.settings
-        
-        # Navigate to the parent dict
-        for k in keys[:-1]:
-            if k not in settings or not isinstance(settings[k], dict):
-                settings[k] = {}
-            settings = settings[k]
-        
-        # Set the value
-        settings[keys[-1]] = value
+        with self._lock:
+            if self._is_unchanged(keys, value):
+                return
+            settings = self.settings
+            
+            # Navigate to the parent dict
+            for k in keys[:-1]:
+                if k not in settings or not isinstance(settings[k], dict):
+                    settings[k] = {}
+                settings = settings[k]
+            
+            # Set the value
+            settings[keys[-1]] = value
+            self._dirty = True
+            self._version += 1
+            in_batch = self._batch_depth > 0
+            if in_batch:
+                self._pending_changes.append(key)
         
         # Save changes
-        self.save_settings()
+        if not in_batch:
+            self._schedule_save()
+            self._notify([key])
+
+    def _is_unchanged(self, keys, value):
+        settings = self.settings
+        for k in keys[:-1]:
+            settings = settings.get(k) if isinstance(settings, dict) else None
+        if not isinstance(settings, dict) or keys[-1] not in settings:
+            return False
+        current = settings[keys[-1]]
+        # Same dict/list object could have been edited in place, that's a change we can't see
+        if current is value and isinstance(value, (dict, list)):
+            return False
+        return current == value
+
+    @property
+    def version(self):
+        """Incremented on every set()."""
+        return self._version
+
+    def snapshot(self):
+        """Returns immutable SettingsSnapshot of current settings (rebuilt only after changes)."""
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self._version:
+                self._snapshot = SettingsSnapshot.from_settings(self._version, self.settings)
+            return self._snapshot
+
+    def subscribe(self, callback, keys=None):
+        """
+        Call `callback(snapshot, changed_keys)` after settings change.
+
+        Args:
+            callback: Function or bound method. Methods are held weakly,
+                so subscribing doesn't keep engines alive.
+            keys (list[str]): Only notify about these (dotted) keys, None means any key.
+
+        Returns:
+            Function that cancels the subscription.
+        """
+        ref = weakref.WeakMethod(callback) if inspect.ismethod(callback) else (lambda: callback)
+        entry = (ref, tuple(keys) if keys is not None else None)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+
+    def _notify(self, changed_keys):
+        """Called outside of the lock, on the thread that changed settings."""
+        snapshot = self.snapshot()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for entry in subscribers:
+            ref, keys = entry
+            callback = ref()
+            if callback is None:
+                with self._lock:
+                    if entry in self._subscribers:
+                        self._subscribers.remove(entry)
+                continue
+            relevant = changed_keys if keys is None else [c for c in changed_keys if any(_keys_overlap(c, k) for k in keys)]
+            if not relevant:
+                continue
+            try:
+                callback(snapshot, relevant)
+            except Exception as e:
+                print(f"Error in settings subscriber: {e}")
+
+class CachedSetting:
+    """
+    Value derived from settings, recomputed lazily only after one of `keys` changed.
+
+        self._langs = CachedSetting(lambda s: (s.translation_source_lang, s.translation_target_lang),
+                                    keys=["translation_source_lang", "translation_target_lang"])
+        src, dest = self._langs.get()
+    """
+
+    def __init__(self, compute, keys, service=None):
+        self._compute = compute  # compute(snapshot) -> value
+        self._service = service
+        self._generation = 0
+        self._valid_generation = -1
+        self._value = None
+        self.service.subscribe(self._invalidate, keys=keys)
+
+    @property
+    def service(self):
+        return self._service or settings_service
+
+    def _invalidate(self, snapshot, changed_keys):
+        self._generation += 1
+
+    def get(self):
+        generation = self._generation
+        if self._valid_generation != generation:
+            # If settings change while computing, generation moves on and next get() recomputes
+            self._value = self._compute(self.service.snapshot())
+            self._valid_generation = generation
+        return self._value
 
 # Global instance of settings service
 settings_service = SettingsService()
\ No newline at end of file
@@ -1,9 +1,11 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QComboBox, QLabel, QFormLayout, QPushButton, QHBoxLayout, QLineEdit, QTabWidget, QGroupBox, QInputDialog, QMessageBox, QTextEdit
-from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot, QRunnable, QThreadPool, Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QComboBox, QLabel, QFormLayout, QPushButton, QHBoxLayout, QLineEdit, QTabWidget, QGroupBox, QInputDialog, QMessageBox, QTextEdit, QCheckBox
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot, QRunnable, Qt
 from PyQt6.QtGui import QKeySequence
 
 from Util.CheckableComboBox import CheckableComboBox
 from App.settings_service import settings_service
+from App.capture_backends import CAPTURE_BACKENDS
+from App.task_scheduler import task_scheduler, Priority
 
 class WorkerSignals(QObject):
     """Signals from a running worker thread.
@@ -39,7 +41,10 @@ class SettingsTab(QWidget):
         self.OcrManager = OcrManager
         self.hotkey_manager = hotkey_manager
         self.TranslationManager = TranslationManager
-        self.threadpool = QThreadPool()
+        # Swaps run one at a time ("settings" limit), in the order user made them, so last selection wins
+        self.threadpool = task_scheduler.lane("settings", Priority.BACKGROUND)
+        self.pending_ocr_swaps = 0
+        self.pending_translation_swaps = 0
         self.hotkey_inputs = {}
         self.setup_ui()
         self.load_settings()
@@ -78,6 +83,12 @@ class SettingsTab(QWidget):
         # Translation Input Language Settings
         self.translationInputLanguageLabel = QLabel("Translation Input Language")
         self.translationInputLanguageInput = QLineEdit()
+
+        # Screen capture backend (see benchmarks/bench_capture_backends.py for the fastest one)
+        self.captureBackendLabel = QLabel("Screen Capture Backend")
+        self.captureBackendBtn = QComboBox()
+        self.captureBackendBtn.addItems(list(CAPTURE_BACKENDS))
+        self.frozenCaptureCheckbox = QCheckBox("Freeze Screen While Selecting")
         
         ocrLayout.addWidget(self.ocrEngineLabel)
         ocrLayout.addWidget(self.ocrEngineBtn)
@@ -89,6 +100,9 @@ class SettingsTab(QWidget):
         ocrLayout.addWidget(self.translationInputLanguageInput)
         ocrLayout.addWidget(self.translationLanguageLabel)
         ocrLayout.addWidget(self.translationLanguageInput)
+        ocrLayout.addWidget(self.captureBackendLabel)
+        ocrLayout.addWidget(self.captureBackendBtn)
+        ocrLayout.addWidget(self.frozenCaptureCheckbox)
         
         general_layout.addLayout(ocrLayout)
 
@@ -132,6 +146,22 @@ class SettingsTab(QWidget):
         self.openaiKeyOcrLabel = QLabel("OpenAI API Key")
         self.openaiKeyOcrInput = QLineEdit()
         self.openaiKeyOcrInput.setEchoMode(QLineEdit.EchoMode.Password)
+
+        # Image upload encoding
+        self.ocrImageFormatLabel = QLabel("Image Format")
+        self.ocrImageFormatBtn = QComboBox()
+        self.ocrImageFormatBtn.addItems(["PNG", "JPEG", "WEBP"])
+
+        self.ocrImageQualityLabel = QLabel("Image Quality (JPEG/WEBP, 1-100)")
+        self.ocrImageQualityInput = QLineEdit()
+
+        self.ocrMaxLongEdgeLabel = QLabel("Max Image Long Edge (px, 0 = no limit)")
+        self.ocrMaxLongEdgeInput = QLineEdit()
+
+        self.ocrMaxPixelsLabel = QLabel("Max Image Pixels (0 = no limit)")
+        self.ocrMaxPixelsInput = QLineEdit()
+
+        self.ocrGrayscaleCheckbox = QCheckBox("Send Grayscale Image")
         
         ocr_layout.addWidget(self.ocr_preset_btn)
         ocr_layout.addLayout(ocr_preset_layout)
@@ -141,6 +171,15 @@ class SettingsTab(QWidget):
         ocr_layout.addWidget(self.openaiModelOcrInput)
         ocr_layout.addWidget(self.openaiKeyOcrLabel)
         ocr_layout.addWidget(self.openaiKeyOcrInput)
+        ocr_layout.addWidget(self.ocrImageFormatLabel)
+        ocr_layout.addWidget(self.ocrImageFormatBtn)
+        ocr_layout.addWidget(self.ocrImageQualityLabel)
+        ocr_layout.addWidget(self.ocrImageQualityInput)
+        ocr_layout.addWidget(self.ocrMaxLongEdgeLabel)
+        ocr_layout.addWidget(self.ocrMaxLongEdgeInput)
+        ocr_layout.addWidget(self.ocrMaxPixelsLabel)
+        ocr_layout.addWidget(self.ocrMaxPixelsInput)
+        ocr_layout.addWidget(self.ocrGrayscaleCheckbox)
         ocr_layout.addStretch()
         
         ocr_group_box.setLayout(ocr_layout)
@@ -236,7 +275,8 @@ class SettingsTab(QWidget):
         if ok and name.strip():
             name = name.strip()
             settings_service.set("ocr_presets."+name,
-                {"url": "", "model": "", "key": ""})
+                {"url": "", "model": "", "key": "",
+                 "image_format": "PNG", "image_quality": 90, "max_long_edge": 0, "max_pixels": 0, "grayscale": False})
 
             self.ocr_preset_btn.addItem(name)
             self.ocr_preset_btn.setCurrentIndex(self.ocr_preset_btn.count() - 1)
@@ -346,6 +386,12 @@ class SettingsTab(QWidget):
         current_translation_engine = settings_service.get("translation_engine") # engines
         self.translateEngineBtn.setCheckedItems(current_translation_engine)
         
+        # Load capture backend setting
+        index = self.captureBackendBtn.findText(settings_service.get("capture_backend") or "pil")
+        if index >= 0:
+            self.captureBackendBtn.setCurrentIndex(index)
+        self.frozenCaptureCheckbox.setChecked(bool(settings_service.get("frozen_capture")))
+
         # Load translation output language setting
         translation_language = settings_service.get("translation_target_lang")
         self.translationLanguageInput.setText(translation_language)
@@ -378,6 +424,22 @@ class SettingsTab(QWidget):
 
         openai_api_ocr_key = settings_service.get("ocr_presets."+current_preset_ocr+".key")
         self.openaiKeyOcrInput.setText(openai_api_ocr_key)
+
+        # Older presets don't have encoding options
+        image_format = settings_service.get("ocr_presets."+current_preset_ocr+".image_format") or "PNG"
+        self.ocrImageFormatBtn.setCurrentText(image_format)
+
+        image_quality = settings_service.get("ocr_presets."+current_preset_ocr+".image_quality") or 90
+        self.ocrImageQualityInput.setText(str(image_quality))
+
+        max_long_edge = settings_service.get("ocr_presets."+current_preset_ocr+".max_long_edge") or 0
+        self.ocrMaxLongEdgeInput.setText(str(max_long_edge))
+
+        max_pixels = settings_service.get("ocr_presets."+current_preset_ocr+".max_pixels") or 0
+        self.ocrMaxPixelsInput.setText(str(max_pixels))
+
+        grayscale = settings_service.get("ocr_presets."+current_preset_ocr+".grayscale") or False
+        self.ocrGrayscaleCheckbox.setChecked(grayscale)
         
     def save_language_settings(self):
         """Save the language settings"""
@@ -433,6 +495,9 @@ class SettingsTab(QWidget):
         translation_engines = self.translateEngineBtn.checkedItemsText()
         settings_service.set("translation_engine", translation_engines)
 
+        settings_service.set("capture_backend", self.captureBackendBtn.currentText())
+        settings_service.set("frozen_capture", self.frozenCaptureCheckbox.isChecked())
+
     def save_openai(self):
         current_preset_translation = self.translation_preset_btn.currentText().strip()
 
@@ -457,14 +522,40 @@ class SettingsTab(QWidget):
         openai_api_ocr_key = self.openaiKeyOcrInput.text().strip()
         settings_service.set("ocr_presets."+current_preset_ocr+".key", openai_api_ocr_key)
 
+        image_format = self.ocrImageFormatBtn.currentText()
+        settings_service.set("ocr_presets."+current_preset_ocr+".image_format", image_format)
+
+        image_quality = self.parse_int(self.ocrImageQualityInput.text(), 90)
+        settings_service.set("ocr_presets."+current_preset_ocr+".image_quality", max(1, min(100, image_quality)))
+
+        max_long_edge = self.parse_int(self.ocrMaxLongEdgeInput.text(), 0)
+        settings_service.set("ocr_presets."+current_preset_ocr+".max_long_edge", max(0, max_long_edge))
+
+        max_pixels = self.parse_int(self.ocrMaxPixelsInput.text(), 0)
+        settings_service.set("ocr_presets."+current_preset_ocr+".max_pixels", max(0, max_pixels))
+
+        grayscale = self.ocrGrayscaleCheckbox.isChecked()
+        settings_service.set("ocr_presets."+current_preset_ocr+".grayscale", grayscale)
+
+    def parse_int(self, text, default):
+        """Parse int from text input, fall back to default on garbage"""
+        try:
+            return int(text.strip())
+        except ValueError:
+            return default
+
     def save_settings(self):
         """Save all settings"""
-        self.save_engines()
-        self.save_language_settings()
-        self.save_hotkeys()
-        self.save_openai()
-        # Save translation prompt
-        settings_service.set("openai_translation_prompt", self.translation_prompt.toPlainText())
+        # All changes end up in a single write
+        with settings_service.batch():
+            self.save_engines()
+            self.save_language_settings()
+            self.save_hotkeys()
+            self.save_openai()
+            # Save translation prompt
+            settings_service.set("openai_translation_prompt", self.translation_prompt.toPlainText())
+        # Explicit save, don't wait for write-behind
+        settings_service.flush()
     
     def changeOcrEngine(self, name, OcrManager):
         OcrManager.swap_engine(name)
@@ -474,6 +565,7 @@ class SettingsTab(QWidget):
     
     def start_change_ocr_engine(self, name):
         self.ocrEngineBtn.setEnabled(False)
+        self.pending_ocr_swaps += 1
         worker = Worker(fn=self.changeOcrEngine, OcrManager=self.OcrManager, name=name)
         worker.signals.finished.connect(self.on_swap_finished)
 
@@ -481,6 +573,7 @@ class SettingsTab(QWidget):
 
     def start_change_translate_engine(self, names):
         self.translateEngineBtn.setEnabled(False)
+        self.pending_translation_swaps += 1
         worker = Worker(fn=self.changeTranslationEngine, TranslationManager=self.TranslationManager, names=names)
         worker.signals.finished.connect(self.on_translation_swap_finished)
 
@@ -488,8 +581,12 @@ class SettingsTab(QWidget):
 
     def on_swap_finished(self):
         print("Engine swap finished.")
-        self.ocrEngineBtn.setEnabled(True)
+        self.pending_ocr_swaps -= 1
+        if self.pending_ocr_swaps == 0:
+            self.ocrEngineBtn.setEnabled(True)
 
     def on_translation_swap_finished(self):
         print("Translation Engine swap finished.")
-        self.translateEngineBtn.setEnabled(True)
\ No newline at end of file
+        self.pending_translation_swaps -= 1
+        if self.pending_translation_swaps == 0:
+            self.translateEngineBtn.setEnabled(True)
\ No newline at end of file
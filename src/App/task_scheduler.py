@@ -0,0 +1,250 @@
+import heapq
+import threading
+import time
+from collections import Counter
+from itertools import count
+
+from PyQt6.QtCore import QRunnable, QThread, QThreadPool, pyqtSlot
+
+from App.settings_service import settings_service
+
+class Priority:
+    """Higher runs first when tasks wait for a free thread."""
+    BACKGROUND = 0    # engine warmup/reload, batch work
+    RETRANSLATE = 5   # user asked again for something already shown
+    INTERACTIVE = 10  # capture -> OCR -> translation the user waits for
+
+class _ScheduledTask(QRunnable):
+    def __init__(self, scheduler, runnable, key, priority, sequence):
+        super().__init__()
+        self.scheduler = scheduler
+        self.runnable = runnable
+        self.key = key
+        self.priority = priority
+        self.sequence = sequence
+        self.submitted = time.perf_counter()
+        self.released = False  # slot freed by shutdown, which cleared it from the pool
+
+    def __lt__(self, other):
+        # Waiting heap order: priority, then submission order
+        return (-self.priority, self.sequence) < (-other.priority, other.sequence)
+
+    @pyqtSlot()
+    def run(self):
+        self.scheduler._task_started(self)
+        try:
+            self.runnable.run()
+        except Exception as e:
+            print(f"Error in task '{self.key}': {e}")
+        finally:
+            self.scheduler._task_finished(self)
+
+class TaskScheduler:
+    """
+    One thread pool for all background work (OCR jobs, translations, engine loading).
+
+    Tasks have a key (e.g. "ocr", "translation/GoogleTranslate") and a priority.
+    Limits cap how many tasks of one key run at once ("translation" limit applies to
+    every "translation/..." key separately), tasks over the limit wait here and
+    the rest waits in the pool queue, both ordered by priority.
+    """
+
+    def __init__(self, max_threads=0, limits=None):
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_threads or max(4, QThread.idealThreadCount()))
+        self._limits = dict(limits or {})
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._waiting = []  # heap of tasks held back by their key limit
+        self._tasks = {}  # id(runnable) -> task, until it starts running
+        self._dispatched = Counter()  # key -> tasks queued in pool or running
+        self._sequence = count()
+        self._closed = False
+        # Metrics
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+
+    @classmethod
+    def from_settings(cls, config):
+        config = config or {}
+        return cls(max_threads=int(config.get("max_threads", 0)), limits=config.get("limits"))
+
+    def lane(self, key, priority=Priority.INTERACTIVE):
+        return TaskLane(self, key, priority)
+
+    def set_limit(self, key, max_concurrency):
+        with self._lock:
+            self._limits[key] = max_concurrency
+            ready = self._pop_ready()
+        self._dispatch(ready)
+
+    def limit(self, key):
+        """Concurrency limit of key (0 = only the pool size limits it)."""
+        if key in self._limits:
+            return self._limits[key]
+        return self._limits.get(key.split("/", 1)[0], 0)
+
+    def start(self, runnable, key="default", priority=Priority.INTERACTIVE):
+        """Schedule runnable (QRunnable or anything with run()). Returns False after shutdown."""
+        with self._lock:
+            if self._closed:
+                print(f"Task scheduler is shut down, dropping '{key}' task")
+                return False
+            task = _ScheduledTask(self, runnable, key, priority, next(self._sequence))
+            self._tasks[id(runnable)] = task
+            self._submitted += 1
+            limit = self.limit(key)
+            if limit > 0 and self._dispatched[key] >= limit:
+                heapq.heappush(self._waiting, task)
+                ready = []
+            else:
+                self._dispatched[key] += 1
+                ready = [task]
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth())
+        self._dispatch(ready)
+        return True
+
+    def tryTake(self, runnable):
+        """Remove task that didn't start yet. Returns True if it was removed."""
+        with self._lock:
+            task = self._tasks.get(id(runnable))
+            if task is None or task.runnable is not runnable:
+                return False
+            if task in self._waiting:
+                self._waiting.remove(task)
+                heapq.heapify(self._waiting)
+                del self._tasks[id(runnable)]
+                self._idle.notify_all()
+                return True
+        if not self._pool.tryTake(task):
+            return False
+        with self._lock:
+            self._tasks.pop(id(runnable), None)
+            self._dispatched[task.key] -= 1
+            ready = self._pop_ready()
+            self._idle.notify_all()
+        self._dispatch(ready)
+        return True
+
+    def _queue_depth(self):
+        # Tasks not running yet: held back by limits plus queued in the pool
+        return len(self._tasks)
+
+    def _pop_ready(self):
+        """Waiting tasks whose key got a free slot, called with lock held."""
+        ready = []
+        held = []
+        while self._waiting:
+            task = heapq.heappop(self._waiting)
+            limit = self.limit(task.key)
+            if limit > 0 and self._dispatched[task.key] >= limit:
+                held.append(task)
+                continue
+            self._dispatched[task.key] += 1
+            ready.append(task)
+        for task in held:
+            heapq.heappush(self._waiting, task)
+        return ready
+
+    def _dispatch(self, tasks):
+        for task in tasks:
+            self._pool.start(task, task.priority)
+
+    def _task_started(self, task):
+        with self._lock:
+            self._tasks.pop(id(task.runnable), None)
+            self._started += 1
+            self._total_wait += time.perf_counter() - task.submitted
+
+    def _task_finished(self, task):
+        with self._lock:
+            if not task.released:
+                self._dispatched[task.key] -= 1
+            self._completed += 1
+            ready = [] if self._closed else self._pop_ready()
+            self._idle.notify_all()
+        self._dispatch(ready)
+
+    def stats(self):
+        """Queue depth and throughput numbers, for logs/tuning."""
+        with self._lock:
+            started = self._started
+            return {
+                "threads": self._pool.maxThreadCount(),
+                "active_threads": self._pool.activeThreadCount(),
+                "queued": self._queue_depth(),
+                "queued_by_key": dict(Counter(task.key for task in self._tasks.values())),
+                "running_by_key": {key: n for key, n in self._dispatched.items() if n > 0},
+                "max_queue_depth": self._max_queue_depth,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "avg_wait_ms": (self._total_wait / started * 1000) if started else 0.0,
+            }
+
+    def wait_for_done(self, key=None, timeout_ms=-1):
+        """Block until no task (of key) is queued or running. Returns False on timeout."""
+        deadline = None if timeout_ms < 0 else time.monotonic() + timeout_ms / 1000
+
+        def matches(task_key):
+            # "translation" covers "translation/<engine>" too
+            return key is None or task_key == key or task_key.startswith(key + "/")
+
+        def busy():
+            return (any(n > 0 and matches(k) for k, n in self._dispatched.items())
+                    or any(matches(task.key) for task in self._tasks.values()))
+
+        with self._lock:
+            while busy():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            return True
+
+    def shutdown(self, timeout_ms=3000):
+        """Drop queued tasks, wait for running ones. New tasks are refused afterwards."""
+        with self._lock:
+            self._closed = True
+            dropped = len(self._tasks)
+            # Tasks held back by limits never got a slot, only forget them
+            for task in self._waiting:
+                self._tasks.pop(id(task.runnable), None)
+            self._waiting.clear()
+        self._pool.clear()
+        with self._lock:
+            # Tasks cleared from the pool never run, free their slots
+            for task in self._tasks.values():
+                self._dispatched[task.key] -= 1
+                task.released = True
+            self._tasks.clear()
+            self._idle.notify_all()
+        finished = self._pool.waitForDone(timeout_ms)
+        print(f"Task scheduler shut down ({dropped} queued tasks dropped"
+              + ("" if finished else ", some tasks still running") + ")")
+        return finished
+
+class TaskLane:
+    """
+    Handle for one kind of work on the scheduler, with its own key and default
+    priority. Drop-in for the QThreadPool calls components use (start, tryTake, waitForDone).
+    """
+
+    def __init__(self, scheduler, key, priority=Priority.INTERACTIVE):
+        self.scheduler = scheduler
+        self.key = key
+        self.priority = priority
+
+    def start(self, runnable, priority=None, key=None):
+        return self.scheduler.start(runnable, key=key or self.key,
+                                    priority=self.priority if priority is None else priority)
+
+    def tryTake(self, runnable):
+        return self.scheduler.tryTake(runnable)
+
+    def waitForDone(self, msecs=-1):
+        return self.scheduler.wait_for_done(self.key, msecs)
+
+task_scheduler = TaskScheduler.from_settings(settings_service.get("task_scheduler"))
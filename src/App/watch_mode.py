@@ -0,0 +1,140 @@
+import cv2
+import numpy as np
+from PyQt6.QtCore import QObject, QRect, QTimer, pyqtSignal, pyqtSlot
+
+from App.settings_service import settings_service, CachedSetting
+
+class FrameChangeDetector:
+    """
+    Decides which frames of a watched region are worth OCR'ing.
+
+    Frames are compared as small grayscale thumbnails. A frame is reported once it
+    stayed the same for `stable_frames` ticks (so text that is still being typed out
+    or faded in isn't OCR'd) and differs from the last reported frame.
+    """
+    PIXEL_THRESHOLD = 32  # thumbnail pixel counts as changed above this difference (0-255)
+
+    def __init__(self, change_ratio=0.005, stable_frames=2, thumb_width=160):
+        self.change_ratio = change_ratio  # part of thumbnail pixels that has to change
+        self.stable_frames = stable_frames
+        self.thumb_width = thumb_width
+        self.reset()
+
+    def reset(self):
+        self._previous = None
+        self._reported = None
+        self._stable = 0
+
+    def _thumbnail(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        height, width = gray.shape
+        if width > self.thumb_width:
+            size = (self.thumb_width, max(1, round(height * self.thumb_width / width)))
+            gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        return gray
+
+    def changed(self, a, b):
+        if a is None or b is None or a.shape != b.shape:
+            return True
+        changed_pixels = np.count_nonzero(cv2.absdiff(a, b) > self.PIXEL_THRESHOLD)
+        return changed_pixels > self.change_ratio * a.size
+
+    def feed(self, frame):
+        """Returns True when frame should be OCR'd."""
+        thumbnail = self._thumbnail(frame)
+        if self.changed(thumbnail, self._previous):
+            self._stable = 0
+        else:
+            self._stable += 1
+        self._previous = thumbnail
+
+        if self._stable < self.stable_frames or not self.changed(thumbnail, self._reported):
+            return False
+        self._reported = thumbnail
+        return True
+
+class WatchController(QObject):
+    """
+    Watch mode: captures saved region (watch.region) every watch.interval_ms and
+    sends it to capture pipeline when its content changed and settled.
+    """
+    stateChanged = pyqtSignal(bool)  # active
+
+    def __init__(self, screenshot_controller, capture_pipeline, parent=None):
+        super().__init__(parent)
+        self.screenshot_controller = screenshot_controller
+        self.capture_pipeline = capture_pipeline
+        self.detector = FrameChangeDetector()
+        self._config = CachedSetting(lambda s: dict(s.get("watch") or {}), keys=["watch"])
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    @property
+    def isActive(self):
+        return self.timer.isActive()
+
+    def region(self):
+        """Saved region as QRect, or None"""
+        region = self._config.get().get("region")
+        if not region:
+            return None
+        return QRect(*region)
+
+    def select_region(self):
+        """Let user select region to watch and save it. Returns QRect or None if cancelled."""
+        rect = self.screenshot_controller.select_region()
+        if rect is None:
+            return None
+        settings_service.set("watch.region", [rect.x(), rect.y(), rect.width(), rect.height()])
+        return rect
+
+    def toggle(self):
+        if self.isActive:
+            self.stop()
+        else:
+            self.start()
+
+    def start(self, reselect=False):
+        """Start watching, asks for region when there's none saved yet. Returns True if started."""
+        self.stop()
+        rect = self.select_region() if reselect else (self.region() or self.select_region())
+        if rect is None:
+            return False
+
+        config = self._config.get()
+        self.detector = FrameChangeDetector(
+            change_ratio=float(config.get("change_ratio", 0.005)),
+            stable_frames=int(config.get("stable_frames", 2)),
+        )
+        self.timer.start(max(50, int(config.get("interval_ms", 500))))
+        print(f"Watch mode started ({rect.width()}x{rect.height()} at {rect.x()},{rect.y()})")
+        self.stateChanged.emit(True)
+        return True
+
+    def stop(self):
+        if not self.isActive:
+            return
+        self.timer.stop()
+        print("Watch mode stopped")
+        self.stateChanged.emit(False)
+
+    @pyqtSlot()
+    def tick(self):
+        # Don't pile up jobs behind slow engine, and leave manual captures alone
+        if self.capture_pipeline.isBusy or self.screenshot_controller.is_selecting():
+            return
+        rect = self.region()
+        if rect is None:
+            self.stop()
+            return
+        try:
+            frame = self.screenshot_controller.grab_region(rect)
+        except Exception as e:
+            print(f"Watch mode capture failed: {e}")
+            return
+
+        if self.detector.feed(frame):
+            translate = bool(self._config.get().get("translate", True))
+            # Don't steal focus from the game on every new line
+            self.capture_pipeline.submit(frame, translate=translate, focus=False)
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+class ResidentEngine:
+    __slots__ = ("engine", "status", "memory", "last_used", "in_use", "evicted")
+
+    def __init__(self, engine, status, memory):
+        self.engine = engine
+        self.status = status
+        self.memory = memory  # estimated bytes, 0 if unknown
+        self.last_used = time.monotonic()
+        self.in_use = 0  # predictions running on it right now
+        self.evicted = False
+
+class EnginePool:
+    """
+    Loaded OCR engines kept in memory, so switching between them is instant.
+
+    Least recently used engines get unloaded when there's more than `max_engines`
+    of them or their estimated memory goes over `max_memory` bytes, and engines
+    not used for `idle_timeout` seconds are unloaded too (0 disables a limit).
+    Most recently used engine (the one in use) is never evicted by budget or idleness.
+
+    Engines evicted while a prediction runs on them (acquire() without release() yet)
+    are closed only after that prediction finishes, see retire().
+    """
+
+    def __init__(self, max_engines=2, max_memory=0, idle_timeout=0):
+        self.max_engines = max(1, max_engines)
+        self.max_memory = max_memory
+        self.idle_timeout = idle_timeout
+        self._engines = OrderedDict()  # name -> ResidentEngine, oldest first
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_settings(cls, config):
+        config = config or {}
+        return cls(
+            max_engines=int(config.get("max_engines", 2)),
+            max_memory=int(config.get("max_memory_mb", 4096)) * 1024 * 1024,
+            idle_timeout=float(config.get("idle_timeout_s", 600)),
+        )
+
+    def __contains__(self, name):
+        return name in self._engines
+
+    def __len__(self):
+        return len(self._engines)
+
+    def names(self):
+        """Resident engine names, least recently used first."""
+        with self._lock:
+            return list(self._engines)
+
+    def total_memory(self):
+        with self._lock:
+            return sum(entry.memory for entry in self._engines.values())
+
+    def get(self, name):
+        """Returns ResidentEngine and marks it as most recently used, or None."""
+        with self._lock:
+            entry = self._engines.get(name)
+            if entry is not None:
+                self._engines.move_to_end(name)
+                entry.last_used = time.monotonic()
+            return entry
+
+    def acquire(self, name):
+        """Pin resident engine for a prediction, returns ResidentEngine or None. Pair with release()."""
+        with self._lock:
+            entry = self._engines.get(name)
+            if entry is not None:
+                entry.in_use += 1
+                entry.last_used = time.monotonic()
+            return entry
+
+    def release(self, entry):
+        """Unpin engine. Returns True when it was evicted meanwhile and now has to be unloaded."""
+        with self._lock:
+            entry.in_use -= 1
+            return entry.evicted and entry.in_use == 0
+
+    def retire(self, entries):
+        """Of evicted entries, returns those that can be unloaded now (rest goes on their last release())."""
+        with self._lock:
+            return [entry for entry in entries if entry.in_use == 0]
+
+    def add(self, name, engine, status, memory=0):
+        """Add freshly loaded engine as most recently used. Returns evicted engines."""
+        with self._lock:
+            self._engines[name] = ResidentEngine(engine, status, memory)
+            self._engines.move_to_end(name)
+            evicted = []
+            while len(self._engines) > 1 and (
+                    len(self._engines) > self.max_engines
+                    or (self.max_memory > 0 and self.total_memory() > self.max_memory)):
+                evicted.append(self._pop_oldest())
+            return evicted
+
+    def evict_idle(self, now=None):
+        """Evict engines (except the most recent one) idle for longer than idle_timeout. Returns them."""
+        if self.idle_timeout <= 0:
+            return []
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            names = list(self._engines)[:-1]
+            idle = [name for name in names if now - self._engines[name].last_used > self.idle_timeout]
+            return [self._pop(name) for name in idle]
+
+    def clear(self):
+        with self._lock:
+            evicted = [self._pop_oldest() for _ in range(len(self._engines))]
+        return evicted
+
+    def _pop_oldest(self):
+        return self._pop(next(iter(self._engines)))
+
+    def _pop(self, name):
+        entry = self._engines.pop(name)
+        entry.evicted = True
+        print(f"Unloading OCR engine '{name}'")
+        return entry
+
+def unload(entries):
+    """Release evicted engines, call outside of any lock (may take a while)."""
+    for entry in entries:
+        close = getattr(entry.engine, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                print(f"Error while closing OCR engine: {e}")
+    return len(entries)
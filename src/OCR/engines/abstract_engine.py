@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 
 class AbstractOcrEngine(ABC):
+    # OcrManager doesn't call engine for images that can't contain text (see OCR/text_presence.py)
+    skip_textless = True
+
     def __init__(self, **kwargs):
         self.initialized = False
         try:
@@ -29,6 +32,18 @@ class AbstractOcrEngine(ABC):
         """
         pass
 
+    def predict_batch(self, images):
+        """
+        Args:
+            images (list[np.array]): Input images.
+
+        Returns:
+            list[str]: Extracted text for each image, in the same order.
+
+        Runs predict() one by one, engines with batched inference override it.
+        """
+        return [self.predict(image) for image in images]
+
     @property
     def isWorking(self):
         """
@@ -2,6 +2,9 @@ from .abstract_engine import AbstractOcrEngine
 from PIL import Image
 
 class MangaOcrEngine(AbstractOcrEngine):
+    # Images per generate() call, bigger batches run out of (V)RAM
+    MAX_BATCH_SIZE = 8
+
     def _setupEngine(self, **kwargs):
         try:
             from manga_ocr import MangaOcr
@@ -9,19 +12,45 @@ class MangaOcrEngine(AbstractOcrEngine):
             print("MangaOCR initialized")
         except Exception as e:
             print(f"Could not load MangaOCR engine: {e}")
+        self._batch_size = kwargs.get("batch_size", self.MAX_BATCH_SIZE)
+
+    @staticmethod
+    def _to_pil(image):
+        # image is in BGR format from OpenCV, MangaOCR works on grayscale (as RGB)
+        return Image.fromarray(image[:, :, ::-1]).convert("L").convert("RGB")
 
     def predict(self, image):
         if self.isWorking:
             try:
-                # Convert numpy array to PIL Image
-                # image is in BGR format from OpenCV
-                rgb_image = Image.fromarray(image[:, :, ::-1])  # Convert BGR to RGB
                 # Perform OCR
-                text = self._mangaocr(rgb_image)
+                text = self._mangaocr(self._to_pil(image))
                 return text
             except Exception as e:
                 print(f"Error during MangaOCR prediction: {e}")
                 return ""
         else:
             print("Error: MangaOCR not initialized")
-            return ""
\ No newline at end of file
+            return ""
+
+    def predict_batch(self, images):
+        if not self.isWorking:
+            print("Error: MangaOCR not initialized")
+            return ["" for _ in images]
+        texts = []
+        for start in range(0, len(images), self._batch_size):
+            chunk = images[start:start + self._batch_size]
+            try:
+                texts.extend(self._recognize_batch([self._to_pil(image) for image in chunk]))
+            except Exception as e:
+                print(f"Error during batched MangaOCR prediction, falling back to single images: {e}")
+                texts.extend(self.predict(image) for image in chunk)
+        return texts
+
+    def _recognize_batch(self, pil_images):
+        """Same steps as MangaOcr.__call__, but one encoder/decoder pass for whole batch."""
+        from manga_ocr.ocr import post_process
+        mangaocr = self._mangaocr
+        pixel_values = mangaocr.processor(pil_images, return_tensors="pt").pixel_values
+        generated = mangaocr.model.generate(pixel_values.to(mangaocr.model.device), max_length=300)
+        decoded = mangaocr.tokenizer.batch_decode(generated.cpu(), skip_special_tokens=True)
+        return [post_process(text) for text in decoded]
@@ -1,64 +1,110 @@
 from .abstract_engine import AbstractOcrEngine
-from App.settings_service import settings_service
+from App.settings_service import CachedSetting
+from Util.openai_clients import openai_clients
+from Util.async_runtime import async_runtime
+from Util.rate_limiter import rate_limiters, limits_from_preset, RetryPolicy, call_with_retry, estimate_tokens
+from functools import partial
+from OCR.image_encoding import options_from_preset, encode_image
 import gc
 import base64
-from PIL import Image
-import io
+import math
 
 class OpenAiCompatibleOcrEngine(AbstractOcrEngine):
+    PROMPT = "OCR extract text from this image. Output only text, without any explanation."
+    OUTPUT_TOKENS = 256  # expected extracted text length, for rate limiter budget
+
     def _setupEngine(self, **kwargs):
         self.preset_name = kwargs.get('preset_name', 'default')  # Default to 'default' preset
+        self._client = None
+        self._client_key = None
+        self._applied_settings = None
+        self._settings = CachedSetting(partial(self._read_settings, self.preset_name), keys=["ocr_presets"])
         self.load_settings()
 
+    @staticmethod
+    def _find_preset(presets, preset_name):
+        # Fallback to default preset if specified preset not found
+        presets = presets or {}
+        return presets.get(preset_name) or presets.get("default") or {}
+
+    @staticmethod
+    def cache_scope(presets, preset_name):
+        """
+        Preset settings that change OCR output (model, image encoding), read from presets
+        dict directly, so edits count before engine re-reads them on its next predict.
+        """
+        preset = OpenAiCompatibleOcrEngine._find_preset(presets, preset_name)
+        encoding = ",".join(str(value) for value in options_from_preset(preset))
+        return f"{preset.get('model') or ''}/{encoding}"
+
+    @staticmethod
+    def _read_settings(preset_name, snapshot):
+        preset = OpenAiCompatibleOcrEngine._find_preset(snapshot.ocr_presets, preset_name)
+        return {
+            "base_url": preset.get("url") or "",
+            "api_key": preset.get("key") or "",
+            "model": preset.get("model") or "",
+            "encoding_options": options_from_preset(preset),
+            "rate_limits": limits_from_preset(preset),
+            "retry_policy": RetryPolicy.from_preset(preset),
+        }
+
     def load_settings(self):
-        from openai import OpenAI
-        
-        # Get settings based on preset
-        presets = settings_service.get("ocr_presets")
-        if presets and self.preset_name in presets:
-            preset = presets[self.preset_name]
-            base_url = preset.get("url") or ""
-            api_key = preset.get("key") or ""
-            self.model = preset.get("model") or ""
-        else:
-            # Fallback to default preset if specified preset not found
-            if presets and "default" in presets:
-                preset = presets["default"]
-                base_url = preset.get("url") or ""
-                api_key = preset.get("key") or ""
-                self.model = preset.get("model") or ""
-            else:
-                base_url = ""
-                api_key = ""
-                self.model = ""
-            
-        self._client = OpenAI(
-        #   base_url="https://openrouter.ai/api/v1",
-        base_url=base_url,
-        api_key=api_key)
+        # Only re-read after presets changed, not on every capture
+        config = self._settings.get()
+        if config is self._applied_settings:
+            return
+        self._applied_settings = config
+        self.base_url = config["base_url"]
+        self.api_key = config["api_key"]
+        self.model = config["model"]
+        self.encoding_options = config["encoding_options"]
+        self.retry_policy = config["retry_policy"]
+        self._limiter = rate_limiters.get((self.base_url, self.api_key, self.model), **config["rate_limits"])
+
+        # Clients are shared by endpoint (also with translation presets),
+        # only switch when preset points somewhere else
+        client_key = (self.base_url, self.api_key)
+        if client_key != self._client_key:
+            self._client = openai_clients.acquire(*client_key, async_client=True)
+            if self._client_key is not None:
+                openai_clients.release(*self._client_key, async_client=True)
+            self._client_key = client_key
+
+    def __del__(self):
+        if getattr(self, "_client_key", None) is not None:
+            openai_clients.release(*self._client_key, async_client=True)
+
+    def _estimate_tokens(self, image):
+        # Vision models bill roughly 85 + 170 tokens per 512px tile, plus the prompt and extracted text
+        height, width = image.shape[:2]
+        tiles = math.ceil(width / 512) * math.ceil(height / 512)
+        return 85 + 170 * tiles + estimate_tokens(self.PROMPT) + self.OUTPUT_TOKENS
 
     def predict(self, image):
         if self.isWorking:
-            # Convert numpy array to PIL Image
+            self.load_settings()
+
             # image is in BGR format from OpenCV
-            rgb_image = Image.fromarray(image[:, :, ::-1])  # Convert BGR to RGB
-            buffered = io.BytesIO()
-            rgb_image.save(buffered, format="PNG")
-            bb = base64.b64encode(buffered.getvalue()).decode('utf-8')
+            encoded, mime_type = encode_image(image, self.encoding_options)
+            bb = base64.b64encode(encoded).decode('utf-8')
 
-            self.load_settings()
-            completion = self._client.chat.completions.create(
-                model=self.model,
-                messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                    { "type": "text", "text": "OCR extract text from this image. Output only text, without any explanation." },
-                                    { "type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{bb}"}}
-                                ]
-                        }
-                ]
-            )
+            messages = [
+                    {
+                        "role": "user",
+                        "content": [
+                                { "type": "text", "text": self.PROMPT },
+                                { "type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{bb}"}}
+                            ]
+                    }
+            ]
+            tokens = self._estimate_tokens(image)
+            # Waits for rate limiter and retries 429/5xx instead of failing the capture
+            completion = async_runtime.run(call_with_retry(
+                lambda: self._client.chat.completions.create(model=self.model, messages=messages),
+                self._limiter, tokens, self.retry_policy, name=f"OCR with preset '{self.preset_name}'"))
+            usage = getattr(completion, "usage", None)
+            self._limiter.record_usage(tokens, getattr(usage, "total_tokens", None))
             return completion.choices[0].message.content
         else:
             print("Error: OpenAICompatible OCR not initialized")
\ No newline at end of file
@@ -1,45 +1,104 @@
 from .abstract_engine import AbstractOcrEngine
-# from memory_profiler import profile
-import gc
+from .paddleocr_worker import PaddleOcrProcess, DEFAULT_FACTORY
+from App.settings_service import settings_service
 
 class PaddleOcrEngine(AbstractOcrEngine):
+    """
+    I hate paddleocr I hate paddleocr I hate paddleocr I hate paddleocr
+    there's memory leak in library itself :/
+    (at least on cpu, without high performance inference)
+
+    So PaddleOCR runs in a worker process. When the worker's RSS grows too much
+    over what it used after first prediction, replacement is started in background
+    and swapped in once it has loaded, so no capture waits for model reload.
+    """
+
     def _setupEngine(self, **kwargs):
-        self.prediction_count = 0
-        self.reload_threshold = 4
-        try:
-            from paddleocr import PaddleOCR
-            self._paddleocr = PaddleOCR(
-                use_doc_orientation_classify=True, 
-                use_doc_unwarping=True, 
-                use_textline_orientation=True,
-                enable_mkldnn=False)
-        except:
-            print("Couldnt load PaddleOCR engine")
-    
-    # Doesnt even clean everything smh
-    def memoryLeakHack(self):
-        if hasattr(self, '_paddleocr'):
-            del self._paddleocr
-            self._paddleocr = None
-        gc.collect()
-        self._setupEngine()
-
-    # @profile
-    def predict(self, image):
+        config = settings_service.get("paddleocr") or {}
+        self.max_rss_growth = config.get("max_rss_growth_mb", 1024) * 1024 * 1024
+        self._factory = kwargs.get("factory", DEFAULT_FACTORY)
+        self._options = kwargs.get("options", {})
+        self._standby = None
+        self._baseline_rss = None
+
+        self._process = PaddleOcrProcess(self._factory, self._options)
+        if not self._process.wait_ready():
+            error = self._process.error
+            self._process.stop()
+            print(f"Couldnt load PaddleOCR engine: {error}")
+            raise RuntimeError(error)
+
+    def _spawn_standby(self, reason):
+        print(f"{reason}, warming up new PaddleOCR worker in background")
+        self._standby = PaddleOcrProcess(self._factory, self._options)
+
+    def _swap_in_standby(self):
+        if self._standby is None:
+            return
+        if self._standby.poll_ready():
+            old, self._process = self._process, self._standby
+            self._standby = None
+            self._baseline_rss = None
+            old.stop()
+            print(f"Switched to new PaddleOCR worker (pid {self._process.pid})")
+        elif self._standby.state == "failed":
+            print(f"Replacement PaddleOCR worker failed: {self._standby.error}")
+            self._standby.stop()
+            self._standby = None
+
+    def _replace_dead_worker(self):
+        # Worker crashed, we have to wait for new one this time.
+        # Standby that's already warming up (RSS triggered) is reused, not started twice
+        if self._standby is None:
+            self._spawn_standby("PaddleOCR worker died")
+        standby = self._standby
+        if not standby.wait_ready():
+            error = standby.error or standby.state
+            standby.stop()
+            self._standby = None
+            raise RuntimeError(f"PaddleOCR worker died and its replacement failed to start: {error}")
+        self._swap_in_standby()
 
-        # I hate paddleocr I hate paddleocr I hate paddleocr I hate paddleocr 
-        # there's memory leak in library itself :/
-        # (at least on cpu, without high performance inference)
-        if self.prediction_count >= self.reload_threshold:
-            self.memoryLeakHack()
+    def _check_memory(self):
+        rss = self._process.rss
+        if rss is None or self._standby is not None:
+            return
+        # Measure growth from after first real prediction, models allocate lazily
+        if self._baseline_rss is None:
+            self._baseline_rss = rss
+            return
+        growth = rss - self._baseline_rss
+        if growth > self.max_rss_growth:
+            self._spawn_standby(f"PaddleOCR worker grew by {growth / 1024 / 1024:.0f} MiB")
 
+    def memory_usage(self):
+        """RSS of the worker process in bytes (None if unknown)."""
+        return self._process.rss
+
+    def predict(self, image):
         if self.isWorking:
-            result = self._paddleocr.predict(image)
-            self.prediction_count += 1
-            texts = []
-            for res in result:
-                texts.append("\n".join(res["rec_texts"]))
-            formatted_text = "\n\n".join(texts)
-            return formatted_text
+            return self.predict_batch([image])[0]
         else:
-            print("Error: PaddleOCR not initialized")
\ No newline at end of file
+            print("Error: PaddleOCR not initialized")
+
+    def predict_batch(self, images):
+        if not self.isWorking:
+            print("Error: PaddleOCR not initialized")
+            return ["" for _ in images]
+        self._swap_in_standby()
+        if self._process.state == "failed":
+            self._replace_dead_worker()
+
+        # Whole batch goes to the worker in one round trip
+        texts = self._process.predict_batch(images)
+        self._check_memory()
+        return texts
+
+    def close(self):
+        for process in (getattr(self, "_process", None), getattr(self, "_standby", None)):
+            if process is not None:
+                process.stop()
+
+    def __del__(self):
+        if getattr(self, "_process", None) is not None:
+            self.close()
@@ -0,0 +1,155 @@
+"""
+PaddleOCR hosted in a child process.
+
+PaddleOCR leaks memory (at least on CPU, without high performance inference),
+running it in a separate process lets us throw the leaked memory away by
+replacing the whole process, without stalling the app.
+
+Images are sent over a pipe as raw buffers, child replies with recognized texts
+and its current RSS, so parent can decide when to recycle it.
+"""
+import importlib
+import multiprocessing
+import threading
+
+import numpy as np
+
+from Util.memory import current_rss
+
+DEFAULT_FACTORY = "OCR.engines.paddleocr_worker:PaddleRecognizer"
+
+class PaddleRecognizer:
+    """Runs inside the worker process."""
+
+    def __init__(self, **kwargs):
+        from paddleocr import PaddleOCR
+        options = dict(
+            use_doc_orientation_classify=True,
+            use_doc_unwarping=True,
+            use_textline_orientation=True,
+            enable_mkldnn=False)
+        options.update(kwargs)
+        self._paddleocr = PaddleOCR(**options)
+
+    def recognize(self, images):
+        # PaddleOCR takes list of images and batches them internally, one result per image
+        results = self._paddleocr.predict(list(images))
+        return ["\n".join(res["rec_texts"]) for res in results]
+
+def _load_factory(path):
+    module_name, attribute = path.split(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+def _worker_main(conn, factory, options):
+    try:
+        recognizer = _load_factory(factory)(**options)
+        # Warm up, so first real capture doesn't pay for lazy initialization
+        recognizer.recognize([np.full((48, 160, 3), 255, dtype=np.uint8)])
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", current_rss()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message[0] == "stop":
+            break
+        if message[0] == "predict":
+            images = [np.frombuffer(conn.recv_bytes(), dtype=dtype).reshape(shape).copy()
+                      for shape, dtype in message[1]]
+            try:
+                conn.send(("result", recognizer.recognize(images), current_rss()))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+
+class PaddleOcrProcess:
+    """
+    Parent side handle of a worker process. Process starts loading the model
+    right away, use poll_ready()/wait_ready() to find out when it's usable.
+    """
+
+    def __init__(self, factory=DEFAULT_FACTORY, options=None):
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_worker_main, args=(child_conn, factory, options or {}), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._lock = threading.Lock()
+        self.state = "starting"  # starting / ready / failed / stopped
+        self.rss = None
+        self.error = None
+
+    @property
+    def pid(self):
+        return self._process.pid
+
+    def _receive_startup(self, timeout):
+        if self.state != "starting" or not self._conn.poll(timeout):
+            return
+        try:
+            message = self._conn.recv()
+        except (EOFError, OSError):
+            message = ("error", "worker process died during startup")
+        if message[0] == "ready":
+            self.state = "ready"
+            self.rss = message[1]
+        else:
+            self.state = "failed"
+            self.error = message[1]
+
+    def poll_ready(self):
+        """Non blocking check if worker finished loading."""
+        with self._lock:
+            self._receive_startup(0)
+            return self.state == "ready"
+
+    def wait_ready(self, timeout=None):
+        with self._lock:
+            self._receive_startup(timeout)
+            return self.state == "ready"
+
+    def predict_batch(self, images):
+        """
+        Args:
+            images (list[np.array]): BGR images.
+
+        Returns:
+            list[str]: Recognized text for each image.
+        """
+        with self._lock:
+            self._receive_startup(None)
+            if self.state != "ready":
+                raise RuntimeError(f"PaddleOCR worker is not running ({self.error or self.state})")
+
+            images = [np.ascontiguousarray(image) for image in images]
+            try:
+                self._conn.send(("predict", [(image.shape, image.dtype.str) for image in images]))
+                for image in images:
+                    self._conn.send_bytes(memoryview(image).cast("B"))
+                reply = self._conn.recv()
+            except (EOFError, OSError) as e:
+                self.state = "failed"
+                self.error = f"worker process died: {e}"
+                raise RuntimeError(f"PaddleOCR {self.error}")
+
+        if reply[0] == "error":
+            raise RuntimeError(reply[1])
+        _, texts, self.rss = reply
+        return texts
+
+    def stop(self, timeout=5):
+        with self._lock:
+            if self.state == "stopped":
+                return
+            self.state = "stopped"
+            try:
+                self._conn.send(("stop",))
+            except (EOFError, OSError):
+                pass
+            self._conn.close()
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
@@ -1,5 +1,6 @@
 from .abstract_engine import AbstractOcrEngine
-import asyncio
+from App.settings_service import CachedSetting
+from Util.async_runtime import async_runtime
 from PIL import Image
 import numpy as np
 
@@ -10,18 +11,19 @@ class WindowsOcrEngine(AbstractOcrEngine):
             self._winocr = winocr
         except:
             print("Couldnt load Windows OCR engine")
+        self._lang = CachedSetting(lambda s: s.source_lang, keys=["source_lang"])
     
     async def _ensure_coroutine(self, awaitable):
+        # recognize_pil returns WinRT operation, run_coroutine_threadsafe needs a coroutine
         return await awaitable
 
     def _recognize_pil_lines(self, img, language="en"):
-        return asyncio.run(self._ensure_coroutine(self._winocr.recognize_pil(img, lang=language))).lines
+        return async_runtime.run(self._ensure_coroutine(self._winocr.recognize_pil(img, lang=language))).lines
 
     def predict(self, image):
         if self.isWorking:
             try:
-                from App.settings_service import settings_service
-                lang = settings_service.get("source_lang")
+                lang = self._lang.get()
 
                 # Convert numpy array to PIL Image
                 # image is in BGR format from OpenCV
@@ -0,0 +1,65 @@
+from collections import namedtuple
+
+import cv2
+
+MIME_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+}
+
+EncodingOptions = namedtuple("EncodingOptions",
+    ["format", "quality", "max_long_edge", "max_pixels", "grayscale"],
+    defaults=["PNG", 90, 0, 0, False])
+
+def options_from_preset(preset):
+    """Read encoding options from OCR preset dict, missing keys fall back to defaults (lossless PNG)."""
+    preset = preset or {}
+    image_format = str(preset.get("image_format") or "PNG").upper()
+    if image_format not in MIME_TYPES:
+        print(f"Unknown image format '{image_format}', using PNG")
+        image_format = "PNG"
+    return EncodingOptions(
+        format=image_format,
+        quality=int(preset.get("image_quality") or 90),
+        max_long_edge=int(preset.get("max_long_edge") or 0),
+        max_pixels=int(preset.get("max_pixels") or 0),
+        grayscale=bool(preset.get("grayscale", False)),
+    )
+
+def downscale(image, max_long_edge=0, max_pixels=0):
+    """Shrink image (keeping aspect ratio) so it fits both limits, 0 means no limit."""
+    height, width = image.shape[:2]
+    scale = 1.0
+    if max_long_edge > 0 and max(height, width) > max_long_edge:
+        scale = min(scale, max_long_edge / max(height, width))
+    if max_pixels > 0 and height * width > max_pixels:
+        scale = min(scale, (max_pixels / (height * width)) ** 0.5)
+    if scale >= 1.0:
+        return image
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+def encode_image(image, options=EncodingOptions()):
+    """
+    Args:
+        image (np.array): BGR image.
+        options (EncodingOptions): How to encode it.
+
+    Returns:
+        tuple: (encoded bytes, mime type)
+    """
+    image = downscale(image, options.max_long_edge, options.max_pixels)
+    if options.grayscale and image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    # OpenCV encodes straight from BGR, no RGB conversion/PIL copy needed
+    if options.format == "JPEG":
+        ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, options.quality])
+    elif options.format == "WEBP":
+        ok, buffer = cv2.imencode(".webp", image, [cv2.IMWRITE_WEBP_QUALITY, options.quality])
+    else:
+        ok, buffer = cv2.imencode(".png", image, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+    if not ok:
+        raise RuntimeError(f"Couldn't encode image as {options.format}")
+    return buffer.tobytes(), MIME_TYPES[options.format]
@@ -0,0 +1,137 @@
+import hashlib
+import threading
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from Util.persistent_lru import PersistentLruCache
+
+# Identifies image within a cache scope (engine/preset)
+Fingerprint = namedtuple("Fingerprint", ["scope", "digest", "phash", "shape"])
+
+ENTRY_OVERHEAD = 128  # rough size of bookkeeping per entry, in bytes
+
+def exact_hash(image):
+    """Hash of raw BGR buffer (including shape, so differently cropped images don't collide)."""
+    image = np.ascontiguousarray(image)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{image.shape}{image.dtype}".encode())
+    h.update(memoryview(image).cast("B"))
+    return h.hexdigest()
+
+def perceptual_hash(image, hash_size=16):
+    """
+    Difference hash (dHash) of an image, returned as int.
+    Survives small shifts in selection, compression noise and subtle animations.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+class OcrCache:
+    """
+    Content addressed cache of OCR results.
+
+    Exact lookups go by hash of the image buffer. If `perceptual` is on,
+    images within `tolerance` bits (dHash) and similar size are considered equal too.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=1024 * 1024, perceptual=False, tolerance=6, path=None):
+        self.perceptual = perceptual
+        self.tolerance = tolerance
+        self._store = PersistentLruCache(max_entries=max_entries, max_bytes=max_bytes, path=path)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.perceptual_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, config):
+        """Create cache from `ocr_cache` settings dict, returns None if caching is disabled."""
+        config = config or {}
+        if not config.get("enabled", True):
+            return None
+        return cls(
+            max_entries=config.get("max_entries", 256),
+            max_bytes=config.get("max_bytes", 1024 * 1024),
+            perceptual=config.get("perceptual_hash", False),
+            tolerance=config.get("perceptual_tolerance", 6),
+            path=config.get("path") if config.get("persist", False) else None,
+        )
+
+    def fingerprint(self, scope, image):
+        phash = perceptual_hash(image) if self.perceptual else None
+        return Fingerprint(scope, exact_hash(image), phash, image.shape[:2])
+
+    def lookup(self, fingerprint):
+        """Returns cached text for fingerprint or None."""
+        entry = self._store.get(f"{fingerprint.scope}:{fingerprint.digest}")
+        perceptual_hit = False
+        if entry is None and fingerprint.phash is not None:
+            entry = self._find_similar(fingerprint)
+            perceptual_hit = entry is not None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.perceptual_hits += perceptual_hit
+            self.saved_seconds += entry["elapsed"]
+        return entry["text"]
+
+    def _find_similar(self, fingerprint):
+        height, width = fingerprint.shape
+        prefix = f"{fingerprint.scope}:"
+        for key, entry in reversed(self._store.items()):
+            if not key.startswith(prefix) or entry.get("phash") is None:
+                continue
+            entry_height, entry_width = entry["shape"]
+            # dHash ignores scale, so don't match e.g. whole dialogue box with single line of it
+            if abs(entry_height - height) > 0.1 * height or abs(entry_width - width) > 0.1 * width:
+                continue
+            if hamming_distance(int(entry["phash"], 16), fingerprint.phash) <= self.tolerance:
+                self._store.get(key)  # mark as recently used
+                return entry
+        return None
+
+    def store(self, fingerprint, text, elapsed):
+        if not text:
+            return
+        entry = {
+            "text": text,
+            "elapsed": elapsed,
+            "phash": format(fingerprint.phash, "x") if fingerprint.phash is not None else None,
+            "shape": list(fingerprint.shape),
+        }
+        size = len(text.encode("utf-8")) + ENTRY_OVERHEAD
+        self._store.put(f"{fingerprint.scope}:{fingerprint.digest}", entry, size)
+
+    def save(self):
+        self._store.save()
+
+    def clear(self):
+        self._store.clear()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._store),
+            "bytes": self._store.total_bytes,
+            "hits": self.hits,
+            "perceptual_hits": self.perceptual_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "saved_seconds": self.saved_seconds,
+        }
@@ -1,12 +1,23 @@
 import gc
+import threading
+import time
+from OCR.ocr_cache import OcrCache
 from OCR.engines.abstract_engine import AbstractOcrEngine
 from OCR.engines.paddleocr_engine import PaddleOcrEngine
 from OCR.engines.windows_ocr_engine import WindowsOcrEngine
 from OCR.engines.mangaocr_engine import MangaOcrEngine
 from OCR.engines.openai_compatible_engine import OpenAiCompatibleOcrEngine
 from App.settings_service import settings_service
+from Util.engine_status import EngineStatus
+from Util.memory import current_rss
+from OCR.engine_pool import EnginePool, unload
+from OCR.text_presence import TextPresenceChecker, describe
+from OCR.preprocessing import Preprocessor
 
 class DummyOcrEngine(AbstractOcrEngine):
+    # Returns the same text for any image, tests rely on it
+    skip_textless = False
+
     def _setupEngine(self, **kwargs):
         print("Loading Dummy OCR Engine")
     def predict(self, image):
@@ -17,17 +28,148 @@ class OcrManager:
     _available_engines = {}
     _engine_presets = {}  # Store preset names for engines
 
-    def __init__(self, name, **kwargs):
-        engine_class = self._available_engines[name]
+    def __init__(self, name, load=True, **kwargs):
+        """
+        Args:
+            name (str): Engine to use.
+            load (bool): Load engine right away. With False, call load() later
+                (e.g. from background thread), predict() waits until it's ready.
+        """
+        self._current_engine = None
+        self._current_engine_name = name
+        self._engine_kwargs = kwargs
+        self._status = EngineStatus(name)
+        self._status_listeners = []
+        self._load_lock = threading.Lock()
+        self._pool = EnginePool.from_settings(settings_service.get("ocr_pool"))
+        self._idle_timer = None
+        self._cache = OcrCache.from_settings(settings_service.get("ocr_cache"))
+        self._text_presence = TextPresenceChecker.from_settings(settings_service.get("text_presence"))
+        self._preprocessing = settings_service.get("preprocessing")
+        self._preprocessors = {}  # engine name -> Preprocessor
+        if name not in self._available_engines:
+            # Deleted preset or engine without its dependency, UI shows it failed so another one can be picked
+            print(f"Unknown OCR engine '{name}'")
+            self._status.set_failed(f"Unknown engine '{name}'")
+        if load:
+            self.load()
+            print(f"OcrManager initialized with engine: {name}")
+
+    def load(self):
+        """
+        Load selected engine, if it's not loaded yet (blocking).
+
+        Raises:
+            RuntimeError: Engine couldn't be initialized.
+        """
+        with self._load_lock:
+            if self._status.state == EngineStatus.LOADING and self._current_engine is None:
+                self._load_engine(dict(self._engine_kwargs))
+
+    def _load_engine(self, kwargs):
+        """Construct current engine and resolve its status. Called with _load_lock held."""
+        name = self._current_engine_name
+        status = self._status
+        engine_class = self._available_engines.get(name)
+        if engine_class is None:
+            status.set_failed(f"Unknown engine '{name}'")
+            self._notify_status()
+            raise RuntimeError(f"Selected engine '{name}' could not be initialized. Unknown engine '{name}'")
         # Add preset name to kwargs if this is a preset engine
         if name in self._engine_presets:
             kwargs['preset_name'] = self._engine_presets[name]
-        self._current_engine = engine_class(**kwargs)
-        self._current_engine_name = name
-        if not self._current_engine.isWorking:
-            raise RuntimeError(f"Selected engine '{name}' could not be initialized. Check dependencies/configuration.")
 
-        print(f"OcrManager initialized with engine: {name}")
+        error = "Check dependencies/configuration."
+        engine = None
+        rss_before = current_rss()
+        try:
+            engine = engine_class(**kwargs)
+        except Exception as e:
+            error = str(e)
+        if engine is None or not engine.isWorking:
+            status.set_failed(error)
+            self._notify_status()
+            raise RuntimeError(f"Selected engine '{name}' could not be initialized. {error}")
+
+        self._current_engine = engine
+        # Only a working engine takes a slot, a failed load leaves resident ones alone
+        self._release(self._pool.add(name, engine, status, self._estimate_memory(engine, rss_before)))
+        status.set_ready()
+        self._notify_status()
+        self._schedule_idle_check()
+        print(f"OCR engine '{name}' loaded in {status.load_time:.2f}s")
+
+    @staticmethod
+    def _estimate_memory(engine, rss_before):
+        # Engines running out of process know their own size, otherwise use our RSS growth
+        memory_usage = getattr(engine, "memory_usage", None)
+        if callable(memory_usage):
+            usage = memory_usage()
+            if isinstance(usage, int):
+                return usage
+        rss_after = current_rss()
+        if rss_before is None or rss_after is None:
+            return 0
+        return max(0, rss_after - rss_before)
+
+    def _release(self, evicted):
+        # Engines still running a prediction are unloaded once it finishes (_release_engine)
+        evicted = self._pool.retire(evicted)
+        if evicted:
+            unload(evicted)
+            evicted.clear()
+            gc.collect()
+
+    def _schedule_idle_check(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self._pool.idle_timeout > 0 and len(self._pool) > 1:
+            self._idle_timer = threading.Timer(self._pool.idle_timeout, self.evict_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def evict_idle(self):
+        """Unload resident engines that weren't used for ocr_pool.idle_timeout_s."""
+        with self._load_lock:
+            self._release(self._pool.evict_idle())
+            self._schedule_idle_check()
+
+    def resident_engines(self):
+        """Names of engines kept loaded (least recently used first)."""
+        return self._pool.names()
+
+    def close(self):
+        """Unload all engines."""
+        with self._load_lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+            self._current_engine = None
+            self._release(self._pool.clear())
+
+    def status(self):
+        """EngineStatus of currently selected engine."""
+        return self._status
+
+    def add_status_listener(self, callback):
+        """callback(status) is called (from loading thread) whenever engine status changes."""
+        self._status_listeners.append(callback)
+
+    def _notify_status(self):
+        for callback in list(self._status_listeners):
+            try:
+                callback(self._status)
+            except Exception as e:
+                print(f"Error in engine status listener: {e}")
+
+    def wait_until_ready(self, timeout=None):
+        """Block until selected engine finished loading. Returns True if it's usable."""
+        while True:
+            status = self._status
+            status.wait(timeout)
+            # Engine got swapped while we waited, wait for the new one
+            if status is self._status:
+                return status.is_ready
 
     @classmethod
     def _registerEngine(cls, name, engine, preset_name=None):
@@ -35,8 +177,127 @@ class OcrManager:
         if preset_name is not None:
             cls._engine_presets[name] = preset_name
 
+    def _ready_engine(self):
+        """
+        Wait for selected engine and pin it (ResidentEngine), so a swap running meanwhile
+        can't unload it under the prediction. Pair with _release_engine().
+        """
+        while True:
+            # Captures made while engine is loading wait for it here (on the worker thread)
+            if not self.wait_until_ready():
+                status = self._status
+                raise RuntimeError(f"OCR engine '{status.name}' is not available ({status.describe()})")
+            status = self._status
+            entry = self._pool.acquire(status.name)
+            if entry is not None:
+                return entry
+            if status is self._status:
+                raise RuntimeError(f"OCR engine '{status.name}' was unloaded")
+            # Swapped to another engine meanwhile, wait for that one
+
+    def _release_engine(self, entry):
+        if self._pool.release(entry):
+            unload([entry])
+            gc.collect()
+
     def predict(self, image):
-        return self._current_engine.predict(image)
+        return self.predict_batch([image])[0]
+
+    def predict_batch(self, images):
+        """
+        OCR several images with one engine call (cached ones and ones that
+        obviously contain no text are skipped).
+
+        Args:
+            images (list[np.array]): BGR images.
+
+        Returns:
+            list[str]: Text for each image, in the same order ("" for textless ones).
+        """
+        entry = self._ready_engine()
+        try:
+            engine = entry.engine
+            if not images:
+                return []
+
+            texts = [""] * len(images)
+            candidates = [i for i, image in enumerate(images) if self._may_contain_text(engine, image)]
+            if candidates:
+                # Pinned engine's name, current one can change with a swap meanwhile
+                results = self._predict_cached(entry.status.name, engine, [images[i] for i in candidates])
+                for i, text in zip(candidates, results):
+                    texts[i] = text
+            return texts
+        finally:
+            self._release_engine(entry)
+
+    def _may_contain_text(self, engine, image):
+        if self._text_presence is None or not getattr(engine, "skip_textless", True):
+            return True
+        presence = self._text_presence.check(image)
+        # Logged either way, so thresholds can be tuned (text_presence settings)
+        print(f"Text check: {describe(presence)}" + ("" if presence.has_text else ", skipping OCR"))
+        return presence.has_text
+
+    def _preprocessor(self, name):
+        if name not in self._preprocessors:
+            self._preprocessors[name] = Preprocessor.for_engine(name, self._preprocessing)
+        return self._preprocessors[name]
+
+    def _preprocess_and_predict(self, name, engine, images):
+        preprocessor = self._preprocessor(name)
+        return self._engine_predict(engine, [preprocessor.apply(image) for image in images])
+
+    def _predict_cached(self, name, engine, images):
+        # Cache is keyed by the raw capture, so hits skip preprocessing too
+        if self._cache is None:
+            return self._preprocess_and_predict(name, engine, images)
+
+        scope = self._cache_scope(name)
+        fingerprints = [self._cache.fingerprint(scope, image) for image in images]
+        texts = [self._cache.lookup(fingerprint) for fingerprint in fingerprints]
+        missing = [i for i, text in enumerate(texts) if text is None]
+        if len(missing) < len(images):
+            stats = self._cache.stats()
+            print(f"OCR cache hit (hit rate {stats['hit_rate']:.0%}, saved {stats['saved_seconds']:.2f}s total)")
+        if not missing:
+            return texts
+
+        start = time.perf_counter()
+        results = self._preprocess_and_predict(name, engine, [images[i] for i in missing])
+        # Each image is credited with its share of batch time
+        seconds = (time.perf_counter() - start) / len(missing)
+        for i, text in zip(missing, results):
+            texts[i] = text
+            self._cache.store(fingerprints[i], text, seconds)
+        self._cache.save()
+        return texts
+
+    @staticmethod
+    def _engine_predict(engine, images):
+        # Single image keeps using predict(), engines only batch when there's something to batch
+        if len(images) == 1:
+            return [engine.predict(images[0])]
+        return list(engine.predict_batch(images))
+
+    def _cache_scope(self, name):
+        scope_name = name
+        # Preset engines can point at different models and encode images differently
+        if name in self._engine_presets:
+            preset_name = self._engine_presets[name]
+            scope = OpenAiCompatibleOcrEngine.cache_scope(settings_service.get("ocr_presets"), preset_name)
+            scope_name = f"{name}/{preset_name}/{scope}"
+        # Different preprocessing can give different text
+        profile = self._preprocessor(name).name
+        if profile != "none":
+            return f"{scope_name}/{profile}"
+        return scope_name
+
+    def cache_stats(self):
+        """Returns OCR cache statistics (hit rate, saved time, ...), or None when cache is disabled."""
+        if self._cache is None:
+            return None
+        return self._cache.stats()
     
     def available_engines(self):
         return list(self._available_engines.keys())
@@ -45,8 +306,8 @@ class OcrManager:
         return self._current_engine_name
 
     def swap_engine(self, name, **kwargs):
-        # Don't change engine if it's already the current one
-        if self._current_engine_name == name:
+        # Don't change engine if it's already the current one (unless it failed to load)
+        if self._current_engine_name == name and self._status.state != EngineStatus.FAILED:
             # Check if preset engines have the same parameters
             if name in self._engine_presets:
                 preset_name = self._engine_presets[name]
@@ -55,17 +316,23 @@ class OcrManager:
             else:
                 return
 
-        if self._current_engine is not None:
-            del self._current_engine
+        with self._load_lock:
+            self._current_engine_name = name
+            resident = self._pool.get(name)
+            if resident is not None:
+                # Still loaded, switching is instant
+                self._current_engine = resident.engine
+                self._status = resident.status
+                self._notify_status()
+                self._schedule_idle_check()
+                print(f"Switched to resident OCR engine '{name}'")
+                return
+
+            self._status = EngineStatus(name)
+            self._notify_status()
             self._current_engine = None
-            gc.collect()
-        engine_class = self._available_engines[name]
-        # Add preset name to kwargs if this is a preset engine
-        if name in self._engine_presets:
-            kwargs['preset_name'] = self._engine_presets[name]
-        self._current_engine = engine_class(**kwargs)
-        self._current_engine_name = name
-    
+            self._load_engine(kwargs)
+
     @classmethod
     def registerPresetEngines(cls):
         # Clear existing preset engines
@@ -0,0 +1,158 @@
+"""
+Image preprocessing before OCR, configured per engine with named profiles.
+
+    preprocessor = Preprocessor.for_engine("WindowsOCR", settings_service.get("preprocessing"))
+    image = preprocessor.apply(image)
+
+Steps run in this order (all optional): scale to target text height, grayscale,
+contrast stretch, deskew, binarization. Output is always BGR, like captures.
+"""
+import cv2
+import numpy as np
+
+# Built-in profiles, settings can add more (preprocessing.profiles) or override these
+PROFILES = {
+    "none": {},
+    # Small game/UI fonts scaled up, huge HiDPI selections scaled down
+    "scale": {"text_height": 32},
+    "upscale": {"text_height": 32, "max_scale": 4.0, "min_scale": 1.0},
+    "clean": {"text_height": 32, "grayscale": True, "contrast": True, "deskew": True},
+    "binarize": {"text_height": 32, "grayscale": True, "contrast": True, "deskew": True, "binarize": True},
+}
+
+def estimate_text_height(gray):
+    """
+    Median height of glyph-like connected components, or None when there are none.
+    Text polarity (dark on light / light on dark) is detected from Otsu threshold.
+    """
+    _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Text is the minority class
+    if np.count_nonzero(mask) > mask.size // 2:
+        mask = cv2.bitwise_not(mask)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    # Drop specks and components spanning the whole image (frames, backgrounds)
+    glyphs = heights[(areas >= 4) & (heights >= 3) & (heights < 0.9 * gray.shape[0])]
+    if glyphs.size == 0:
+        return None
+    return float(np.median(glyphs))
+
+def stretch_contrast(gray, low_percentile=1, high_percentile=99):
+    """Linear stretch so low/high percentiles map to 0/255 (lookup table, one pass)."""
+    low, high = np.percentile(gray, (low_percentile, high_percentile))
+    if high - low < 1:
+        return gray
+    table = np.clip((np.arange(256) - low) * (255.0 / (high - low)), 0, 255).astype(np.uint8)
+    return cv2.LUT(gray, table)
+
+def deskew(gray, max_angle=15.0):
+    """Rotate small text skew away, angle estimated from minimum area rectangle of the ink."""
+    _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if np.count_nonzero(mask) > mask.size // 2:
+        mask = cv2.bitwise_not(mask)
+    points = cv2.findNonZero(mask)
+    if points is None or len(points) < 10:
+        return gray
+    (_, _), (width, height), angle = cv2.minAreaRect(points)
+    # Angle convention differs between OpenCV versions, bring it to rotation of the longer side in (-45, 45]
+    if width < height:
+        angle += 90
+    while angle > 45:
+        angle -= 90
+    while angle <= -45:
+        angle += 90
+    if abs(angle) < 0.5 or abs(angle) > max_angle:
+        return gray
+    rows, cols = gray.shape
+    matrix = cv2.getRotationMatrix2D((cols / 2, rows / 2), angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (cols, rows), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+def binarize(gray):
+    """Otsu binarization, dark text on white background."""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if np.count_nonzero(binary) < binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+    return binary
+
+class Preprocessor:
+    def __init__(self, name="none", text_height=0, min_scale=0.25, max_scale=4.0,
+                 grayscale=False, contrast=False, deskew=False, binarize=False):
+        self.name = name
+        self.text_height = text_height  # preferred glyph height in pixels, 0 disables scaling
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.grayscale = grayscale or contrast or deskew or binarize  # these work on grayscale
+        self.contrast = contrast
+        self.deskew = deskew
+        self.binarize = binarize
+
+    @classmethod
+    def from_profile(cls, name, profile):
+        return cls(
+            name=name,
+            text_height=int(profile.get("text_height", 0)),
+            min_scale=float(profile.get("min_scale", 0.25)),
+            max_scale=float(profile.get("max_scale", 4.0)),
+            grayscale=bool(profile.get("grayscale", False)),
+            contrast=bool(profile.get("contrast", False)),
+            deskew=bool(profile.get("deskew", False)),
+            binarize=bool(profile.get("binarize", False)),
+        )
+
+    @classmethod
+    def for_engine(cls, engine_name, config):
+        """Preprocessor for engine from `preprocessing` settings dict (engines -> profile name)."""
+        config = config or {}
+        engines = config.get("engines") or {}
+        name = engines.get(engine_name, config.get("default", "none"))
+        profiles = {**PROFILES, **(config.get("profiles") or {})}
+        if name not in profiles:
+            print(f"Unknown preprocessing profile '{name}' for {engine_name}, using none")
+            name = "none"
+        return cls.from_profile(name, profiles[name])
+
+    @property
+    def is_noop(self):
+        return not (self.text_height or self.grayscale)
+
+    def scale_factor(self, gray):
+        if not self.text_height:
+            return 1.0
+        height = estimate_text_height(gray)
+        if height is None:
+            return 1.0
+        scale = min(self.max_scale, max(self.min_scale, self.text_height / height))
+        # Resampling costs time and some sharpness, not worth it for small corrections
+        return 1.0 if abs(scale - 1.0) < 0.15 else scale
+
+    def apply(self, image):
+        """
+        Args:
+            image (np.array): BGR image.
+
+        Returns:
+            np.array: Preprocessed BGR image (same object when profile does nothing).
+        """
+        if self.is_noop:
+            return image
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+        scale = self.scale_factor(gray)
+        if scale != 1.0:
+            height, width = gray.shape
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            interpolation = cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA
+            image = cv2.resize(image, size, interpolation=interpolation)
+            gray = cv2.resize(gray, size, interpolation=interpolation)
+
+        if not self.grayscale:
+            return image
+        if self.contrast:
+            gray = stretch_contrast(gray)
+        if self.deskew:
+            gray = deskew(gray)
+        if self.binarize:
+            gray = binarize(gray)
+        # Engines take BGR
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
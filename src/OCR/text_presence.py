@@ -0,0 +1,70 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# Decision of TextPresenceChecker, metrics are kept so thresholds can be tuned from the log
+TextPresence = namedtuple("TextPresence", ["has_text", "reason", "width", "height", "std", "edge_density"])
+
+class TextPresenceChecker:
+    """
+    Cheap check (a few ms) whether image can contain text at all, so accidental
+    clicks, tiny rectangles and empty backgrounds don't go through OCR engine.
+
+    Image is textless when it's smaller than min_width x min_height, its grayscale
+    standard deviation is below min_std (flat color), or less than min_edge_density
+    of its pixels are Canny edges (smooth gradients, blurred backgrounds).
+    """
+    ANALYSIS_SIZE = 640  # longer edge images are downscaled to before analysis
+
+    def __init__(self, min_width=8, min_height=8, min_std=4.0, min_edge_density=0.002):
+        self.min_width = min_width
+        self.min_height = min_height
+        self.min_std = min_std
+        self.min_edge_density = min_edge_density
+
+    @classmethod
+    def from_settings(cls, config):
+        """Create checker from `text_presence` settings dict, returns None if it's disabled."""
+        config = config or {}
+        if not config.get("enabled", True):
+            return None
+        return cls(
+            min_width=int(config.get("min_width", 8)),
+            min_height=int(config.get("min_height", 8)),
+            min_std=float(config.get("min_std", 4.0)),
+            min_edge_density=float(config.get("min_edge_density", 0.002)),
+        )
+
+    def check(self, image):
+        """Returns TextPresence for BGR (or grayscale) image."""
+        height, width = image.shape[:2]
+        if width < self.min_width or height < self.min_height:
+            return TextPresence(False, "too small", width, height, None, None)
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        scale = self.ANALYSIS_SIZE / max(width, height)
+        if scale < 1:
+            gray = cv2.resize(gray, (max(1, round(width * scale)), max(1, round(height * scale))),
+                              interpolation=cv2.INTER_AREA)
+
+        std = float(gray.std())
+        if std < self.min_std:
+            return TextPresence(False, "flat color", width, height, std, None)
+
+        edges = cv2.Canny(gray, 50, 150)
+        edge_density = np.count_nonzero(edges) / edges.size
+        if edge_density < self.min_edge_density:
+            return TextPresence(False, "no edges", width, height, std, edge_density)
+        return TextPresence(True, "", width, height, std, edge_density)
+
+def describe(presence):
+    """One line summary of a decision, for the log."""
+    metrics = f"{presence.width}x{presence.height}"
+    if presence.std is not None:
+        metrics += f", std {presence.std:.1f}"
+    if presence.edge_density is not None:
+        metrics += f", edges {presence.edge_density:.4f}"
+    if presence.has_text:
+        return f"text likely ({metrics})"
+    return f"no text, {presence.reason} ({metrics})"
@@ -29,19 +29,32 @@ class AbstractTranslationEngine(ABC):
         """
         pass
 
-    def translate_stream(self, text, chunk_callback, complete_callback=None):
+    def translate_stream(self, text, chunk_callback, complete_callback=None, cancel_token=None):
         """
         Stream translation with callbacks
         Args:
             text (str): Text to translate
             chunk_callback: Called with each text chunk (chunk: str)
             complete_callback: Called when streaming is complete (optional)
+            cancel_token (CancelToken): Stop streaming once it's cancelled (optional)
         """
         result = self.translate(text)
+        if cancel_token is not None and cancel_token.cancelled:
+            return
         chunk_callback(result)
         if complete_callback:
             complete_callback()
 
+    def cache_params(self):
+        """
+        Settings that influence the translation result (languages, model, prompt, ...).
+        Used together with engine name and text as translation cache key.
+
+        Returns:
+            dict: JSON serializable parameters.
+        """
+        return {}
+
     @property
     def isWorking(self):
         """
@@ -1,6 +1,6 @@
 from .abstract_engine import AbstractTranslationEngine
-from App.settings_service import settings_service
-import asyncio
+from App.settings_service import CachedSetting
+from Util.async_runtime import async_runtime
 
 class GoogleTranslateTranslationEngine(AbstractTranslationEngine):
     def _setupEngine(self, **kwargs):
@@ -10,21 +10,16 @@ class GoogleTranslateTranslationEngine(AbstractTranslationEngine):
             print("Google Translate initialized")
         except:
             print("Couldnt load Google translate engine")
+        self._langs = CachedSetting(lambda s: (s.translation_source_lang, s.translation_target_lang),
+                                    keys=["translation_source_lang", "translation_target_lang"])
     
     def translate(self, text):
-        try:
-            # Get the current running event loop if one exists
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # If no event loop is running, create a new one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        lang, dest = self._langs.get()
+
+        # googletrans is async, its HTTP client stays bound to the shared loop
+        result = async_runtime.run(self._translator.translate(text, dest=dest, src=lang))
+        return result.text
 
-        lang = settings_service.get("translation_source_lang")
-        dest = settings_service.get("translation_target_lang")
-        
-        # Run the async translation task until it's complete
-        result = loop.run_until_complete(
-            self._translator.translate(text, dest=dest, src=lang)
-        )
-        return result.text
\ No newline at end of file
+    def cache_params(self):
+        lang, dest = self._langs.get()
+        return {"source_lang": lang, "target_lang": dest}
\ No newline at end of file
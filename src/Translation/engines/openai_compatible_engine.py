@@ -1,80 +1,176 @@
 from .abstract_engine import AbstractTranslationEngine
-from App.settings_service import settings_service
+from App.settings_service import CachedSetting
+from Util.openai_clients import openai_clients
+from Util.async_runtime import async_runtime
+from Util.rate_limiter import rate_limiters, limits_from_preset, RetryPolicy, call_with_retry, estimate_tokens
+from concurrent.futures import CancelledError
+from functools import partial
+import hashlib
+import queue
 
 class OpenAiCompatibleTranslationEngine(AbstractTranslationEngine):
     def _setupEngine(self, **kwargs):
         self.preset_name = kwargs.get('preset_name', 'default')  # Default to 'default' preset
         self.prompt = ""
+        self._client = None
+        self._applied_settings = None
+        self._settings = CachedSetting(partial(self._read_settings, self.preset_name),
+                                       keys=["openai_translation_prompt", "translation_presets", "translation_target_lang"])
+        self._client_key = None
         self.load_settings()
     @property
     def supports_streaming(self):
         return True
 
+    @staticmethod
+    def _find_preset(presets, preset_name):
+        # Fallback to default preset if specified preset not found
+        presets = presets or {}
+        return presets.get(preset_name) or presets.get("default") or {}
+
+    @staticmethod
+    def _read_settings(preset_name, snapshot):
+        preset = OpenAiCompatibleTranslationEngine._find_preset(snapshot.translation_presets, preset_name)
+        prompt = snapshot.openai_translation_prompt or ""
+        return {
+            "prompt": prompt,
+            "prompt_hash": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "base_url": preset.get("url") or "",
+            "api_key": preset.get("key") or "",
+            "model": preset.get("model") or "",
+            "target_lang": snapshot.translation_target_lang,
+            "rate_limits": limits_from_preset(preset),
+            "retry_policy": RetryPolicy.from_preset(preset),
+        }
+
     def load_settings(self):
-        from openai import OpenAI
-        
-        self.prompt = settings_service.get("openai_translation_prompt")
-        # Get settings based on preset
-        presets = settings_service.get("translation_presets")
-        if presets and self.preset_name in presets:
-            preset = presets[self.preset_name]
-            base_url = preset.get("url") or ""
-            api_key = preset.get("key") or ""
-            self.model = preset.get("model") or ""
-        else:
-            # Fallback to default preset if specified preset not found
-            if presets and "default" in presets:
-                preset = presets["default"]
-                base_url = preset.get("url") or ""
-                api_key = preset.get("key") or ""
-                self.model = preset.get("model") or ""
-            else:
-                base_url = ""
-                api_key = ""
-                self.model = ""
-            
-        self._client = OpenAI(
-        #   base_url="https://openrouter.ai/api/v1",
-        base_url=base_url,
-        api_key=api_key)
-        self.target_lang = settings_service.get("translation_target_lang")
+        # Only re-read after one of our keys changed, not on every translation
+        config = self._settings.get()
+        if config is self._applied_settings:
+            return
+        self._applied_settings = config
+        self.prompt = config["prompt"]
+        self.prompt_hash = config["prompt_hash"]
+        self.base_url = config["base_url"]
+        self.api_key = config["api_key"]
+        self.model = config["model"]
+        self.target_lang = config["target_lang"]
+        self.retry_policy = config["retry_policy"]
+        self._limiter = rate_limiters.get((self.base_url, self.api_key, self.model), **config["rate_limits"])
+        # Preset may point at a server that takes stream_options now, try again
+        self._stream_usage = True
+
+        # Clients are shared by endpoint, only switch when preset points somewhere else
+        client_key = (self.base_url, self.api_key)
+        if client_key != self._client_key:
+            self._client = openai_clients.acquire(*client_key, async_client=True)
+            if self._client_key is not None:
+                openai_clients.release(*self._client_key, async_client=True)
+            self._client_key = client_key
+
+    def __del__(self):
+        if getattr(self, "_client_key", None) is not None:
+            openai_clients.release(*self._client_key, async_client=True)
+
+    def cache_params(self):
+        self.load_settings()
+        return {
+            "preset": self.preset_name,
+            "url": self.base_url,
+            "model": self.model,
+            "target_lang": self.target_lang,
+            "prompt": self.prompt_hash,
+        }
+
+    def _messages(self, text):
+        return [
+                {
+                    "role": "user",
+                    "content": f"{self.prompt} Translate to {self.target_lang} following text: {text}"
+                }
+        ]
+
+    def _estimate_tokens(self, text):
+        # Prompt and text in, translation about as long as the text out
+        return estimate_tokens(self.prompt + text) + estimate_tokens(text)
+
+    def _create(self, messages, tokens, **kwargs):
+        """Completion call waiting for rate limiter and retrying 429/5xx (awaitable)."""
+        return call_with_retry(
+            lambda: self._client.chat.completions.create(model=self.model, messages=messages, **kwargs),
+            self._limiter, tokens, self.retry_policy, name=f"Translation with preset '{self.preset_name}'")
 
     def translate(self, text):
         self.load_settings()
-        completion = self._client.chat.completions.create(
-            model=self.model,
-            messages=[
-                    {
-                        "role": "user",
-                        "content": f"{self.prompt} Translate to {self.target_lang} following text: {text}"
-                    }
-            ]
-        )
+        tokens = self._estimate_tokens(text)
+        completion = async_runtime.run(self._create(self._messages(text), tokens))
+        usage = getattr(completion, "usage", None)
+        self._limiter.record_usage(tokens, getattr(usage, "total_tokens", None))
         return completion.choices[0].message.content
+
+    async def _open_stream(self, text, tokens):
+        messages = self._messages(text)
+        if not self._stream_usage:
+            return await self._create(messages, tokens, stream=True)
+        try:
+            return await self._create(messages, tokens, stream=True, stream_options={"include_usage": True})
+        except Exception as e:
+            if getattr(e, "status_code", None) != 400:
+                raise
+            # Some OpenAI-compatible servers reject stream_options, usage falls back to the estimate
+            completion = await self._create(messages, tokens, stream=True)
+            print(f"Preset '{self.preset_name}' doesn't take stream_options ({e}), streaming without usage")
+            self._stream_usage = False
+            return completion
+
+    async def _stream(self, text, chunk_callback):
+        tokens = self._estimate_tokens(text)
+        # Only opening the stream is retried, chunks that already arrived can't be taken back
+        completion = await self._open_stream(text, tokens)
+        usage = None
+        try:
+            async for chunk in completion:
+                # Usage comes in last chunk, which has no choices
+                usage = getattr(chunk, "usage", None) or usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                content = getattr(delta, "content", None)
+                reasoning_content = getattr(delta, "reasoning_content", None)
+                reasoning = getattr(delta, "reasoning", None)
+                if content is not None:
+                    chunk_callback(content)
+                if reasoning_content is not None:
+                    chunk_callback(reasoning_content)
+                if reasoning is not None:
+                    chunk_callback(reasoning)
+        finally:
+            # Also runs on cancel, closing the response stops token generation we'd pay for
+            await completion.close()
+        self._limiter.record_usage(tokens, getattr(usage, "total_tokens", None))
     
-    def translate_stream(self, text, chunk_callback, complete_callback=None):
+    def translate_stream(self, text, chunk_callback, complete_callback=None, cancel_token=None):
         self.load_settings()
-        completion = self._client.chat.completions.create(
-            model=self.model,
-            stream=True,
-            messages=[
-                    {
-                        "role": "user",
-                        "content": f"{self.prompt} Translate to {self.target_lang} following text: {text}"
-                    }
-            ]
-        )
-        for chunk in completion:
-            delta = chunk.choices[0].delta
-            content = getattr(delta, "content", None)
-            reasoning_content = getattr(delta, "reasoning_content", None)
-            reasoning = getattr(delta, "reasoning", None)
-            if content is not None:
-                chunk_callback(content)
-            if reasoning_content is not None:
-                chunk_callback(reasoning_content)
-            if reasoning is not None:
-                chunk_callback(reasoning)
-        
+        # Streams of all workers share the runtime loop, which only queues chunks.
+        # Callbacks run here on the worker thread, so they never block the loop.
+        chunks = queue.Queue()
+        future = async_runtime.submit(self._stream(text, chunks.put))
+        future.add_done_callback(lambda _: chunks.put(None))
+        if cancel_token is not None:
+            cancel_token.on_cancel(future.cancel)
+        try:
+            while (chunk := chunks.get()) is not None:
+                chunk_callback(chunk)
+        except BaseException:
+            # Nobody takes the rest of the stream
+            future.cancel()
+            raise
+        try:
+            future.result()
+        except CancelledError:
+            return
+
+        if cancel_token is not None and cancel_token.cancelled:
+            return
         if complete_callback:
             complete_callback()
\ No newline at end of file
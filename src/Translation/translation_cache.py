@@ -0,0 +1,93 @@
+import hashlib
+import json
+import threading
+
+from Util.persistent_lru import PersistentLruCache
+
+ENTRY_OVERHEAD = 128  # rough size of bookkeeping per entry, in bytes
+
+def normalize_text(text):
+    """Collapse whitespace differences that OCR likes to introduce, keeps line breaks."""
+    lines = (" ".join(line.split()) for line in text.strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+class TranslationCache:
+    """
+    Cache of finished translations keyed by engine, its settings (cache_params) and normalized text.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=4 * 1024 * 1024, path=None, write_delay=5.0):
+        self._store = PersistentLruCache(max_entries=max_entries, max_bytes=max_bytes, path=path)
+        self._lock = threading.Lock()
+        # New results are written in background after this many seconds of quiet
+        self.write_delay = write_delay
+        self._save_timer = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, config):
+        """Create cache from `translation_cache` settings dict, returns None if caching is disabled."""
+        config = config or {}
+        if not config.get("enabled", True):
+            return None
+        return cls(
+            max_entries=config.get("max_entries", 1000),
+            max_bytes=config.get("max_bytes", 4 * 1024 * 1024),
+            path=config.get("path") if config.get("persist", False) else None,
+        )
+
+    @staticmethod
+    def make_key(engine_name, params, text):
+        payload = json.dumps([engine_name, params, normalize_text(text)], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        result = self._store.get(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def put(self, key, result):
+        if not result:
+            return
+        self._store.put(key, result, len(result.encode("utf-8")) + ENTRY_OVERHEAD)
+
+    def save(self):
+        """Write cache to disk now (if it's persisted and changed)."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        self._store.save()
+
+    def save_later(self):
+        """(Re)start write-behind timer, so a burst of results ends up as one write."""
+        if not self._store.path:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.write_delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def clear(self):
+        self._store.clear()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._store),
+            "bytes": self._store.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
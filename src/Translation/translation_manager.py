@@ -1,85 +1,361 @@
+import asyncio
 import gc
+import threading
+import time
+from collections import deque
+from itertools import count
 from Translation.engines.abstract_engine import AbstractTranslationEngine
 from Translation.engines.dummy_engine import DummyTranslationEngine
 from Translation.engines.google_translate_engine import GoogleTranslateTranslationEngine
 from Translation.engines.openai_compatible_engine import OpenAiCompatibleTranslationEngine
+from Translation.translation_cache import TranslationCache
 from App.settings_service import settings_service
-from PyQt6.QtCore import QRunnable, QObject, pyqtSignal, QThreadPool, pyqtSlot
+from App.task_scheduler import task_scheduler, Priority
+from Util.engine_status import EngineStatus
+from Util.cancellation import CancelToken
+from Util.async_runtime import async_runtime
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal, pyqtSlot
 
 class TranslationWorkerSignals(QObject):
-    finished = pyqtSignal(str, str)  # engine_name, result
-    error = pyqtSignal(str, str)     # engine_name, error_message
-    chunk = pyqtSignal(str, str)  # engine_name, chunk_text
-    complete = pyqtSignal(str)    # engine_name
+    finished = pyqtSignal(int, str, str)  # request_id, engine_name, result
+    error = pyqtSignal(int, str, str)     # request_id, engine_name, error_message
+    chunk = pyqtSignal(int, str, str)     # request_id, engine_name, chunk_text
+    complete = pyqtSignal(int, str)       # request_id, engine_name
+
+class InFlightTranslation:
+    """
+    Translation running in a worker. Identical requests made meanwhile attach to it
+    instead of calling the engine again, chunks streamed so far are replayed to them.
+    Signals are emitted under `lock` once per attached request, so a replay never
+    overlaps with live chunks and cancelled requests stop getting anything right away.
+    """
+
+    def __init__(self, request_id):
+        self.lock = threading.Lock()
+        self.chunks = []
+        self.done = False  # final signal (complete/finished/error) was emitted
+        self.request_ids = [request_id]  # requests still waiting for the result
+        self.cancel_token = CancelToken()  # cancelled once no request waits anymore
+        self.worker = None
 
 class TranslationWorker(QRunnable):
-    def __init__(self, engine_name, engine, text, signals):
+    # Streamed chunks arriving faster than this are batched into one signal
+    CHUNK_BATCH_INTERVAL = 0.03  # seconds
+
+    def __init__(self, engine_name, engine, text, signals, on_result=None, flight=None, on_done=None, deliver=None):
         super().__init__()
         self.engine_name = engine_name
         self.engine = engine
         self.text = text
         self.signals = signals  # TranslationWorkerSignals
+        self.on_result = on_result  # called with full text after successful translation
+        self.flight = flight or InFlightTranslation(0)  # shared with attached requests
+        self.on_done = on_done  # called after final signal, successful or not
+        self.deliver = deliver  # deliver(request_id, engine_name, kind) -> False holds signal back (failover)
+
+    def _may_deliver(self, request_id, kind):
+        return self.deliver is None or self.deliver(request_id, self.engine_name, kind)
+
+    def _emit_chunk(self, text):
+        with self.flight.lock:
+            self.flight.chunks.append(text)
+            for request_id in self.flight.request_ids:
+                if self._may_deliver(request_id, "response"):
+                    self.signals.chunk.emit(request_id, self.engine_name, text)
+
+    def _emit_final(self, signal, *args, kind="response"):
+        with self.flight.lock:
+            self.flight.done = True
+            for request_id in self.flight.request_ids:
+                if self._may_deliver(request_id, kind):
+                    signal.emit(request_id, self.engine_name, *args)
 
     @pyqtSlot()
     def run(self):
+        try:
+            if not self.flight.cancel_token.cancelled:
+                self._translate()
+        finally:
+            if self.on_done:
+                self.on_done()
+
+    def _translate(self):
+        cancel_token = self.flight.cancel_token
         try:
             if self.engine.supports_streaming:
-                self.engine.translate_stream(self.text,
-                                             lambda chunk: self.signals.chunk.emit(self.engine_name, chunk),
-                                             lambda: self.signals.complete.emit(self.engine_name))
+                chunks = []
+                batch = []
+                batch_lock = threading.Lock()
+                last_emit = 0.0
+                flush_timer = None
+                def emit_batch():
+                    nonlocal last_emit, flush_timer
+                    with batch_lock:
+                        if flush_timer is not None:
+                            flush_timer.cancel()
+                            flush_timer = None
+                        if batch:
+                            self._emit_chunk("".join(batch))
+                            batch.clear()
+                        last_emit = time.monotonic()
+                def on_chunk(chunk):
+                    nonlocal flush_timer
+                    with batch_lock:
+                        chunks.append(chunk)
+                        batch.append(chunk)
+                        # One queued cross-thread signal per batch, not per token
+                        wait = self.CHUNK_BATCH_INTERVAL - (time.monotonic() - last_emit)
+                        if wait > 0 and flush_timer is None:
+                            # Batch goes out on time even when the model pauses after this chunk
+                            flush_timer = threading.Timer(wait, emit_batch)
+                            flush_timer.daemon = True
+                            flush_timer.start()
+                    if wait <= 0:
+                        emit_batch()
+                def on_complete():
+                    emit_batch()
+                    if cancel_token.cancelled:
+                        # Stream stopped early, don't cache partial result
+                        return
+                    if self.on_result:
+                        self.on_result("".join(chunks))
+                    self._emit_final(self.signals.complete)
+                try:
+                    self.engine.translate_stream(self.text, on_chunk, on_complete, cancel_token=cancel_token)
+                finally:
+                    # Don't lose buffered text when stream breaks off
+                    emit_batch()
             else:
                 result = self.engine.translate(self.text)
-                self.signals.finished.emit(self.engine_name, result)
+                if self.on_result:
+                    self.on_result(result)
+                self._emit_final(self.signals.finished, result)
         except Exception as e:
-            self.signals.error.emit(self.engine_name, str(e))
+            if cancel_token.cancelled:
+                # Aborted stream raises, nobody waits for it anymore
+                print(f"Translation with '{self.engine_name}' cancelled")
+                return
+            self._emit_final(self.signals.error, str(e), kind="error")
 
 
 class TranslationSignals(QObject):
-    translationReady = pyqtSignal(str, str)  # engine_name, translated_text
-    translationError = pyqtSignal(str, str)  # engine_name, error_message
-    translationChunk = pyqtSignal(str, str)  # engine_name, chunk_text
-    translationComplete = pyqtSignal(str)    # engine_name
+    translationReady = pyqtSignal(int, str, str)  # request_id, engine_name, translated_text
+    translationError = pyqtSignal(int, str, str)  # request_id, engine_name, error_message
+    translationChunk = pyqtSignal(int, str, str)  # request_id, engine_name, chunk_text
+    translationComplete = pyqtSignal(int, str)    # request_id, engine_name
+    translationFailover = pyqtSignal(int, str, str)  # request_id, winner, loser (cancelled or never started)
+
+class FailoverRace:
+    """
+    Request in failover mode: primary engine starts right away, fallback only when
+    primary gives no response (first chunk/result) within deadline, or fails.
+    First engine to respond wins, the other one gets cancelled.
+    """
+
+    def __init__(self, request_id, text, primary, fallback, deadline_ms, use_cache, priority):
+        self.lock = threading.Lock()
+        self.request_id = request_id
+        self.text = text
+        self.primary = primary
+        self.fallback = fallback
+        self.deadline_ms = deadline_ms
+        self.use_cache = use_cache
+        self.priority = priority
+        self.started = time.monotonic()
+        self.fallback_started_ms = None  # None = fallback wasn't needed (yet)
+        self.winner = None
+        self.response_ms = None  # when winner responded, since request start
+        self.failed = set()
+        self.closed = False
+        self.timer = None  # deadline coroutine future
+
+    def elapsed_ms(self):
+        return (time.monotonic() - self.started) * 1000
+
+    def record(self):
+        return {
+            "request_id": self.request_id,
+            "primary": self.primary,
+            "fallback": self.fallback,
+            "deadline_ms": self.deadline_ms,
+            "fallback_started_ms": self.fallback_started_ms,
+            "winner": self.winner,
+            "response_ms": self.response_ms,
+        }
+
 class TranslationManager:
     
     _available_engines = {}
     _engine_presets = {}  # Store preset names for engines
 
-    def __init__(self, names, signals=None, **kwargs):
+    def __init__(self, names, signals=None, load=True, **kwargs):
+        """
+        Args:
+            names (list[str]): Engines to use.
+            load (bool): Load engines right away. With False, call load() later
+                (e.g. from background thread), translations are queued until then.
+        """
         self._active_engines  = {}
+        self._statuses = {}  # name -> EngineStatus, of every requested engine
+        self._status_listeners = []
+        self._load_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._loaded = False
+        self._deferred = []  # translate() calls made before engines were loaded
+        if isinstance(names, str):
+            names = [names]
+        self._pending_load = (list(names), kwargs)
         self.signals = signals
-        self.update_active_engines(names, **kwargs)
-        self.threadpool = QThreadPool()
-    
+        self._set_loading(names)
+        # Workers run on shared scheduler, each engine has its own concurrency limit
+        self.threadpool = task_scheduler.lane("translation")
+        self._cache = TranslationCache.from_settings(settings_service.get("translation_cache"))
+        self._in_flight = {}  # request key -> InFlightTranslation
+        self._in_flight_lock = threading.Lock()
+        self._requests = {}  # request id -> {engine name: (request key, InFlightTranslation)}
+        self._request_ids = count(1)
+        self._races = {}  # request id -> FailoverRace, until it's decided
+        self._races_lock = threading.Lock()
+        self._failover_history = deque(maxlen=100)  # FailoverRace.record() of decided requests
+        if load:
+            self.load()
+
+    def load(self):
+        """Load engines given to constructor, if that didn't happen yet (blocking)."""
+        with self._state_lock:
+            pending, self._pending_load = self._pending_load, None
+        if pending is not None:
+            names, kwargs = pending
+            self.update_active_engines(names, **kwargs)
+
+    def _set_loading(self, names):
+        with self._state_lock:
+            self._loaded = False
+            self._statuses = {name: EngineStatus(name) for name in names if name in self._available_engines}
+        self._notify_status()
+
+    def statuses(self):
+        """EngineStatus of every requested engine, including failed ones."""
+        return list(self._statuses.values())
+
+    def engine_names(self):
+        """Requested engines, also those still loading or failed (active ones are getCurrentEngine())."""
+        return list(self._statuses)
+
+    def add_status_listener(self, callback):
+        """callback(status) is called (from loading thread) whenever some engine status changes."""
+        self._status_listeners.append(callback)
+
+    def _notify_status(self, status=None):
+        statuses = [status] if status is not None else self.statuses()
+        for callback in list(self._status_listeners):
+            for engine_status in statuses:
+                try:
+                    callback(engine_status)
+                except Exception as e:
+                    print(f"Error in engine status listener: {e}")
+
     def update_active_engines(self, names: list, **kwargs):
-        # Clean up old engines
-        for engine in self._active_engines.values():
-            del engine
-        self._active_engines.clear()
-        gc.collect()
-
-        for name in names:
-            if name in self._available_engines:
-                engine_class = self._available_engines[name]
-                if name in self._engine_presets:
-                    kwargs['preset_name'] = self._engine_presets[name]
-                instance = engine_class(**kwargs)
-                if instance.isWorking:
+        if isinstance(names, str):
+            # Older configs (and defaults) store single engine name
+            names = [names]
+        with self._load_lock:
+            self._set_loading(names)
+            # Nothing replaced by this load is pending anymore
+            with self._state_lock:
+                self._pending_load = None
+
+            # Clean up old engines
+            for engine in self._active_engines.values():
+                del engine
+            self._active_engines.clear()
+            gc.collect()
+
+            for name, status in list(self._statuses.items()):
+                try:
+                    instance = self.create_engine(name, **kwargs)
+                except Exception as e:
+                    instance = None
+                    status.set_failed(str(e))
+                if instance is not None and instance.isWorking:
                     self._active_engines[name] = instance
+                    status.set_ready()
                 else:
+                    if status.state == EngineStatus.LOADING:
+                        status.set_failed("Check dependencies/configuration.")
                     print(f"Engine '{name}' could not be initialized.")
-    
-    def translate(self, text, engine_name=None):
+                self._notify_status(status)
+
+            with self._state_lock:
+                self._loaded = True
+                deferred, self._deferred = self._deferred, []
+        for text, engine_name, use_cache, request_id, priority in deferred:
+            self.translate(text, engine_name, use_cache, request_id=request_id, priority=priority)
+
+    def new_request_id(self):
+        """Id for translate(request_id=...), lets caller know it before any signal arrives."""
+        return next(self._request_ids)
+
+    def translate(self, text, engine_name=None, use_cache=True, request_id=None, priority=Priority.INTERACTIVE):
+        """
+        Translate text with all active engines (or only engine_name), results come
+        through signals tagged with request id. Priority orders it among queued tasks (see Priority).
+        With `translation_failover` enabled, fallback engine runs only when primary is late (see FailoverRace).
+
+        Returns:
+            int: Request id (for cancel()), None if there's no such engine.
+        """
+        if request_id is None:
+            request_id = self.new_request_id()
+        with self._state_lock:
+            if not self._loaded:
+                # Engines are still loading, run it once they are ready
+                self._deferred.append((text, engine_name, use_cache, request_id, priority))
+                return request_id
+            active = dict(self._active_engines)
+            failed = [status for status in self._statuses.values() if status.state == EngineStatus.FAILED]
+
         if engine_name is not None:
-            if engine_name in self._active_engines:
-                engines = [(engine_name, self._active_engines[engine_name])]
+            if engine_name in active:
+                engines = [(engine_name, active[engine_name])]
             else:
-                return
+                engines = []
+            failed = [status for status in failed if status.name == engine_name]
         else:
-            engines = self._active_engines.items()
-        
+            engines = active.items()
+            race = self._start_race(request_id, text, active, use_cache, priority)
+            if race is not None:
+                engines = [(name, engine) for name, engine in engines if name != race.fallback]
+        if not engines and not failed:
+            return None
+
+        if self.signals is not None:
+            for status in failed:
+                self.signals.translationError.emit(request_id, status.name, f"Engine failed to load: {status.error}")
+
         for name, engine in engines:
+            request_key = self._request_key(name, engine, text)
+            cache_key = request_key if self._cache is not None else None
+            if use_cache and cache_key is not None:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._replay_cached(request_id, name, engine, cached)
+                    continue
+
+            flight, joined = self._join_or_start_flight(request_id, name, engine, request_key)
+            self._track(request_id, name, request_key, flight)
+            if joined:
+                # Same request is already running, its worker serves this one too
+                continue
+
             signals = TranslationWorkerSignals()
-            worker = TranslationWorker(name, engine, text, signals)
+            on_result = None
+            if cache_key is not None:
+                on_result = lambda result, key=cache_key: self._store_result(key, result)
+            on_done = lambda key=request_key, flight=flight: self._end_flight(key, flight)
+            worker = TranslationWorker(name, engine, text, signals, on_result=on_result, flight=flight,
+                                       on_done=on_done, deliver=self._may_deliver)
+            flight.worker = worker
             if engine.supports_streaming:
                 signals.chunk.connect(self.signals.translationChunk)
                 signals.complete.connect(self.signals.translationComplete)
@@ -88,8 +364,226 @@ class TranslationManager:
                 signals.finished.connect(self.signals.translationReady)
                 signals.error.connect(self.signals.translationError)
 
-            self.threadpool.start(worker)
-    
+            self.threadpool.start(worker, priority=priority, key=f"translation/{name}")
+        return request_id
+
+    def cancel(self, request_id, engine_name=None):
+        """
+        Stop delivering results of request (of all its engines, or just engine_name).
+        Engine calls nobody else waits for are aborted, queued ones don't start at all.
+        """
+        with self._state_lock:
+            self._deferred = [args for args in self._deferred
+                              if not (args[3] == request_id and (engine_name is None or args[1] == engine_name))]
+        if engine_name is None:
+            with self._races_lock:
+                race = self._races.pop(request_id, None)
+            if race is not None:
+                self._close_race(race)
+        with self._in_flight_lock:
+            entries = self._requests.get(request_id, {})
+            names = list(entries) if engine_name is None else [engine_name]
+            cancelled = [entries.pop(name) for name in names if name in entries]
+            if not entries:
+                self._requests.pop(request_id, None)
+
+        for request_key, flight in cancelled:
+            with flight.lock:
+                if request_id in flight.request_ids:
+                    flight.request_ids.remove(request_id)
+                abandoned = not flight.request_ids and not flight.done
+            if not abandoned:
+                continue
+            # Closes HTTP stream of running worker, identical new request won't attach to it
+            flight.cancel_token.cancel()
+            if flight.worker is not None and self.threadpool.tryTake(flight.worker):
+                # Never started, so it won't clean up after itself
+                self._end_flight(request_key, flight)
+            else:
+                with self._in_flight_lock:
+                    if request_key is not None and self._in_flight.get(request_key) is flight:
+                        del self._in_flight[request_key]
+            print(f"Cancelled translation request {request_id}")
+
+    def cancel_all(self):
+        """Cancel every request (e.g. on quit, so running streams don't hold up shutdown)."""
+        with self._state_lock:
+            request_ids = {args[3] for args in self._deferred}
+        with self._races_lock:
+            request_ids.update(self._races)
+        with self._in_flight_lock:
+            request_ids.update(self._requests)
+        for request_id in request_ids:
+            self.cancel(request_id)
+
+    def _request_key(self, name, engine, text):
+        """Identifies request by engine, its settings and text (also the cache key)."""
+        try:
+            return TranslationCache.make_key(name, engine.cache_params(), text)
+        except Exception as e:
+            print(f"Couldn't build translation cache key for '{name}': {e}")
+            return None
+
+    def _join_or_start_flight(self, request_id, name, engine, request_key):
+        """
+        Attach to identical running request, or register a new one.
+        Returns (InFlightTranslation, joined).
+        """
+        if request_key is None:
+            return InFlightTranslation(request_id), False
+
+        with self._in_flight_lock:
+            flight = self._in_flight.get(request_key)
+            if flight is None:
+                flight = self._in_flight[request_key] = InFlightTranslation(request_id)
+                return flight, False
+
+        with flight.lock:
+            if not flight.done and not flight.cancel_token.cancelled:
+                flight.request_ids.append(request_id)
+                if (self.signals is not None and engine.supports_streaming and flight.chunks
+                        and self._may_deliver(request_id, name, "response")):
+                    self.signals.translationChunk.emit(request_id, name, "".join(flight.chunks))
+                print(f"Attached to running '{name}' translation of the same text")
+                return flight, True
+
+        # Finished just now, start over (its entry is about to be removed)
+        with self._in_flight_lock:
+            flight = self._in_flight[request_key] = InFlightTranslation(request_id)
+        return flight, False
+
+    def _track(self, request_id, name, request_key, flight):
+        with self._in_flight_lock:
+            self._requests.setdefault(request_id, {})[name] = (request_key, flight)
+
+    def _end_flight(self, request_key, flight):
+        with self._in_flight_lock:
+            if request_key is not None and self._in_flight.get(request_key) is flight:
+                del self._in_flight[request_key]
+            for request_id in list(self._requests):
+                entries = self._requests[request_id]
+                for name in [name for name, (_, entry_flight) in entries.items() if entry_flight is flight]:
+                    del entries[name]
+                if not entries:
+                    del self._requests[request_id]
+
+    def _store_result(self, cache_key, result):
+        self._cache.put(cache_key, result)
+        # Whole file is rewritten on save, don't do it for every result
+        self._cache.save_later()
+
+    def save_cache(self):
+        """Write pending cache changes now (e.g. on quit)."""
+        if self._cache is not None:
+            self._cache.save()
+
+    def _replay_cached(self, request_id, name, engine, result):
+        """Deliver cached translation through the same signals as a fresh one."""
+        if self.signals is None or not self._may_deliver(request_id, name, "response"):
+            return
+        if engine.supports_streaming:
+            self.signals.translationChunk.emit(request_id, name, result)
+            self.signals.translationComplete.emit(request_id, name)
+        else:
+            self.signals.translationReady.emit(request_id, name, result)
+
+    def _start_race(self, request_id, text, active, use_cache, priority):
+        """FailoverRace for request when failover is enabled and both its engines are active, else None."""
+        config = settings_service.get("translation_failover") or {}
+        if not config.get("enabled"):
+            return None
+        primary, fallback = config.get("primary"), config.get("fallback")
+        if primary == fallback or primary not in active or fallback not in active:
+            return None
+
+        race = FailoverRace(request_id, text, primary, fallback, int(config.get("deadline_ms", 3000)), use_cache, priority)
+        with self._races_lock:
+            self._races[request_id] = race
+        race.timer = async_runtime.submit(self._race_deadline(race))
+        return race
+
+    async def _race_deadline(self, race):
+        await asyncio.sleep(race.deadline_ms / 1000)
+        self._start_fallback(race, f"no response from '{race.primary}' in {race.deadline_ms} ms")
+
+    def _start_fallback(self, race, reason):
+        with race.lock:
+            if race.closed or race.winner is not None or race.fallback_started_ms is not None:
+                return
+            race.fallback_started_ms = round(race.elapsed_ms())
+        print(f"Translation request {race.request_id}: {reason}, starting '{race.fallback}'")
+        self.translate(race.text, engine_name=race.fallback, use_cache=race.use_cache,
+                       request_id=race.request_id, priority=race.priority)
+
+    def _may_deliver(self, request_id, engine_name, kind):
+        """
+        Gate for signals of request in failover mode (called by workers under flight lock, so
+        follow-up work is handed to the async runtime loop). First response decides the winner,
+        after that only winner's signals pass.
+        """
+        with self._races_lock:
+            race = self._races.get(request_id)
+        if race is None:
+            return True
+        start_fallback = settle = False
+        with race.lock:
+            if race.closed:
+                return True
+            if race.winner is not None:
+                return engine_name == race.winner
+            if engine_name not in (race.primary, race.fallback):
+                return True
+            if kind == "error":
+                race.failed.add(engine_name)
+                start_fallback = engine_name == race.primary
+                settle = race.failed == {race.primary, race.fallback}
+            else:
+                race.winner = engine_name
+                race.response_ms = round(race.elapsed_ms())
+                settle = True
+        if start_fallback:
+            async_runtime.loop.call_soon_threadsafe(self._start_fallback, race, f"'{race.primary}' failed")
+        if settle:
+            async_runtime.loop.call_soon_threadsafe(self._settle_race, race)
+        return True
+
+    def _settle_race(self, race):
+        loser = None
+        if race.winner is not None:
+            loser = race.fallback if race.winner == race.primary else race.primary
+            # Loser goes first, while the race still holds back its signals
+            if race.fallback_started_ms is not None:
+                self.cancel(race.request_id, engine_name=loser)
+        with self._races_lock:
+            if self._races.get(race.request_id) is race:
+                del self._races[race.request_id]
+        self._close_race(race)
+        self._failover_history.append(race.record())
+        if race.winner is None:
+            print(f"Translation request {race.request_id}: both '{race.primary}' and '{race.fallback}' failed")
+            return
+        fallback = "not needed" if race.fallback_started_ms is None else f"started at {race.fallback_started_ms} ms"
+        print(f"Translation request {race.request_id}: '{race.winner}' answered first in {race.response_ms} ms "
+              f"(deadline {race.deadline_ms} ms, fallback {fallback})")
+        if self.signals is not None:
+            self.signals.translationFailover.emit(race.request_id, race.winner, loser)
+
+    def _close_race(self, race):
+        with race.lock:
+            race.closed = True
+        if race.timer is not None:
+            race.timer.cancel()
+
+    def failover_history(self):
+        """Deadline, fallback start and winner of recent failover requests (oldest first)."""
+        return list(self._failover_history)
+
+    def cache_stats(self):
+        """Returns translation cache statistics, or None when cache is disabled."""
+        if self._cache is None:
+            return None
+        return self._cache.stats()
+
     def available_engines(self):
         return list(self._available_engines.keys())
 
@@ -99,6 +593,17 @@ class TranslationManager:
     def swap_engine(self, name, **kwargs):
         self.update_active_engines(name,**kwargs)
     
+    @classmethod
+    def create_engine(cls, name, **kwargs):
+        """
+        New instance of registered engine, without activating it
+        (for use outside of the GUI, e.g. batch_cli). Raises KeyError for unknown engine.
+        """
+        engine_class = cls._available_engines[name]
+        if name in cls._engine_presets:
+            kwargs['preset_name'] = cls._engine_presets[name]
+        return engine_class(**kwargs)
+
     @classmethod
     def _registerEngine(cls, name, engine, preset_name=None):
         cls._available_engines[name] = engine
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+
+class AsyncRuntime:
+    """
+    One asyncio event loop on a background thread, shared by engines with async APIs
+    (googletrans, winocr, AsyncOpenAI clients).
+
+    Worker threads submit coroutines and block on the result, so requests from
+    several workers multiplex on the same loop and async HTTP clients (which are
+    bound to the loop they were first used on) keep their connection pools.
+    Loop starts on first use and shutdown() is final, clients bound to the loop
+    would be unusable on a new one.
+    """
+
+    def __init__(self, name="AsyncRuntime"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def loop(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is shut down")
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._run_loop, args=(loop, ready), name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop, ready):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def in_loop_thread(self):
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro):
+        """Schedule coroutine on the loop, returns concurrent.futures.Future."""
+        try:
+            loop = self.loop
+        except RuntimeError:
+            coro.close()
+            raise
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro, timeout=None, cancel_token=None):
+        """
+        Run coroutine on the loop and wait for it (don't call from coroutines on the loop).
+
+        Returns:
+            Result of the coroutine, its exception is raised here. When cancel_token gets
+            cancelled the coroutine is cancelled and concurrent.futures.CancelledError raised.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run() called from its own loop, await the coroutine instead")
+        future = self.submit(coro)
+        if cancel_token is not None:
+            cancel_token.on_cancel(future.cancel)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout=2.0):
+        """Cancel running coroutines and stop the loop, submit()/run() raise RuntimeError afterwards."""
+        with self._lock:
+            self._closed = True
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def cancel_tasks():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_tasks(), loop).result(timeout)
+        except Exception as e:
+            print(f"Error cancelling async tasks: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+# Global instance of async runtime
+async_runtime = AsyncRuntime()
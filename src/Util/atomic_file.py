@@ -0,0 +1,27 @@
+import json
+import os
+import tempfile
+
+def write_text_atomic(path, text):
+    """
+    Write text to temp file next to `path` and rename it over `path`.
+    Readers (and crashes mid-write) never see half written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Atomically write data as JSON, see write_text_atomic()."""
+    write_text_atomic(path, json.dumps(data, **dump_kwargs))
@@ -0,0 +1,37 @@
+import threading
+
+class CancelToken:
+    """
+    Cancellation flag shared between who started some work and the worker doing it.
+    Workers either poll `cancelled` or register on_cancel() callback that aborts
+    blocking work right away (e.g. closes HTTP stream).
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancel callback: {e}")
+
+    def on_cancel(self, callback):
+        """callback() runs (on cancelling thread) once token is cancelled, right away if it already is."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
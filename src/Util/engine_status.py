@@ -0,0 +1,46 @@
+import threading
+import time
+
+class EngineStatus:
+    """
+    Readiness of one engine load: loading -> ready / failed.
+    wait() blocks until the load finished either way.
+    """
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, name):
+        self.name = name
+        self.state = self.LOADING
+        self.error = None
+        self.load_time = None  # seconds, once finished
+        self._started = time.perf_counter()
+        self._done = threading.Event()
+
+    @property
+    def is_ready(self):
+        return self.state == self.READY
+
+    def set_ready(self):
+        self.load_time = time.perf_counter() - self._started
+        self.state = self.READY
+        self._done.set()
+
+    def set_failed(self, error):
+        self.load_time = time.perf_counter() - self._started
+        self.error = error
+        self.state = self.FAILED
+        self._done.set()
+
+    def wait(self, timeout=None):
+        """Returns True if engine is ready, False if it failed or timeout expired."""
+        self._done.wait(timeout)
+        return self.is_ready
+
+    def describe(self):
+        if self.state == self.READY:
+            return f"ready ({self.load_time:.1f}s)"
+        if self.state == self.FAILED:
+            return f"failed: {self.error}"
+        return "loading..."
@@ -0,0 +1,83 @@
+import threading
+
+from Util.async_runtime import async_runtime
+
+class OpenAiClientRegistry:
+    """
+    Shares OpenAI clients (and their keep-alive connection pools) between
+    engines/presets pointing at the same endpoint.
+
+    Clients are reference counted, engines acquire() client for their
+    (base_url, api_key) and release() it when preset changes or engine goes away.
+    Client is closed when nobody uses it anymore.
+
+    async_client=True gives AsyncOpenAI client, its calls have to run on
+    async_runtime loop (e.g. async_runtime.run(client.chat.completions.create(...))).
+    """
+
+    def __init__(self, max_connections=20, max_keepalive_connections=10, keepalive_expiry=120.0):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._clients = {}  # (base_url, api_key, async_client) -> client
+        self._refs = {}     # (base_url, api_key, async_client) -> reference count
+        self._lock = threading.Lock()
+
+    def _limits(self):
+        import httpx
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry)
+
+    def _create_client(self, base_url, api_key):
+        from openai import OpenAI, DefaultHttpxClient
+
+        http_client = DefaultHttpxClient(limits=self._limits())
+        return OpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+
+    def _create_async_client(self, base_url, api_key):
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        http_client = DefaultAsyncHttpxClient(limits=self._limits())
+        # Engines retry through Util.rate_limiter (shared backoff/pause per endpoint), not per client
+        return AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=http_client, max_retries=0)
+
+    def acquire(self, base_url, api_key, async_client=False):
+        key = (base_url, api_key, async_client)
+        with self._lock:
+            if key not in self._clients:
+                create = self._create_async_client if async_client else self._create_client
+                self._clients[key] = create(base_url, api_key)
+                self._refs[key] = 0
+            self._refs[key] += 1
+            return self._clients[key]
+
+    def release(self, base_url, api_key, async_client=False):
+        key = (base_url, api_key, async_client)
+        with self._lock:
+            if key not in self._refs:
+                return
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                return
+            client = self._clients.pop(key)
+            del self._refs[key]
+        if async_client and async_runtime.closed:
+            # Its loop is gone, so are the connections
+            return
+        try:
+            if async_client:
+                # Connections belong to the runtime loop, close them there (without waiting)
+                async_runtime.submit(client.close())
+            else:
+                client.close()
+        except Exception as e:
+            print(f"Error closing OpenAI client: {e}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clients)
+
+# Global instance of client registry
+openai_clients = OpenAiClientRegistry()
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from Util.atomic_file import write_json_atomic
+
+class PersistentLruCache:
+    """
+    Thread safe LRU mapping bounded by entry count and (approximate) size in bytes.
+
+    Values have to be JSON serializable when `path` is set,
+    cache is loaded from it on creation and written back with save().
+    """
+
+    def __init__(self, max_entries=256, max_bytes=1024 * 1024, path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+        if self.path:
+            self.load()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    @property
+    def total_bytes(self):
+        return self._bytes
+
+    def get(self, key, default=None):
+        """Get value and mark it as most recently used."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            # Wouldn't fit even in empty cache
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._dirty = True
+            self._evict()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value, size = self._entries.pop(key)
+            self._bytes -= size
+            self._dirty = True
+            return value
+
+    def items(self):
+        """Snapshot of (key, value) pairs, least recently used first."""
+        with self._lock:
+            return [(key, value) for key, (value, _) in self._entries.items()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._dirty = True
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def load(self):
+        """Load entries from disk, keeps whatever fits in current limits."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading cache {self.path}: {e}. Starting empty.")
+            return
+
+        with self._lock:
+            for key, value, size in data.get("entries", []):
+                self.put(key, value, size)
+            self._dirty = False
+
+    def save(self):
+        """Write cache to disk (atomically), does nothing if nothing changed."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"entries": [[key, value, size] for key, (value, size) in self._entries.items()]}
+            self._dirty = False
+
+        try:
+            write_json_atomic(self.path, data)
+        except (IOError, OSError) as e:
+            print(f"Error saving cache {self.path}: {e}")
@@ -0,0 +1,243 @@
+"""
+Client side rate limiting and retries for OpenAI-compatible endpoints.
+
+    limiter = rate_limiters.get((base_url, api_key, model), **limits_from_preset(preset))
+    completion = await call_with_retry(lambda: client.chat.completions.create(...),
+                                       limiter, tokens=estimate_tokens(prompt), policy=RetryPolicy())
+
+Requests wait for their turn (requests/min and tokens/min token buckets) instead of
+failing with 429, and 429/5xx/connection errors are retried with jittered exponential
+backoff, honoring Retry-After. Everything here runs on the async_runtime loop.
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+def estimate_tokens(text):
+    """Rough token count of text (~4 characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+def limits_from_preset(preset):
+    """Rate limit options from translation/OCR preset dict, 0 = no limit."""
+    preset = preset or {}
+    return {
+        "requests_per_minute": float(preset.get("rpm") or 0),
+        "tokens_per_minute": float(preset.get("tpm") or 0),
+    }
+
+class TokenBucket:
+    """
+    Bucket refilled with `per_minute` units every minute, holding at most `burst` of them.
+    reserve() always takes the units (level can go below zero) and returns how long
+    the caller has to wait before using them, so waiting callers are served in order.
+    """
+
+    def __init__(self, per_minute, burst=None):
+        self.configure(per_minute, burst)
+        self.level = self.capacity
+        self.updated = None
+
+    def configure(self, per_minute, burst=None):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        # Default burst is 10 seconds worth, full minute bursts are what trips provider limits
+        self.capacity = burst or max(1.0, per_minute / 6)
+
+    def _refill(self, now):
+        if self.updated is not None:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount, now):
+        self._refill(now)
+        # Request bigger than the whole bucket waits for a full one instead of forever
+        self.level -= min(amount, self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def debit(self, amount, now):
+        """Take (or give back when negative) units without waiting, e.g. usage correction."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+class RateLimiter:
+    """Requests/min and tokens/min limit of one endpoint+model, plus server requested pauses."""
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests = None
+        self._tokens = None
+        self._paused_until = 0.0
+        self.configure(requests_per_minute, tokens_per_minute)
+
+    def configure(self, requests_per_minute=0, tokens_per_minute=0):
+        with self._lock:
+            self._requests = self._update_bucket(self._requests, requests_per_minute)
+            self._tokens = self._update_bucket(self._tokens, tokens_per_minute)
+
+    @staticmethod
+    def _update_bucket(bucket, per_minute):
+        if per_minute <= 0:
+            return None
+        if bucket is None:
+            return TokenBucket(per_minute)
+        if bucket.per_minute != per_minute:
+            bucket.configure(per_minute)
+        return bucket
+
+    def reserve(self, tokens=0):
+        """Take one request and tokens from the buckets, returns seconds to wait before sending it."""
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._paused_until - now)
+            if self._requests is not None:
+                delay = max(delay, self._requests.reserve(1, now))
+            if self._tokens is not None and tokens:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+            return delay
+
+    async def acquire(self, tokens=0):
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def refund(self, tokens=0):
+        """Give back what reserve(tokens) took, for attempts that failed."""
+        with self._lock:
+            now = self._clock()
+            if self._requests is not None:
+                self._requests.debit(-1, now)
+            if self._tokens is not None and tokens:
+                self._tokens.debit(-min(tokens, self._tokens.capacity), now)
+
+    def record_usage(self, estimated, actual):
+        """Correct token budget once response reported real usage."""
+        if actual is None or self._tokens is None:
+            return
+        with self._lock:
+            self._tokens.debit(actual - estimated, self._clock())
+
+    def pause(self, seconds):
+        """Hold back every request of this limiter (server said we're over its limit)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+class RateLimiterRegistry:
+    """
+    Limiters shared by key. Engines use (base_url, api_key, model), so translation and
+    OCR presets pointing at the same model share one budget, like the provider counts them.
+    """
+
+    def __init__(self):
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, requests_per_minute=0, tokens_per_minute=0):
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = RateLimiter(requests_per_minute, tokens_per_minute)
+                return limiter
+        # Latest preset settings win
+        limiter.configure(requests_per_minute, tokens_per_minute)
+        return limiter
+
+    def __len__(self):
+        with self._lock:
+            return len(self._limiters)
+
+# Global instance of limiter registry
+rate_limiters = RateLimiterRegistry()
+
+def parse_retry_after(headers, now=None):
+    """Seconds from retry-after-ms / retry-after (seconds or HTTP date) header, None if there's none."""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, date.timestamp() - now)
+
+class RetryPolicy:
+    RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+    def __init__(self, max_retries=4, base_delay=1.0, max_delay=60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_preset(cls, preset):
+        preset = preset or {}
+        max_retries = preset.get("max_retries")
+        return cls(max_retries=4 if max_retries is None else int(max_retries))
+
+    def is_retryable(self, error):
+        status = getattr(error, "status_code", None)
+        if status is not None:
+            return status in self.RETRY_STATUSES
+        try:
+            from openai import APIConnectionError  # timeouts are connection errors too
+        except ImportError:
+            return False
+        return isinstance(error, APIConnectionError)
+
+    def delay(self, error, attempt):
+        """Seconds to wait before retry number attempt (0 based), None when error shouldn't be retried."""
+        if attempt >= self.max_retries or not self.is_retryable(error):
+            return None
+        response = getattr(error, "response", None)
+        retry_after = parse_retry_after(getattr(response, "headers", None))
+        if retry_after is not None:
+            # A bit of jitter so clients told the same time don't all come back at once
+            return min(self.max_delay, retry_after) * random.uniform(1.0, 1.1)
+        # Full jitter exponential backoff
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+async def call_with_retry(request, limiter=None, tokens=0, policy=None, name="request"):
+    """
+    Await request() once limiter lets it through, retrying failed attempts per policy.
+
+    Args:
+        request: Function returning new awaitable for every attempt.
+        limiter (RateLimiter): Optional, 429 pauses everything going through it.
+        tokens (int): Estimated tokens of the request.
+    """
+    policy = policy or RetryPolicy()
+    attempt = 0
+    while True:
+        if limiter is not None:
+            await limiter.acquire(tokens)
+        try:
+            return await request()
+        except Exception as e:
+            if limiter is not None:
+                # Next attempt reserves again, don't count this one twice
+                limiter.refund(tokens)
+            delay = policy.delay(e, attempt)
+            if delay is None:
+                raise
+            attempt += 1
+            print(f"{name} failed ({e.__class__.__name__}: {e}), retry {attempt}/{policy.max_retries} in {delay:.1f}s")
+            if limiter is not None and getattr(e, "status_code", None) == 429:
+                # Other requests to this endpoint would get 429 too, hold them back as well
+                limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
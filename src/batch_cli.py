@@ -0,0 +1,333 @@
+"""
+Headless OCR + translation of a folder of images (manga pages, screenshots, ...).
+
+Usage:
+    python src/batch_cli.py INPUT_DIR -o results.jsonl [--resume]
+
+OCR runs in a small process pool (--ocr-workers, 2 by default, one engine per
+process), translations of finished pages run on a thread pool. Every finished image
+is appended to the JSONL output right away, so --resume can continue an interrupted
+or stopped run (failed images are removed from the file and run again). Engines
+default to the ones selected in config.json.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff"}
+# Every OCR process loads its own model (PaddleOCR even starts another process), so keep it low
+DEFAULT_OCR_WORKERS = min(2, os.cpu_count() or 1)
+
+def iter_images(directory, recursive=False):
+    """Yields image paths under directory (sorted, so runs are reproducible)."""
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        if entry.is_dir():
+            if recursive:
+                yield from iter_images(entry.path, recursive)
+        elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+            yield entry.path
+
+def _finished_records(output_path):
+    """Yields (line, record) of records without errors in output file."""
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of interrupted run can be cut off
+                continue
+            if not record.get("errors"):
+                yield line.rstrip("\n"), record
+
+def load_finished(output_path):
+    """Paths already in output file (without errors), for resuming."""
+    return {record["path"] for _, record in _finished_records(output_path)}
+
+def drop_unfinished(output_path):
+    """
+    Rewrite output file without failed and cut off records, before resumed run
+    retries them, so every path has exactly one record. Returns finished paths.
+    """
+    from Util.atomic_file import write_text_atomic
+    if not os.path.exists(output_path):
+        return set()
+    finished = set()
+    lines = []
+    for line, record in _finished_records(output_path):
+        finished.add(record["path"])
+        lines.append(line + "\n")
+    write_text_atomic(output_path, "".join(lines))
+    return finished
+
+class OcrEngineError(RuntimeError):
+    """OCR engine of worker process couldn't be loaded, no image can be done."""
+
+class RunStopped(RuntimeError):
+    """OCR stopped before all images were done, what finished is in the output file."""
+
+    def __init__(self, reason, processed, failed):
+        super().__init__(reason)
+        self.reason = reason
+        self.processed = processed
+        self.failed = failed
+
+# OCR process pool worker, each process loads its own engine once
+_worker_ocr = None
+_worker_error = None
+
+def _init_ocr_worker(engine_name, threads_per_worker):
+    global _worker_ocr, _worker_error
+    # Don't let every process spin up threads for all cores (torch/paddle/opencv)
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ.setdefault(variable, str(threads_per_worker))
+    from OCR.ocr_manager import OcrManager
+    try:
+        _worker_ocr = OcrManager(engine_name)
+    except Exception as e:
+        # Raising here would break the whole pool, report it with the first image instead
+        _worker_error = f"OCR engine '{engine_name}' failed to load: {e}"
+
+def _ocr_file(path):
+    """Returns (path, text, error, seconds)."""
+    import cv2
+    if _worker_error is not None:
+        raise OcrEngineError(_worker_error)
+    start = time.perf_counter()
+    try:
+        image = cv2.imread(path)
+        if image is None:
+            raise ValueError("couldn't read image")
+        text = _worker_ocr.predict(image) or ""
+        return path, text, None, time.perf_counter() - start
+    except Exception as e:
+        return path, "", f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+class Translator:
+    """Translation engines shared by translation threads, with the same cache as the app."""
+
+    def __init__(self, engine_names):
+        from App.settings_service import settings_service
+        from Translation.translation_cache import TranslationCache
+        from Translation.translation_manager import TranslationManager
+
+        self.engines = {}
+        for name in engine_names:
+            engine = TranslationManager.create_engine(name)
+            if engine.isWorking:
+                self.engines[name] = engine
+            else:
+                print(f"Translation engine '{name}' could not be initialized, skipping it")
+        self._cache = TranslationCache.from_settings(settings_service.get("translation_cache"))
+        self._make_key = TranslationCache.make_key
+
+    def _cache_key(self, name, engine, text):
+        if self._cache is None:
+            return None
+        try:
+            return self._make_key(name, engine.cache_params(), text)
+        except Exception as e:
+            print(f"Couldn't build translation cache key for '{name}': {e}")
+            return None
+
+    def translate(self, name, text):
+        engine = self.engines[name]
+        key = self._cache_key(name, engine, text)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        result = engine.translate(text)
+        if key is not None:
+            self._cache.put(key, result)
+        return result
+
+    def save(self):
+        if self._cache is not None:
+            self._cache.save()
+
+class ResultWriter:
+    """Appends one JSON line per finished image, flushed right away."""
+
+    def __init__(self, path, append):
+        self._lock = threading.Lock()
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            # Interrupted run may have left half written line without newline
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+            self._file = open(path, "a", encoding="utf-8")
+            if needs_newline:
+                self._file.write("\n")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class PageJob:
+    """OCR result of one image waiting for its translations."""
+
+    def __init__(self, path, text, error, seconds, engines):
+        self.record = {"path": path, "text": text, "ocr_seconds": round(seconds, 3), "translations": {}, "errors": {}}
+        if error:
+            self.record["errors"]["ocr"] = error
+        self.remaining = len(engines)
+        self.lock = threading.Lock()
+
+    def finish_translation(self, name, result, error):
+        """Returns True when this was the last translation."""
+        with self.lock:
+            if error:
+                self.record["errors"][name] = error
+            else:
+                self.record["translations"][name] = result
+            self.remaining -= 1
+            return self.remaining == 0
+
+def run(input_dir, output_path, ocr_engine, translation_engines, ocr_workers, translation_workers,
+        resume=False, recursive=False):
+    """
+    Returns (processed, failed) image counts.
+
+    Raises:
+        RunStopped: OCR engine couldn't be loaded or a worker process crashed,
+            images that weren't done can be done with resume=True.
+    """
+    finished = drop_unfinished(output_path) if resume else set()
+    translator = Translator(translation_engines) if translation_engines else None
+    engines = list(translator.engines) if translator else []
+    writer = ResultWriter(output_path, append=resume)
+    threads_per_worker = max(1, (os.cpu_count() or 1) // ocr_workers)
+
+    processed = failed = 0
+    counter_lock = threading.Lock()
+    stopped = None  # why OCR stopped early
+
+    def write(record):
+        nonlocal processed, failed
+        record["path"] = os.path.relpath(record["path"], input_dir)
+        writer.write(record)
+        with counter_lock:
+            processed += 1
+            failed += bool(record["errors"])
+            print(f"[{processed}] {record['path']}" + (f" (errors: {', '.join(record['errors'])})" if record["errors"] else ""))
+
+    def translate(job, name):
+        try:
+            result, error = translator.translate(name, job.record["text"]), None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+        if job.finish_translation(name, result, error):
+            write(job.record)
+
+    # spawn: same behaviour on every platform, and no forking of a process with Qt/torch threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=ocr_workers, mp_context=context, initializer=_init_ocr_worker,
+                             initargs=(ocr_engine, threads_per_worker)) as ocr_pool, \
+            ThreadPoolExecutor(max_workers=translation_workers) as translation_pool:
+        pending = set()
+        # Stream paths, keep only a couple of images per worker in flight
+        max_in_flight = ocr_workers * 2
+        paths = (path for path in iter_images(input_dir, recursive)
+                 if os.path.relpath(path, input_dir) not in finished)
+
+        def collect(done):
+            nonlocal stopped
+            for future in done:
+                try:
+                    path, text, error, seconds = future.result()
+                except (OcrEngineError, BrokenProcessPool) as e:
+                    # Image isn't written, so resumed run does it
+                    stopped = stopped or str(e) or type(e).__name__
+                    continue
+                job_engines = engines if (text.strip() and not error) else []
+                job = PageJob(path, text, error, seconds, job_engines)
+                if not job_engines:
+                    write(job.record)
+                for name in job_engines:
+                    translation_pool.submit(translate, job, name)
+
+        for path in paths:
+            if stopped:
+                break
+            try:
+                pending.add(ocr_pool.submit(_ocr_file, path))
+            except BrokenProcessPool as e:
+                stopped = str(e)
+                break
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    writer.close()
+    if translator:
+        translator.save()
+    if stopped:
+        raise RunStopped(stopped, processed, failed)
+    return processed, failed
+
+def main(argv=None):
+    from App.settings_service import settings_service
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_dir", help="folder with images")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file with results")
+    parser.add_argument("--ocr-engine", default=settings_service.get("ocr_engine"))
+    parser.add_argument("--translate", dest="translation_engines", action="append",
+                        help="translation engine, can be repeated (default: engines from settings)")
+    parser.add_argument("--no-translate", action="store_true", help="only OCR")
+    parser.add_argument("--ocr-workers", type=int, default=DEFAULT_OCR_WORKERS,
+                        help=f"OCR processes, every one loads its own model (default: {DEFAULT_OCR_WORKERS})")
+    parser.add_argument("--translation-workers", type=int, default=4, help="concurrent translation requests")
+    parser.add_argument("--resume", action="store_true", help="skip images already in output file")
+    parser.add_argument("-r", "--recursive", action="store_true", help="include subfolders")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"{args.input_dir} is not a directory")
+
+    from OCR.ocr_manager import OcrManager
+    from Translation.translation_manager import TranslationManager
+    if args.ocr_engine not in OcrManager._available_engines:
+        parser.error(f"unknown OCR engine '{args.ocr_engine}', available: {', '.join(OcrManager._available_engines)}")
+
+    translation_engines = []
+    if not args.no_translate:
+        translation_engines = args.translation_engines or settings_service.get("translation_engine") or []
+        if isinstance(translation_engines, str):
+            translation_engines = [translation_engines]
+        unknown = [name for name in translation_engines if name not in TranslationManager._available_engines]
+        if unknown:
+            parser.error(f"unknown translation engine '{unknown[0]}', available: {', '.join(TranslationManager._available_engines)}")
+
+    start = time.perf_counter()
+    try:
+        processed, failed = run(args.input_dir, args.output, args.ocr_engine, translation_engines,
+                                ocr_workers=max(1, args.ocr_workers), translation_workers=max(1, args.translation_workers),
+                                resume=args.resume, recursive=args.recursive)
+    except RunStopped as e:
+        print(f"Stopped after {e.processed} images ({e.failed} with errors): {e.reason}\n"
+              f"Run again with --resume to do the rest -> {args.output}")
+        return 2
+    print(f"Done: {processed} images ({failed} with errors) in {time.perf_counter() - start:.1f}s -> {args.output}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
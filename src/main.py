@@ -4,18 +4,26 @@ from PyQt6.QtWidgets import QApplication, QWidget
 
 from App.main_window import MainWindow
 from App.settings_service import settings_service
+from App.task_scheduler import task_scheduler
+from Util.async_runtime import async_runtime
 
 def main():
-    # Load OCR engine from settings
+    app = QApplication([])
+
+    # Engines from settings, they load in background (see EngineWarmup) so window shows up right away
     ocr_engine = settings_service.get("ocr_engine")
-    ocrProcessor = OcrManager(ocr_engine)
+    ocrProcessor = OcrManager(ocr_engine, load=False)
 
     translation_manager = settings_service.get("translation_engine")
-    translationManager = TranslationManager(translation_manager, signals=TranslationSignals())
+    translationManager = TranslationManager(translation_manager, signals=TranslationSignals(), load=False)
 
-    app = QApplication([])
     window = MainWindow(ocrProcessor, translationManager)
     window.show()
+    # Drop queued work on exit instead of finishing it
+    app.aboutToQuit.connect(translationManager.cancel_all)
+    app.aboutToQuit.connect(translationManager.save_cache)
+    app.aboutToQuit.connect(task_scheduler.shutdown)
+    app.aboutToQuit.connect(async_runtime.shutdown)
     app.exec()
 if __name__ == "__main__":
     main()
\ No newline at end of file
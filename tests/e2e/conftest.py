@@ -78,7 +78,10 @@ def mock_settings(mocker, test_settings_path):
     TranslationManager.registerPresetEngines()
     OcrManager.registerPresetEngines()
 
-    return settings
+    yield settings
+
+    # Don't let pending write-behind land in the next test's config
+    settings.flush()
 
 @pytest.fixture
 def main_window(qtbot, mock_settings):
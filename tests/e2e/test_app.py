@@ -61,4 +61,16 @@ def test_app_cancel_selection_cancels_screenshot_selection(main_window, qtbot, m
     main_window.hotkey_manager.hotkey_triggered.emit('ocr_capture')
 
     spy_cancel.assert_called_once()
-    assert main_window.screenshot_controller.screenshotOverlay.isVisible() == False
\ No newline at end of file
+    assert main_window.screenshot_controller.screenshotOverlay.isVisible() == False
+
+def test_app_multi_region_hotkey_ocrs_every_region(main_window, qtbot):
+    overlay = main_window.screenshot_controller.screenshotOverlay
+    clicks = [(100, 100), (150, 150), (200, 200), (260, 240)]
+    for i, (x, y) in enumerate(clicks):
+        QTimer.singleShot(100 + i * 50, lambda x=x, y=y: qtbot.mouseClick(overlay, Qt.MouseButton.LeftButton, pos=QPoint(x, y)))
+    QTimer.singleShot(400, lambda: qtbot.mouseClick(overlay, Qt.MouseButton.RightButton, pos=QPoint(300, 300)))
+
+    main_window.hotkey_manager.hotkey_triggered.emit('multi_region_ocr')
+
+    qtbot.waitUntil(lambda: main_window.ocrWindow.ocrTextbox.toPlainText() != "", timeout=2000)
+    assert main_window.ocrWindow.ocrTextbox.toPlainText() == "[1] Dummy OCR'd Text\n\n[2] Dummy OCR'd Text"
@@ -0,0 +1,46 @@
+import sys
+import types
+
+import numpy as np
+from PIL import Image, ImageGrab
+
+from App.capture_backends import PilCaptureBackend, QtCaptureBackend, MssCaptureBackend, create_backend
+
+class TestPilCaptureBackend:
+    def test_grab_returns_bgr(self, monkeypatch):
+        monkeypatch.setattr(ImageGrab, "grab", lambda bbox=None, all_screens=False: Image.new("RGB", (4, 3), (10, 20, 30)))
+
+        image = PilCaptureBackend().grab((0, 0, 4, 3))
+
+        assert image.shape == (3, 4, 3)
+        assert image[0, 0].tolist() == [30, 20, 10]
+
+class TestQtCaptureBackend:
+    def test_grab_returns_frame_of_selected_size(self, qtbot):
+        image = QtCaptureBackend().grab((10, 20, 110, 70))
+
+        assert image.shape == (50, 100, 3)
+        assert image.dtype == np.uint8
+
+class TestMssCaptureBackend:
+    def test_grab_drops_alpha_from_bgra(self, monkeypatch):
+        class FakeMss:
+            def grab(self, monitor):
+                raw = bytearray([1, 2, 3, 255] * monitor["width"] * monitor["height"])
+                return types.SimpleNamespace(raw=raw, width=monitor["width"], height=monitor["height"])
+            def close(self):
+                pass
+        monkeypatch.setitem(sys.modules, "mss", types.SimpleNamespace(mss=FakeMss))
+
+        image = MssCaptureBackend().grab((0, 0, 5, 2))
+
+        assert image.shape == (2, 5, 3)
+        assert image[1, 4].tolist() == [1, 2, 3]
+
+class TestCreateBackend:
+    def test_unknown_backend_falls_back_to_pil(self):
+        assert create_backend("nope").name == "pil"
+
+    def test_missing_dependency_falls_back_to_pil(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "mss", None)
+        assert create_backend("mss").name == "pil"
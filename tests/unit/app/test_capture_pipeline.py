@@ -0,0 +1,134 @@
+import threading
+import pytest
+import numpy as np
+
+from App.capture_pipeline import CapturePipeline
+
+@pytest.fixture
+def sample_image():
+    return np.zeros((10, 10, 3), dtype=np.uint8)
+
+@pytest.fixture
+def ocr_manager(mocker):
+    manager = mocker.MagicMock()
+    manager.predict.return_value = "OCR'd text"
+    manager.getCurrentEngine.return_value = "Dummy"
+    manager.status.return_value.state = "ready"
+    return manager
+
+@pytest.fixture
+def pipeline(qtbot, mocker, ocr_manager):
+    screenshot_controller = mocker.MagicMock()
+    ocr_window = mocker.MagicMock()
+    return CapturePipeline(screenshot_controller, ocr_manager, ocr_window)
+
+class TestCapturePipelineSubmit:
+    def test_submit_runs_ocr_and_sets_result(self, qtbot, pipeline, sample_image):
+        with qtbot.waitSignal(pipeline.ocrFinished, timeout=2000) as blocker:
+            pipeline.submit(sample_image, translate=False)
+
+        assert blocker.args[1:] == ["OCR'd text", "Dummy"]
+        pipeline.ocrWindow.setOcrPending.assert_called_once_with("Dummy")
+        pipeline.ocrWindow.setOcr.assert_called_once_with("OCR'd text", "Dummy")
+        pipeline.ocrWindow.startRetranslate.assert_not_called()
+        assert pipeline.isBusy is False
+
+    def test_submit_with_translate_starts_translation(self, qtbot, pipeline, sample_image):
+        with qtbot.waitSignal(pipeline.ocrFinished, timeout=2000):
+            pipeline.submit(sample_image, translate=True)
+
+        pipeline.ocrWindow.startRetranslate.assert_called_once()
+
+    def test_submit_without_text_doesnt_translate(self, qtbot, pipeline, ocr_manager, sample_image):
+        ocr_manager.predict.return_value = ""
+
+        with qtbot.waitSignal(pipeline.ocrFinished, timeout=2000):
+            pipeline.submit(sample_image, translate=True)
+
+        pipeline.ocrWindow.startRetranslate.assert_not_called()
+        # Translation of previous capture has nothing to attach to it anymore
+        pipeline.ocrWindow.cancelSuperseded.assert_called_once()
+
+    def test_submit_reports_engine_errors(self, qtbot, pipeline, ocr_manager, sample_image):
+        ocr_manager.predict.side_effect = RuntimeError("boom")
+
+        with qtbot.waitSignal(pipeline.ocrFailed, timeout=2000) as blocker:
+            pipeline.submit(sample_image)
+
+        assert blocker.args[1] == "boom"
+        pipeline.ocrWindow.setOcr.assert_not_called()
+
+    def test_submit_without_focus_doesnt_activate_window(self, qtbot, pipeline, sample_image):
+        with qtbot.waitSignal(pipeline.ocrFinished, timeout=2000):
+            pipeline.submit(sample_image, translate=False, focus=False)
+
+        pipeline.ocrWindow.show.assert_called_once()
+        pipeline.ocrWindow.activateWindow.assert_not_called()
+
+    def test_submit_while_engine_loads_shows_waiting(self, qtbot, pipeline, ocr_manager, sample_image):
+        ocr_manager.status.return_value.state = "loading"
+
+        with qtbot.waitSignal(pipeline.ocrFinished, timeout=2000):
+            pipeline.submit(sample_image, translate=False)
+
+        pipeline.ocrWindow.setOcrWaiting.assert_called_once_with("Dummy")
+        pipeline.ocrWindow.setOcr.assert_called_once_with("OCR'd text", "Dummy")
+
+    def test_submit_batch_ocrs_all_regions_as_segments(self, qtbot, pipeline, ocr_manager, sample_image):
+        ocr_manager.predict_batch.return_value = ["first", "second"]
+
+        with qtbot.waitSignal(pipeline.ocrFinished, timeout=2000) as blocker:
+            pipeline.submit_batch([sample_image, sample_image], translate=True)
+
+        assert blocker.args[1] == "[1] first\n\n[2] second"
+        ocr_manager.predict_batch.assert_called_once()
+        pipeline.ocrWindow.setOcrSegments.assert_called_once_with(["first", "second"], "Dummy")
+        pipeline.ocrWindow.startRetranslate.assert_called_once()
+
+    def test_capture_multi_without_regions_does_nothing(self, pipeline):
+        pipeline.screenshot_controller.start_selection.return_value = []
+
+        assert pipeline.capture(multi=True) is None
+        pipeline.screenshot_controller.start_selection.assert_called_once_with(multi=True)
+
+class TestCapturePipelineCancel:
+    def test_new_submit_drops_result_of_previous_job(self, qtbot, pipeline, ocr_manager, sample_image):
+        release = threading.Event()
+        results = iter(["old", "new"])
+
+        def slow_predict(image):
+            release.wait(2)
+            return next(results)
+        ocr_manager.predict.side_effect = slow_predict
+
+        first = pipeline.submit(sample_image, translate=False)
+        second = pipeline.submit(sample_image, translate=False)
+        release.set()
+
+        with qtbot.waitSignal(pipeline.ocrFinished, timeout=2000) as blocker:
+            pass
+
+        assert first != second
+        assert blocker.args[0] == second
+        pipeline.ocrWindow.setOcr.assert_called_once()
+
+    def test_cancel_emits_cancelled_and_drops_result(self, qtbot, pipeline, ocr_manager, sample_image):
+        release = threading.Event()
+        ocr_manager.predict.side_effect = lambda image: release.wait(2) and "text"
+
+        job_id = pipeline.submit(sample_image)
+        with qtbot.waitSignal(pipeline.ocrCancelled, timeout=1000) as blocker:
+            pipeline.cancel()
+        release.set()
+        pipeline.threadpool.waitForDone(2000)
+        qtbot.wait(50)
+
+        assert blocker.args == [job_id]
+        pipeline.ocrWindow.setOcrCancelled.assert_called_once()
+        pipeline.ocrWindow.setOcr.assert_not_called()
+
+    def test_capture_without_selection_does_nothing(self, pipeline):
+        pipeline.screenshot_controller.start_selection.return_value = None
+
+        assert pipeline.capture() is None
+        pipeline.OcrManager.predict.assert_not_called()
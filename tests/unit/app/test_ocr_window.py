@@ -0,0 +1,152 @@
+import threading
+
+import pytest
+
+from App.ocr_window import OcrWindow
+from App.task_scheduler import Priority
+from Translation.engines.abstract_engine import AbstractTranslationEngine
+from Translation.translation_manager import TranslationManager, TranslationSignals
+
+@pytest.fixture
+def ocr_window(qtbot, mocker):
+    translation_manager = mocker.MagicMock()
+    translation_manager.signals = TranslationSignals()
+    translation_manager.engine_names.return_value = ["Engine"]
+    translation_manager.new_request_id.return_value = 1
+    window = OcrWindow(translation_manager)
+    qtbot.addWidget(window)
+    window.startRetranslate()
+    return window
+
+class TestOcrWindowStreaming:
+    def test_chunks_are_buffered_until_flush(self, ocr_window, qtbot):
+        signals = ocr_window.TranslationManager.signals
+        signals.translationChunk.emit(1, "Engine", "Hello")
+        signals.translationChunk.emit(1, "Engine", ", world")
+
+        assert ocr_window.translationWidgets["Engine"].toPlainText() == ""
+        qtbot.waitUntil(lambda: ocr_window.translationWidgets["Engine"].toPlainText() == "Hello, world", timeout=1000)
+
+    def test_complete_flushes_pending_chunks_immediately(self, ocr_window):
+        signals = ocr_window.TranslationManager.signals
+        signals.translationChunk.emit(1, "Engine", "Hello")
+        signals.translationComplete.emit(1, "Engine")
+
+        assert ocr_window.translationWidgets["Engine"].toPlainText() == "Hello"
+        assert ocr_window.pendingChunks == {}
+
+    def test_chunks_append_to_existing_text(self, ocr_window):
+        ocr_window.setTranslation("line 1\n", engine="Engine")
+        ocr_window.setTranslation("line 2", engine="Engine")
+
+        assert ocr_window.translationWidgets["Engine"].toPlainText() == "line 1\nline 2"
+
+    def test_error_keeps_already_streamed_text(self, ocr_window):
+        signals = ocr_window.TranslationManager.signals
+        signals.translationChunk.emit(1, "Engine", "partial ")
+        signals.translationError.emit(1, "Engine", "boom")
+
+        assert ocr_window.translationWidgets["Engine"].toPlainText() == "partial Error: boom"
+
+class TestOcrWindowRequests:
+    def test_chunks_of_superseded_request_are_dropped(self, ocr_window, qtbot):
+        manager = ocr_window.TranslationManager
+        signals = manager.signals
+        manager.new_request_id.return_value = 2
+        ocr_window.startRetranslate()
+
+        signals.translationChunk.emit(1, "Engine", "old")
+        signals.translationChunk.emit(2, "Engine", "new")
+        signals.translationComplete.emit(2, "Engine")
+
+        assert ocr_window.translationWidgets["Engine"].toPlainText() == "new"
+        qtbot.waitUntil(lambda: manager.cancel.called, timeout=1000)
+        manager.cancel.assert_called_once_with(1)
+        # New request goes out first, so identical one can attach to the running translation
+        calls = [(name, kwargs.get("request_id")) for name, args, kwargs in manager.mock_calls]
+        assert calls.index(("translate", 2)) < calls.index(("cancel", None))
+
+    def test_retranslate_button_skips_cache(self, ocr_window, qtbot):
+        manager = ocr_window.TranslationManager
+        assert ocr_window.threadpool.waitForDone(1000)
+        manager.translate.reset_mock()
+
+        ocr_window.retranslateBtn.pressed.emit()
+
+        qtbot.waitUntil(lambda: manager.translate.called, timeout=1000)
+        assert manager.translate.call_args.kwargs["use_cache"] is False
+
+    def test_new_capture_cancels_previous_translation_once_it_ends(self, ocr_window):
+        ocr_window.setOcrPending("Dummy")
+
+        ocr_window.TranslationManager.cancel.assert_not_called()
+        assert ocr_window.translationRequests == {}
+
+        ocr_window.setOcrCancelled()
+        ocr_window.TranslationManager.cancel.assert_called_once_with(1)
+
+    def test_engine_retranslate_cancels_only_that_engine(self, ocr_window):
+        ocr_window.TranslationManager.new_request_id.return_value = 2
+
+        ocr_window.on_engine_retranslate_clicked("Engine")
+
+        ocr_window.TranslationManager.cancel.assert_called_once_with(1, engine_name="Engine")
+        assert ocr_window.translationRequests == {"Engine": 2}
+
+    def test_failover_loser_shows_who_answered(self, ocr_window):
+        signals = ocr_window.TranslationManager.signals
+
+        signals.translationFailover.emit(1, "Fallback", "Engine")
+
+        assert ocr_window.translationWidgets["Engine"].toPlainText() == "Skipped, Fallback answered first"
+        assert "Engine" not in ocr_window.translationRequests
+
+class SlowStreamEngine(AbstractTranslationEngine):
+    """Streams first chunk, then waits for `release` before finishing"""
+    release = None
+    calls = 0
+
+    def _setupEngine(self, **kwargs):
+        pass
+
+    def translate(self, text):
+        return "Hello"
+
+    @property
+    def supports_streaming(self):
+        return True
+
+    def translate_stream(self, text, chunk_callback, complete_callback=None, cancel_token=None):
+        type(self).calls += 1
+        chunk_callback("Hel")
+        self.release.wait(2)
+        if cancel_token is not None and cancel_token.cancelled:
+            return
+        chunk_callback("lo")
+        complete_callback()
+
+@pytest.fixture
+def slow_stream_window(qtbot, mocker):
+    mocker.patch('Translation.translation_manager.settings_service').get.return_value = {}
+    SlowStreamEngine.release = threading.Event()
+    SlowStreamEngine.calls = 0
+    mocker.patch.dict(TranslationManager._available_engines, {"SlowStream": SlowStreamEngine})
+    window = OcrWindow(TranslationManager(["SlowStream"], TranslationSignals()))
+    qtbot.addWidget(window)
+    window.ocrTextbox.setPlainText("text")
+    yield window
+    SlowStreamEngine.release.set()
+
+class TestOcrWindowSingleFlight:
+    def test_retranslate_twice_calls_engine_once(self, slow_stream_window, qtbot):
+        window = slow_stream_window
+        signals = window.TranslationManager.signals
+        with qtbot.waitSignal(signals.translationChunk, timeout=2000):
+            window.startRetranslate(Priority.RETRANSLATE, use_cache=False)
+
+        window.startRetranslate(Priority.RETRANSLATE, use_cache=False)
+        with qtbot.waitSignal(signals.translationComplete, timeout=2000):
+            SlowStreamEngine.release.set()
+
+        assert SlowStreamEngine.calls == 1
+        qtbot.waitUntil(lambda: window.translationWidgets["SlowStream"].toPlainText() == "Hello", timeout=1000)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from PyQt6.QtCore import QRect
+
+from App.capture_backends import CaptureBackend
+from App.screenshot import ScreenshotOverlay
+
+class FakeBackend(CaptureBackend):
+    name = "fake"
+
+    def __init__(self):
+        self.grabs = []
+
+    def grab(self, bbox):
+        self.grabs.append(bbox)
+        left, top, right, bottom = bbox
+        # Every pixel encodes its own coordinates, so crops can be checked
+        ys, xs = np.mgrid[top:bottom, left:right]
+        return np.dstack([xs % 256, ys % 256, np.zeros_like(xs)]).astype(np.uint8)
+
+@pytest.fixture
+def overlay(qtbot, monkeypatch):
+    overlay = ScreenshotOverlay()
+    qtbot.addWidget(overlay)
+    overlay.setGeometry(QRect(0, 0, 300, 200))
+    backend = FakeBackend()
+    monkeypatch.setattr(overlay, "captureBackend", lambda: backend)
+    overlay.backend = backend
+    return overlay
+
+class TestFrozenCapture:
+    def test_regions_are_cropped_from_frame_grabbed_on_open(self, overlay, monkeypatch):
+        monkeypatch.setattr(overlay._frozenSetting, "get", lambda: True)
+
+        overlay.freezeScreen()
+        crops = overlay.grabRegions([QRect(10, 20, 30, 40), QRect(100, 50, 5, 5)])
+
+        assert overlay.backend.grabs == [(0, 0, 300, 200)]
+        assert crops[0].shape == (40, 30, 3)
+        assert crops[0][0, 0].tolist() == [10, 20, 0]
+        assert crops[1][4, 4].tolist() == [104, 54, 0]
+        assert overlay.frozenImage.width() == 300
+
+    def test_disabled_setting_grabs_after_selection(self, overlay, monkeypatch):
+        monkeypatch.setattr(overlay._frozenSetting, "get", lambda: False)
+
+        overlay.freezeScreen()
+        crops = overlay.grabRegions([QRect(10, 20, 30, 40)])
+
+        assert overlay.frozenFrame is None
+        assert overlay.backend.grabs == [(10, 20, 40, 60)]
+        assert crops[0].shape == (40, 30, 3)
+
+    def test_reset_state_drops_frozen_frame(self, overlay, monkeypatch):
+        monkeypatch.setattr(overlay._frozenSetting, "get", lambda: True)
+        overlay.freezeScreen()
+
+        overlay.reset_state()
+
+        assert overlay.frozenFrame is None
+        assert overlay.frozenImage is None
@@ -1,5 +1,6 @@
 import json
-from App.settings_service import SettingsService
+import pytest
+from App.settings_service import SettingsService, CachedSetting
 
 class TestSettingsServiceLoad:
     def test_load_creates_default_when_missing(self, tmp_path):
@@ -40,4 +41,132 @@ class TestSettingsServiceSave:
         assert cfg.exists()
         with open(cfg, 'r') as f:
             saved_data = json.load(f)
-        assert saved_data["translation_target_lang"] == "pl"
\ No newline at end of file
+        assert saved_data["translation_target_lang"] == "pl"
+
+class TestSettingsServiceWriteBehind:
+    def test_set_writes_to_disk_in_background(self, tmp_path):
+        cfg = tmp_path / "cfg.json"
+        s = SettingsService(config_path=str(cfg), write_delay=0.05)
+        s.set("translation_target_lang", "pl")
+
+        with open(cfg, 'r') as f:
+            assert json.load(f)["translation_target_lang"] == "en"
+        s._save_timer.join(1)
+        with open(cfg, 'r') as f:
+            assert json.load(f)["translation_target_lang"] == "pl"
+
+    def test_batch_writes_once(self, tmp_path, mocker):
+        cfg = tmp_path / "cfg.json"
+        s = SettingsService(config_path=str(cfg), write_delay=60)
+        spy = mocker.patch('App.settings_service.write_text_atomic')
+
+        with s.batch():
+            s.set("source_lang", "pl")
+            s.set("translation_target_lang", "de")
+        s.flush()
+
+        assert spy.call_count == 1
+
+    def test_save_skips_write_when_nothing_changed(self, tmp_path, mocker):
+        cfg = tmp_path / "cfg.json"
+        s = SettingsService(config_path=str(cfg))
+        spy = mocker.patch('App.settings_service.write_text_atomic')
+
+        s.save_settings()
+
+        assert spy.call_count == 0
+
+    def test_load_does_not_rewrite_complete_config(self, tmp_path, mocker):
+        cfg = tmp_path / "cfg.json"
+        SettingsService(config_path=str(cfg))
+        spy = mocker.patch('App.settings_service.write_text_atomic')
+
+        SettingsService(config_path=str(cfg))
+
+        assert spy.call_count == 0
+
+    def test_set_does_not_modify_defaults(self, tmp_path):
+        s = SettingsService(config_path=str(tmp_path / "cfg.json"))
+        s.set("hotkeys.ocr_capture", "<ctrl>+q")
+        assert s.default_settings["hotkeys"]["ocr_capture"] == "<alt>+q"
+
+class TestSettingsServiceSnapshot:
+    def test_snapshot_is_immutable_and_versioned(self, tmp_path):
+        s = SettingsService(config_path=str(tmp_path / "cfg.json"), write_delay=60)
+        before = s.snapshot()
+        assert before is s.snapshot()  # not rebuilt without changes
+
+        s.set("translation_target_lang", "pl")
+        after = s.snapshot()
+
+        assert before.translation_target_lang == "en"
+        assert after.translation_target_lang == "pl"
+        assert after.version == before.version + 1
+        assert after.get("hotkeys.ocr_capture") == "<alt>+q"
+        with pytest.raises(TypeError):
+            after.hotkeys["ocr_capture"] = "<ctrl>+q"
+
+    def test_subscriber_notified_only_for_watched_keys(self, tmp_path):
+        s = SettingsService(config_path=str(tmp_path / "cfg.json"), write_delay=60)
+        calls = []
+        s.subscribe(lambda snapshot, keys: calls.append(keys), keys=["hotkeys"])
+
+        s.set("source_lang", "pl")
+        s.set("hotkeys.ocr_capture", "<ctrl>+q")
+
+        assert calls == [["hotkeys.ocr_capture"]]
+
+    def test_setting_same_value_changes_nothing(self, tmp_path):
+        s = SettingsService(config_path=str(tmp_path / "cfg.json"), write_delay=60)
+        s.set("source_lang", "pl")
+        calls = []
+        s.subscribe(lambda snapshot, keys: calls.append(keys))
+        version = s.version
+
+        s.set("source_lang", "pl")
+        s.set("hotkeys", dict(s.get("hotkeys")))
+
+        assert calls == []
+        assert s.version == version
+
+        hotkeys = s.get("hotkeys")
+        hotkeys["ocr_capture"] = "<ctrl>+q"
+        s.set("hotkeys", hotkeys)
+        assert calls == [["hotkeys"]]
+
+    def test_batch_notifies_once(self, tmp_path):
+        s = SettingsService(config_path=str(tmp_path / "cfg.json"), write_delay=60)
+        calls = []
+        s.subscribe(lambda snapshot, keys: calls.append((snapshot.source_lang, keys)))
+
+        with s.batch():
+            s.set("source_lang", "pl")
+            s.set("translation_target_lang", "de")
+
+        assert calls == [("pl", ["source_lang", "translation_target_lang"])]
+
+    def test_cached_setting_recomputes_only_after_change(self, tmp_path):
+        s = SettingsService(config_path=str(tmp_path / "cfg.json"), write_delay=60)
+        computed = []
+        def compute(snapshot):
+            computed.append(snapshot.source_lang)
+            return snapshot.source_lang
+        cached = CachedSetting(compute, keys=["source_lang"], service=s)
+
+        assert cached.get() == "ja"
+        s.set("translation_target_lang", "pl")
+        assert cached.get() == "ja"
+        s.set("source_lang", "ko")
+        assert cached.get() == "ko"
+
+        assert computed == ["ja", "ko"]
+
+    def test_bound_method_subscription_is_weak(self, tmp_path):
+        s = SettingsService(config_path=str(tmp_path / "cfg.json"), write_delay=60)
+        cached = CachedSetting(lambda snapshot: None, keys=["source_lang"], service=s)
+        assert len(s._subscribers) == 1
+
+        del cached
+        s.set("source_lang", "pl")
+
+        assert s._subscribers == []
@@ -0,0 +1,116 @@
+import threading
+
+from App.task_scheduler import TaskScheduler, Priority
+
+class Task:
+    """Records run order, blocks until released when given an event"""
+    def __init__(self, name, log, gate=None):
+        self.name = name
+        self.log = log
+        self.gate = gate
+        self.started = threading.Event()
+
+    def run(self):
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(2)
+        self.log.append(self.name)
+
+class TestTaskScheduler:
+    def test_runs_waiting_tasks_by_priority(self):
+        scheduler = TaskScheduler(max_threads=4, limits={"ocr": 1})
+        log = []
+        gate = threading.Event()
+        blocker = Task("blocker", log, gate)
+        scheduler.start(blocker, key="ocr")
+        assert blocker.started.wait(2)
+
+        scheduler.start(Task("background", log), key="ocr", priority=Priority.BACKGROUND)
+        scheduler.start(Task("retranslate", log), key="ocr", priority=Priority.RETRANSLATE)
+        scheduler.start(Task("interactive", log), key="ocr", priority=Priority.INTERACTIVE)
+        gate.set()
+
+        assert scheduler.wait_for_done("ocr", 2000)
+        assert log == ["blocker", "interactive", "retranslate", "background"]
+
+    def test_limit_applies_to_each_engine_key(self):
+        scheduler = TaskScheduler(max_threads=4, limits={"translation": 1})
+        log = []
+        gate = threading.Event()
+        google = Task("google", log, gate)
+        openai = Task("openai", log, gate)
+        scheduler.start(google, key="translation/Google")
+        scheduler.start(openai, key="translation/OpenAI")
+        scheduler.start(Task("google 2", log), key="translation/Google")
+
+        # Different engines run side by side, second Google task waits for the first one
+        assert google.started.wait(2) and openai.started.wait(2)
+        assert scheduler.stats()["queued_by_key"] == {"translation/Google": 1}
+        gate.set()
+
+        assert scheduler.wait_for_done("translation", 2000)
+        assert log.index("google 2") > log.index("google")
+
+    def test_try_take_removes_waiting_task(self):
+        scheduler = TaskScheduler(max_threads=2, limits={"ocr": 1})
+        log = []
+        gate = threading.Event()
+        scheduler.start(Task("blocker", log, gate), key="ocr")
+        waiting = Task("waiting", log)
+        scheduler.start(waiting, key="ocr")
+
+        assert scheduler.tryTake(waiting) is True
+        assert scheduler.tryTake(waiting) is False
+        gate.set()
+
+        assert scheduler.wait_for_done(timeout_ms=2000)
+        assert log == ["blocker"]
+
+    def test_stats_count_tasks(self):
+        scheduler = TaskScheduler(max_threads=2)
+        log = []
+        for i in range(3):
+            scheduler.start(Task(i, log), key="settings")
+        assert scheduler.wait_for_done(timeout_ms=2000)
+
+        stats = scheduler.stats()
+        assert stats["submitted"] == 3
+        assert stats["completed"] == 3
+        assert stats["queued"] == 0
+        assert stats["running_by_key"] == {}
+
+    def test_shutdown_refuses_new_tasks(self):
+        scheduler = TaskScheduler(max_threads=1)
+        log = []
+
+        assert scheduler.shutdown(2000) is True
+        assert scheduler.start(Task("late", log)) is False
+        assert log == []
+
+    def test_shutdown_frees_only_slots_of_dispatched_tasks(self):
+        scheduler = TaskScheduler(max_threads=2, limits={"ocr": 1})
+        log = []
+        gate = threading.Event()
+        blocker = Task("blocker", log, gate)
+        scheduler.start(blocker, key="ocr")
+        assert blocker.started.wait(2)
+        scheduler.start(Task("waiting", log), key="ocr")
+
+        timer = threading.Timer(0.1, gate.set)
+        timer.start()
+        assert scheduler.shutdown(2000) is True
+        timer.join()
+
+        assert log == ["blocker"]
+        assert scheduler._dispatched["ocr"] == 0
+
+    def test_lane_uses_its_key_and_priority(self):
+        scheduler = TaskScheduler(max_threads=2, limits={"settings": 1})
+        lane = scheduler.lane("settings", Priority.BACKGROUND)
+        log = []
+        for i in range(3):
+            lane.start(Task(i, log))
+
+        assert lane.waitForDone(2000)
+        # Limit 1 keeps submission order
+        assert log == [0, 1, 2]
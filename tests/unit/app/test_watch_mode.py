@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from PyQt6.QtCore import QRect
+
+from App.watch_mode import FrameChangeDetector, WatchController
+
+def frame(text_width=0):
+    """White 'text box' with black 'text' of given width"""
+    image = np.full((60, 200, 3), 255, dtype=np.uint8)
+    image[20:40, 10:10 + text_width] = 0
+    return image
+
+class TestFrameChangeDetector:
+    def test_reports_frame_once_it_is_stable(self):
+        detector = FrameChangeDetector(stable_frames=2)
+
+        results = [detector.feed(frame(50)) for _ in range(4)]
+
+        assert results == [False, False, True, False]
+
+    def test_skips_frames_while_text_animates(self):
+        detector = FrameChangeDetector(stable_frames=1)
+
+        results = [detector.feed(frame(width)) for width in (20, 40, 60, 80, 80)]
+
+        assert results == [False, False, False, False, True]
+
+    def test_reports_again_only_when_content_changed(self):
+        detector = FrameChangeDetector(stable_frames=1)
+        for _ in range(2):
+            detector.feed(frame(50))
+
+        assert [detector.feed(frame(120)) for _ in range(2)] == [False, True]
+        # Back to the previous line counts as a change too
+        assert [detector.feed(frame(50)) for _ in range(2)] == [False, True]
+
+    def test_ignores_noise_below_change_ratio(self):
+        detector = FrameChangeDetector(stable_frames=0)
+        assert detector.feed(frame(50)) is True
+
+        noisy = frame(50)
+        noisy[0, 0] = 0
+        assert detector.feed(noisy) is False
+
+@pytest.fixture
+def controller(qtbot, mocker):
+    screenshot_controller = mocker.MagicMock()
+    screenshot_controller.is_selecting.return_value = False
+    screenshot_controller.grab_region.return_value = frame(50)
+    pipeline = mocker.MagicMock()
+    pipeline.isBusy = False
+    controller = WatchController(screenshot_controller, pipeline)
+    mocker.patch.object(controller, "region", return_value=QRect(0, 0, 200, 60))
+    controller.detector = FrameChangeDetector(stable_frames=1)
+    return controller
+
+class TestWatchController:
+    def test_submits_settled_frame_without_focus(self, controller):
+        controller.tick()
+        controller.tick()
+        controller.tick()
+
+        controller.capture_pipeline.submit.assert_called_once()
+        assert controller.capture_pipeline.submit.call_args.kwargs["focus"] is False
+
+    def test_skips_capture_while_pipeline_busy(self, controller):
+        controller.capture_pipeline.isBusy = True
+
+        controller.tick()
+
+        controller.screenshot_controller.grab_region.assert_not_called()
+
+    def test_start_without_region_selection_does_nothing(self, controller, mocker):
+        controller.region.return_value = None
+        controller.screenshot_controller.select_region.return_value = None
+
+        assert controller.start() is False
+        assert controller.isActive is False
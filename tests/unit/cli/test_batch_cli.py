@@ -0,0 +1,109 @@
+import json
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+import numpy as np
+import pytest
+
+import batch_cli
+
+@pytest.fixture
+def image_dir(tmp_path):
+    pages = tmp_path / "pages"
+    (pages / "chapter2").mkdir(parents=True)
+    for name in ("b.png", "a.jpg", "chapter2/c.png"):
+        cv2.imwrite(str(pages / name), np.zeros((10, 10, 3), dtype=np.uint8))
+    (pages / "notes.txt").write_text("not an image")
+    return pages
+
+class TestIterImages:
+    def test_lists_images_sorted(self, image_dir):
+        paths = batch_cli.iter_images(str(image_dir))
+        assert [os.path.basename(p) for p in paths] == ["a.jpg", "b.png"]
+
+    def test_recursive_includes_subfolders(self, image_dir):
+        assert len(list(batch_cli.iter_images(str(image_dir), recursive=True))) == 3
+
+class TestLoadFinished:
+    def test_skips_failed_and_cut_off_records(self, tmp_path):
+        output = tmp_path / "out.jsonl"
+        output.write_text(
+            json.dumps({"path": "a.png", "errors": {}}) + "\n"
+            + json.dumps({"path": "b.png", "errors": {"ocr": "boom"}}) + "\n"
+            + '{"path": "c.pn')
+
+        assert batch_cli.load_finished(str(output)) == {"a.png"}
+
+    def test_drop_unfinished_keeps_only_finished_records(self, tmp_path):
+        output = tmp_path / "out.jsonl"
+        output.write_text(
+            json.dumps({"path": "a.png", "errors": {}}) + "\n"
+            + json.dumps({"path": "b.png", "errors": {"ocr": "boom"}}) + "\n"
+            + '{"path": "c.pn')
+
+        assert batch_cli.drop_unfinished(str(output)) == {"a.png"}
+        assert [json.loads(line)["path"] for line in output.read_text().splitlines()] == ["a.png"]
+
+class CrashingPool:
+    """Process pool whose worker dies after the first image"""
+    def __init__(self, **kwargs):
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, fn, path):
+        self.submitted += 1
+        future = Future()
+        if self.submitted == 1:
+            future.set_result((path, "text", None, 0.1))
+        else:
+            future.set_exception(BrokenProcessPool("worker crashed"))
+        return future
+
+class TestOcrWorker:
+    def test_engine_load_error_is_reported_per_image(self, mocker):
+        mocker.patch("OCR.ocr_manager.OcrManager", side_effect=RuntimeError("no paddle"))
+        mocker.patch.object(batch_cli, "_worker_error", None)
+        mocker.patch.object(batch_cli, "_worker_ocr", None)
+
+        batch_cli._init_ocr_worker("PaddleOCR", 1)
+
+        with pytest.raises(batch_cli.OcrEngineError, match="no paddle"):
+            batch_cli._ocr_file("a.png")
+
+class TestRun:
+    def test_ocr_and_translate_folder_then_resume(self, image_dir, tmp_path):
+        output = str(tmp_path / "out.jsonl")
+
+        processed, failed = batch_cli.run(str(image_dir), output, "Dummy", ["Dummy"],
+                                          ocr_workers=1, translation_workers=2, recursive=True)
+
+        assert (processed, failed) == (3, 0)
+        with open(output, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert records[0]["text"] == "Dummy OCR'd Text"
+        assert records[0]["translations"] == {"Dummy": "This is dummy translation"}
+
+        processed, _ = batch_cli.run(str(image_dir), output, "Dummy", ["Dummy"],
+                                     ocr_workers=1, translation_workers=2, resume=True, recursive=True)
+        assert processed == 0
+
+    def test_crashed_ocr_worker_stops_run_cleanly(self, image_dir, tmp_path, mocker):
+        mocker.patch.object(batch_cli, "ProcessPoolExecutor", CrashingPool)
+        output = str(tmp_path / "out.jsonl")
+
+        with pytest.raises(batch_cli.RunStopped) as stopped:
+            batch_cli.run(str(image_dir), output, "Dummy", ["Dummy"],
+                          ocr_workers=1, translation_workers=2, recursive=True)
+
+        assert stopped.value.processed == 1
+        # Finished image with its translation is kept, the rest is left for --resume
+        with open(output, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [record["translations"] for record in records] == [{"Dummy": "This is dummy translation"}]
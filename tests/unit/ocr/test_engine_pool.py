@@ -0,0 +1,58 @@
+from OCR.engine_pool import EnginePool, unload
+
+def add(pool, name, memory=0):
+    return pool.add(name, f"{name} engine", None, memory)
+
+class TestEnginePool:
+    def test_evicts_least_recently_used_over_max_engines(self):
+        pool = EnginePool(max_engines=2)
+        add(pool, "a")
+        add(pool, "b")
+        pool.get("a")
+
+        evicted = add(pool, "c")
+
+        assert [entry.engine for entry in evicted] == ["b engine"]
+        assert pool.names() == ["a", "c"]
+
+    def test_evicts_over_memory_budget_but_keeps_newest(self):
+        pool = EnginePool(max_engines=5, max_memory=100)
+        add(pool, "a", 60)
+        add(pool, "b", 30)
+
+        evicted = add(pool, "c", 150)
+
+        assert len(evicted) == 2
+        assert pool.names() == ["c"]
+
+    def test_evict_idle_keeps_most_recent_engine(self):
+        pool = EnginePool(max_engines=3, idle_timeout=10)
+        add(pool, "a")
+        add(pool, "b")
+        now = pool.get("b").last_used
+
+        evicted = pool.evict_idle(now=now + 11)
+
+        assert [entry.engine for entry in evicted] == ["a engine"]
+        assert pool.names() == ["b"]
+
+    def test_unload_closes_engines(self, mocker):
+        pool = EnginePool(max_engines=1)
+        engine = mocker.MagicMock()
+        pool.add("a", engine, None)
+
+        unload(pool.clear())
+
+        engine.close.assert_called_once()
+
+    def test_engine_in_use_is_unloaded_after_last_release(self, mocker):
+        pool = EnginePool(max_engines=1)
+        engine = mocker.MagicMock()
+        pool.add("a", engine, None)
+        entry = pool.acquire("a")
+
+        evicted = pool.add("b", mocker.MagicMock(), None)
+
+        assert pool.retire(evicted) == []
+        engine.close.assert_not_called()
+        assert pool.release(entry) is True
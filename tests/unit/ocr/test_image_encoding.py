@@ -0,0 +1,50 @@
+import cv2
+import numpy as np
+import pytest
+
+from OCR.image_encoding import EncodingOptions, options_from_preset, downscale, encode_image
+
+@pytest.fixture
+def sample_image():
+    image = np.zeros((200, 400, 3), dtype=np.uint8)
+    image[:, :, 2] = 255  # red in BGR
+    return image
+
+class TestOptionsFromPreset:
+    def test_missing_keys_default_to_lossless_png(self):
+        assert options_from_preset({"url": "", "model": "", "key": ""}) == EncodingOptions()
+
+    def test_unknown_format_falls_back_to_png(self):
+        assert options_from_preset({"image_format": "bmp"}).format == "PNG"
+
+class TestDownscale:
+    def test_downscale_limits_long_edge(self, sample_image):
+        assert downscale(sample_image, max_long_edge=100).shape[:2] == (50, 100)
+
+    def test_downscale_limits_pixel_count(self, sample_image):
+        height, width = downscale(sample_image, max_pixels=20000).shape[:2]
+        assert height * width <= 20000
+
+    def test_downscale_never_upscales(self, sample_image):
+        assert downscale(sample_image, max_long_edge=1000) is sample_image
+
+class TestEncodeImage:
+    @pytest.mark.parametrize("image_format,mime_type", [
+        ("PNG", "image/png"),
+        ("JPEG", "image/jpeg"),
+        ("WEBP", "image/webp"),
+    ])
+    def test_encode_returns_matching_mime_type(self, sample_image, image_format, mime_type):
+        encoded, mime = encode_image(sample_image, EncodingOptions(image_format))
+        assert mime == mime_type
+        assert cv2.imdecode(np.frombuffer(encoded, np.uint8), cv2.IMREAD_UNCHANGED) is not None
+
+    def test_encode_png_keeps_bgr_channel_order(self, sample_image):
+        encoded, _ = encode_image(sample_image, EncodingOptions("PNG"))
+        decoded = cv2.imdecode(np.frombuffer(encoded, np.uint8), cv2.IMREAD_COLOR)
+        assert np.array_equal(decoded, sample_image)
+
+    def test_encode_grayscale_produces_single_channel(self, sample_image):
+        encoded, _ = encode_image(sample_image, EncodingOptions("PNG", grayscale=True))
+        decoded = cv2.imdecode(np.frombuffer(encoded, np.uint8), cv2.IMREAD_UNCHANGED)
+        assert decoded.ndim == 2
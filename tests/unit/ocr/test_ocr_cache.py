@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from OCR.ocr_cache import OcrCache, exact_hash, perceptual_hash, hamming_distance
+
+@pytest.fixture
+def text_image():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (40, 120, 3), dtype=np.uint8)
+
+class TestOcrCacheHashing:
+    def test_exact_hash_differs_for_different_shapes(self):
+        a = np.zeros((10, 20, 3), dtype=np.uint8)
+        b = np.zeros((20, 10, 3), dtype=np.uint8)
+        assert exact_hash(a) != exact_hash(b)
+
+    def test_exact_hash_handles_non_contiguous_views(self, text_image):
+        view = text_image[:, :, ::-1]
+        assert exact_hash(view) == exact_hash(view.copy())
+
+    def test_perceptual_hash_tolerates_small_noise(self, text_image):
+        noisy = np.clip(text_image.astype(int) + 2, 0, 255).astype(np.uint8)
+        assert hamming_distance(perceptual_hash(text_image), perceptual_hash(noisy)) <= 6
+
+class TestOcrCacheLookup:
+    def test_lookup_after_store_returns_text_and_counts_stats(self, text_image):
+        cache = OcrCache()
+        fingerprint = cache.fingerprint("Dummy", text_image)
+        assert cache.lookup(fingerprint) is None
+
+        cache.store(fingerprint, "text", elapsed=1.5)
+
+        assert cache.lookup(cache.fingerprint("Dummy", text_image)) == "text"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["saved_seconds"] == 1.5
+
+    def test_lookup_is_scoped_by_engine(self, text_image):
+        cache = OcrCache()
+        cache.store(cache.fingerprint("MangaOCR", text_image), "text", elapsed=1.0)
+
+        assert cache.lookup(cache.fingerprint("PaddleOCR", text_image)) is None
+
+    def test_empty_results_are_not_stored(self, text_image):
+        cache = OcrCache()
+        fingerprint = cache.fingerprint("Dummy", text_image)
+        cache.store(fingerprint, "", elapsed=1.0)
+        assert cache.lookup(fingerprint) is None
+
+    def test_perceptual_lookup_matches_similar_image(self, text_image):
+        cache = OcrCache(perceptual=True, tolerance=6)
+        cache.store(cache.fingerprint("Dummy", text_image), "text", elapsed=1.0)
+        noisy = np.clip(text_image.astype(int) + 2, 0, 255).astype(np.uint8)
+
+        assert cache.lookup(cache.fingerprint("Dummy", noisy)) == "text"
+        assert cache.stats()["perceptual_hits"] == 1
+
+    def test_from_settings_disabled_returns_none(self):
+        assert OcrCache.from_settings({"enabled": False}) is None
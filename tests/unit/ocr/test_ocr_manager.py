@@ -1,3 +1,4 @@
+import threading
 import pytest
 import numpy as np
 
@@ -34,9 +35,20 @@ class TestOcrManagerInit:
         manager = OcrManager("Dummy")
         assert manager.getCurrentEngine() == "Dummy"
 
-    def test_init_invalid_engine_raises_keyerror(self, mock_settings):
-        with pytest.raises(KeyError):
-            OcrManager("NonExistentEngine")
+    def test_init_unknown_engine_reports_failed_status(self, mock_settings, sample_image):
+        manager = OcrManager("NonExistentEngine")
+
+        assert manager.status().state == "failed"
+        assert "Unknown engine" in manager.status().error
+        with pytest.raises(RuntimeError):
+            manager.predict(sample_image)
+
+    def test_swap_from_unknown_engine_loads_new_one(self, mock_settings):
+        manager = OcrManager("NonExistentEngine")
+
+        manager.swap_engine("Dummy")
+
+        assert manager.status().is_ready
 
 
 class TestOcrManagerPredict:
@@ -46,6 +58,118 @@ class TestOcrManagerPredict:
 
         assert result == "Dummy OCR'd Text"
 
+    def test_predict_skips_engine_for_textless_image(self, mock_settings, sample_image, mocker):
+        manager = OcrManager("Dummy")
+        manager._current_engine.skip_textless = True
+        spy = mocker.spy(manager._current_engine, "predict")
+
+        result = manager.predict(sample_image)
+
+        assert result == ""
+        assert spy.call_count == 0
+
+    def test_predict_passes_preprocessed_image_to_engine(self, mock_settings, mocker):
+        manager = OcrManager("Dummy")
+        manager._preprocessing = {"engines": {"Dummy": "binarize"}}
+        spy = mocker.spy(manager._current_engine, "predict")
+        image = np.full((40, 40, 3), 30, dtype=np.uint8)
+        image[10:30, 10:30] = 200
+
+        manager.predict(image)
+
+        assert set(np.unique(spy.call_args.args[0])) == {0, 255}
+        assert manager._cache_scope("Dummy") == "Dummy/binarize"
+
+    def test_cache_scope_follows_preset_edits(self, mock_settings, mocker):
+        manager = OcrManager("Dummy")
+        mocker.patch.dict(OcrManager._engine_presets, {"Dummy": "p"})
+        mock_settings.get.return_value = {"p": {"model": "model-a"}}
+        scope = manager._cache_scope("Dummy")
+
+        mock_settings.get.return_value = {"p": {"model": "model-b"}}
+        assert manager._cache_scope("Dummy") != scope
+        mock_settings.get.return_value = {"p": {"model": "model-a", "image_format": "JPEG"}}
+        assert manager._cache_scope("Dummy") != scope
+
+    def test_prediction_uses_scope_of_pinned_engine_after_swap(self, mock_settings, mocker, sample_image):
+        manager = OcrManager("Dummy")
+        pinned = manager._pool.acquire("Dummy")
+        mocker.patch.dict(OcrManager._available_engines, {"Dummy2": DummyOcrEngine})
+        manager.swap_engine("Dummy2")
+        manager._preprocessing = {"engines": {"Dummy2": "binarize"}}
+        # Swap happened between pinning the engine and running it
+        mocker.patch.object(manager, "_ready_engine", return_value=pinned)
+        fingerprint = mocker.spy(manager._cache, "fingerprint")
+
+        manager.predict(sample_image)
+
+        assert fingerprint.call_args.args[0] == "Dummy"
+
+    def test_predict_same_image_twice_uses_cache(self, mock_settings, sample_image, mocker):
+        manager = OcrManager("Dummy")
+        spy = mocker.spy(manager._current_engine, "predict")
+
+        manager.predict(sample_image)
+        result = manager.predict(sample_image)
+
+        assert result == "Dummy OCR'd Text"
+        assert spy.call_count == 1
+        assert manager.cache_stats()["hits"] == 1
+
+
+    def test_predict_batch_sends_only_uncached_images_in_one_call(self, mock_settings, mocker):
+        manager = OcrManager("Dummy")
+        images = [np.full((20, 20, 3), value, dtype=np.uint8) for value in (0, 100, 200)]
+        manager.predict(images[1])
+        spy = mocker.spy(manager._current_engine, "predict_batch")
+
+        result = manager.predict_batch(images)
+
+        assert result == ["Dummy OCR'd Text"] * 3
+        assert spy.call_count == 1
+        assert len(spy.call_args.args[0]) == 2
+
+    def test_default_predict_batch_runs_predict_for_each_image(self, sample_image):
+        engine = DummyOcrEngine()
+        assert engine.predict_batch([sample_image, sample_image]) == ["Dummy OCR'd Text"] * 2
+
+
+class TestOcrManagerBackgroundLoad:
+    def test_lazy_manager_reports_loading_until_loaded(self, mock_settings):
+        manager = OcrManager("Dummy", load=False)
+        assert manager.status().state == "loading"
+
+        manager.load()
+
+        assert manager.status().state == "ready"
+        assert manager.status().load_time is not None
+
+    def test_predict_waits_for_engine_loaded_in_background(self, mock_settings, sample_image):
+        manager = OcrManager("Dummy", load=False)
+        loader = threading.Timer(0.05, manager.load)
+        loader.start()
+
+        assert manager.predict(sample_image) == "Dummy OCR'd Text"
+        loader.join()
+
+    def test_failed_engine_sets_status_and_predict_raises(self, mock_settings, mocker, sample_image):
+        failing_engine = mocker.MagicMock()
+        failing_engine.return_value.isWorking = False
+        OcrManager._registerEngine("FailingEngine", failing_engine)
+        statuses = []
+        try:
+            manager = OcrManager("FailingEngine", load=False)
+            manager.add_status_listener(lambda status: statuses.append(status.state))
+            with pytest.raises(RuntimeError):
+                manager.load()
+
+            assert manager.status().state == "failed"
+            assert statuses == ["failed"]
+            with pytest.raises(RuntimeError):
+                manager.predict(sample_image)
+        finally:
+            del OcrManager._available_engines["FailingEngine"]
+
 
 class TestOcrManagerAvailableEngines:
     def test_available_engines_includes_registered_engines(self, mock_settings):
@@ -83,6 +207,72 @@ class TestOcrManagerSwapEngine:
         assert manager.getCurrentEngine() == "MockEngine"
         
 
+    def test_swap_back_to_resident_engine_does_not_reload(self, mock_settings, mocker):
+        spy = mocker.spy(DummyOcrEngine, "_setupEngine")
+        manager = OcrManager("Dummy")
+        original_engine = manager._current_engine
+        manager._registerEngine("MockEngine", mocker.MagicMock())
+
+        try:
+            manager.swap_engine("MockEngine")
+            manager.swap_engine("Dummy")
+        finally:
+            del OcrManager._available_engines["MockEngine"]
+
+        assert spy.call_count == 1
+        assert manager._current_engine is original_engine
+        assert manager.resident_engines() == ["MockEngine", "Dummy"]
+
+    def test_swap_during_prediction_unloads_engine_after_it(self, mock_settings, mocker, sample_image):
+        mock_settings.get.return_value = {"max_engines": 1}
+        manager = OcrManager("Dummy")
+        engine = manager._current_engine
+        close = engine.close = mocker.MagicMock()
+        predicting = threading.Event()
+        finish = threading.Event()
+        def slow_predict(image):
+            predicting.set()
+            finish.wait(2)
+            return "text"
+        engine.predict = slow_predict
+        job = threading.Thread(target=manager.predict, args=(sample_image,))
+        job.start()
+        assert predicting.wait(2)
+
+        mocker.patch.dict(OcrManager._available_engines, {"Dummy2": DummyOcrEngine})
+        manager.swap_engine("Dummy2")  # only one engine fits, evicts "Dummy"
+        close.assert_not_called()
+        finish.set()
+        job.join(2)
+
+        close.assert_called_once()
+
+    def test_swap_unloads_least_recently_used_engine(self, mock_settings, mocker):
+        mock_settings.get.return_value = {"max_engines": 1}
+        manager = OcrManager("Dummy")
+        mock_engine = mocker.MagicMock()
+        manager._registerEngine("MockEngine", mock_engine)
+        try:
+            manager.swap_engine("MockEngine")
+        finally:
+            del OcrManager._available_engines["MockEngine"]
+
+        assert manager.resident_engines() == ["MockEngine"]
+
+    def test_failed_swap_keeps_resident_engines(self, mock_settings, mocker):
+        mock_settings.get.return_value = {"max_engines": 1}
+        manager = OcrManager("Dummy")
+        close = manager._current_engine.close = mocker.MagicMock()
+        broken = mocker.MagicMock(side_effect=ImportError("no module named 'broken'"))
+        mocker.patch.dict(OcrManager._available_engines, {"Broken": broken})
+
+        with pytest.raises(RuntimeError):
+            manager.swap_engine("Broken")
+
+        assert manager.resident_engines() == ["Dummy"]
+        close.assert_not_called()
+
+
 class TestOcrManagerRegisterPresetEngines:
     def test_registerPresetEngines_creates_openai_engines_from_settings(self, mock_settings):
         mock_settings.get.return_value = {
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from OCR.engines.paddleocr_engine import PaddleOcrEngine
+
+# Recognizers below run inside the worker process instead of real PaddleOCR
+FACTORY = f"{__name__}:FakeRecognizer"
+FAILING_FACTORY = f"{__name__}:FailingRecognizer"
+
+class FakeRecognizer:
+    def __init__(self, leak_mb=0):
+        self.leak_mb = leak_mb
+        self.leaked = []
+
+    def recognize(self, images):
+        self.leaked.append(bytearray(self.leak_mb * 1024 * 1024))
+        return [f"{image.shape[1]}x{image.shape[0]}" for image in images]
+
+class FailingRecognizer:
+    def __init__(self):
+        raise ImportError("no paddle here")
+
+@pytest.fixture
+def mock_settings(mocker):
+    mockSettings = mocker.patch('OCR.engines.paddleocr_engine.settings_service')
+    mockSettings.get.return_value = {"max_rss_growth_mb": 1}
+    return mockSettings
+
+@pytest.fixture
+def sample_image():
+    return np.zeros((20, 30, 3), dtype=np.uint8)
+
+class TestPaddleOcrEngineWorker:
+    def test_predict_runs_in_worker_process(self, mock_settings, sample_image):
+        engine = PaddleOcrEngine(factory=FACTORY)
+        try:
+            assert engine.isWorking is True
+            assert engine.predict(sample_image) == "30x20"
+            assert engine.memory_usage() is not None
+        finally:
+            engine.close()
+
+    def test_predict_batch_sends_all_images_in_one_request(self, mock_settings, sample_image):
+        engine = PaddleOcrEngine(factory=FACTORY)
+        try:
+            images = [sample_image, np.zeros((5, 7, 3), dtype=np.uint8)]
+            assert engine.predict_batch(images) == ["30x20", "7x5"]
+        finally:
+            engine.close()
+
+    def test_failed_worker_startup_marks_engine_not_working(self, mock_settings):
+        engine = PaddleOcrEngine(factory=FAILING_FACTORY)
+        assert engine.isWorking is False
+
+    def test_worker_is_replaced_after_rss_growth(self, mock_settings, sample_image):
+        engine = PaddleOcrEngine(factory=FACTORY, options={"leak_mb": 8})
+        try:
+            first_pid = engine._process.pid
+            engine.predict(sample_image)  # baseline
+            engine.predict(sample_image)  # grows over limit, standby starts warming up
+            assert engine._standby is not None
+
+            engine._standby.wait_ready(timeout=30)
+            assert engine.predict(sample_image) == "30x20"
+            assert engine._process.pid != first_pid
+        finally:
+            engine.close()
+
+    def test_dead_worker_reuses_warming_standby(self, mock_settings, sample_image, mocker):
+        engine = PaddleOcrEngine(factory=FACTORY)
+        try:
+            engine._spawn_standby("test")
+            standby = engine._standby
+            engine._process.state = "failed"
+            spawn = mocker.spy(engine, "_spawn_standby")
+
+            assert engine.predict(sample_image) == "30x20"
+            assert engine._process is standby
+            assert spawn.call_count == 0
+        finally:
+            engine.close()
+
+    def test_dead_worker_with_failing_replacement_raises(self, mock_settings, sample_image):
+        engine = PaddleOcrEngine(factory=FACTORY)
+        try:
+            engine._factory = FAILING_FACTORY
+            engine._process.state = "failed"
+
+            with pytest.raises(RuntimeError, match="replacement failed"):
+                engine.predict_batch([sample_image])
+            assert engine._standby is None
+        finally:
+            engine.close()
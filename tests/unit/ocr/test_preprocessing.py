@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+
+from OCR.preprocessing import Preprocessor, PROFILES, deskew, estimate_text_height
+
+def text_line(font_scale=1.0, angle=0):
+    image = np.full((120, 500), 255, dtype=np.uint8)
+    cv2.putText(image, "Hello there friend", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, font_scale, 0, 2)
+    if angle:
+        matrix = cv2.getRotationMatrix2D((250, 60), angle, 1.0)
+        image = cv2.warpAffine(image, matrix, (500, 120), borderValue=255)
+    return image
+
+def skew_angle(gray):
+    mask = cv2.bitwise_not(cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1])
+    (_, _), (width, height), angle = cv2.minAreaRect(cv2.findNonZero(mask))
+    angle = angle + 90 if width < height else angle
+    return (angle + 45) % 90 - 45
+
+class TestPreprocessingSteps:
+    def test_estimate_text_height_detects_light_text_on_dark(self):
+        dark = cv2.bitwise_not(text_line())
+
+        assert estimate_text_height(dark) == estimate_text_height(text_line())
+        assert 15 <= estimate_text_height(dark) <= 30
+
+    def test_estimate_text_height_of_blank_image_is_none(self):
+        assert estimate_text_height(np.full((50, 50), 255, dtype=np.uint8)) is None
+
+    def test_deskew_straightens_rotated_line(self):
+        assert abs(skew_angle(text_line(angle=6))) > 5
+
+        assert abs(skew_angle(deskew(text_line(angle=6)))) < 1
+
+class TestPreprocessor:
+    def test_none_profile_returns_image_untouched(self):
+        image = cv2.cvtColor(text_line(), cv2.COLOR_GRAY2BGR)
+
+        assert Preprocessor.from_profile("none", PROFILES["none"]).apply(image) is image
+
+    def test_scale_brings_small_text_to_target_height(self):
+        small = cv2.cvtColor(text_line(font_scale=0.4), cv2.COLOR_GRAY2BGR)
+        preprocessor = Preprocessor(text_height=32)
+
+        result = preprocessor.apply(small)
+
+        assert result.shape[1] > small.shape[1] * 2
+        assert abs(estimate_text_height(cv2.cvtColor(result, cv2.COLOR_BGR2GRAY)) - 32) <= 6
+
+    def test_binarize_profile_returns_black_text_on_white_bgr(self):
+        dark = cv2.cvtColor(cv2.bitwise_not(text_line()), cv2.COLOR_GRAY2BGR)
+
+        result = Preprocessor.from_profile("binarize", PROFILES["binarize"]).apply(dark)
+
+        assert result.ndim == 3 and result.shape[2] == 3
+        assert set(np.unique(result)) <= {0, 255}
+        assert np.count_nonzero(result == 255) > result.size // 2
+
+    def test_for_engine_uses_engine_profile_and_falls_back_to_default(self):
+        config = {"default": "scale", "engines": {"WindowsOCR": "mine"}, "profiles": {"mine": {"binarize": True}}}
+
+        assert Preprocessor.for_engine("WindowsOCR", config).binarize is True
+        assert Preprocessor.for_engine("MangaOCR", config).name == "scale"
+        assert Preprocessor.for_engine("MangaOCR", {"default": "missing"}).name == "none"
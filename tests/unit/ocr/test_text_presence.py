@@ -0,0 +1,41 @@
+import cv2
+import numpy as np
+
+from OCR.text_presence import TextPresenceChecker, describe
+
+def text_image():
+    image = np.full((80, 300, 3), 255, dtype=np.uint8)
+    cv2.putText(image, "Hello there", (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+    return image
+
+class TestTextPresenceChecker:
+    def test_image_with_text_passes(self):
+        presence = TextPresenceChecker().check(text_image())
+
+        assert presence.has_text is True
+        assert presence.edge_density > 0.002
+
+    def test_tiny_selection_is_skipped(self):
+        presence = TextPresenceChecker().check(text_image()[:5, :5])
+
+        assert presence.has_text is False
+        assert presence.reason == "too small"
+
+    def test_flat_color_is_skipped(self):
+        presence = TextPresenceChecker().check(np.full((200, 200, 3), 40, dtype=np.uint8))
+
+        assert presence.has_text is False
+        assert presence.reason == "flat color"
+
+    def test_smooth_gradient_is_skipped(self):
+        gradient = np.tile(np.linspace(0, 255, 400, dtype=np.uint8), (200, 1))
+
+        presence = TextPresenceChecker().check(gradient)
+
+        assert presence.has_text is False
+        assert presence.reason == "no edges"
+        assert "no text, no edges" in describe(presence)
+
+    def test_from_settings_can_disable_check(self):
+        assert TextPresenceChecker.from_settings({"enabled": False}) is None
+        assert TextPresenceChecker.from_settings({"min_std": 10}).min_std == 10.0
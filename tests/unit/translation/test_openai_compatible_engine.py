@@ -0,0 +1,86 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from Translation.engines.openai_compatible_engine import OpenAiCompatibleTranslationEngine
+from Util.rate_limiter import RateLimiter
+
+class FakeStream:
+    """Async stream of completion chunks, like AsyncOpenAI returns with stream=True"""
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def close(self):
+        self.closed = True
+
+class BadRequestError(Exception):
+    """Looks like openai.BadRequestError"""
+    status_code = 400
+
+def chunk(content=None, usage=None):
+    choices = [] if content is None else [SimpleNamespace(delta=SimpleNamespace(content=content))]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+@pytest.fixture
+def engine(mocker):
+    client = mocker.MagicMock()
+    mocker.patch("Translation.engines.openai_compatible_engine.openai_clients.acquire", return_value=client)
+    mocker.patch("Translation.engines.openai_compatible_engine.openai_clients.release")
+    engine = OpenAiCompatibleTranslationEngine(preset_name="default")
+    engine._limiter = RateLimiter()
+    return engine
+
+class TestOpenAiCompatibleTranslationEngineStream:
+    def test_chunks_are_delivered_on_calling_thread(self, engine, mocker):
+        stream = FakeStream([chunk("Hel"), chunk("lo")])
+        engine._client.chat.completions.create = mocker.AsyncMock(return_value=stream)
+        received = []
+        threads = set()
+
+        def on_chunk(text):
+            received.append(text)
+            threads.add(threading.current_thread())
+
+        complete = mocker.Mock()
+        engine.translate_stream("text", on_chunk, complete)
+
+        assert received == ["Hel", "lo"]
+        assert threads == {threading.current_thread()}
+        complete.assert_called_once()
+        assert stream.closed
+
+    def test_usage_from_last_chunk_corrects_token_budget(self, engine, mocker):
+        stream = FakeStream([chunk("Hi"), chunk(usage=SimpleNamespace(total_tokens=500))])
+        create = engine._client.chat.completions.create = mocker.AsyncMock(return_value=stream)
+        record = mocker.spy(engine._limiter, "record_usage")
+
+        engine.translate_stream("text", mocker.Mock())
+
+        assert create.call_args.kwargs["stream_options"] == {"include_usage": True}
+        record.assert_called_once_with(engine._estimate_tokens("text"), 500)
+
+    def test_server_rejecting_stream_options_streams_without_them(self, engine, mocker):
+        async def create(**kwargs):
+            if "stream_options" in kwargs:
+                raise BadRequestError("unknown field stream_options")
+            return FakeStream([chunk("Hi")])
+        create = engine._client.chat.completions.create = mocker.AsyncMock(side_effect=create)
+        record = mocker.spy(engine._limiter, "record_usage")
+        received = []
+
+        engine.translate_stream("text", received.append)
+        engine.translate_stream("text", received.append)
+
+        assert received == ["Hi", "Hi"]
+        # Rejected once, then remembered for the preset
+        assert ["stream_options" in call.kwargs for call in create.call_args_list] == [True, False, False]
+        record.assert_called_with(engine._estimate_tokens("text"), None)
@@ -0,0 +1,49 @@
+from Translation.translation_cache import TranslationCache, normalize_text
+
+class TestNormalizeText:
+    def test_normalize_collapses_whitespace_and_keeps_lines(self):
+        assert normalize_text("  foo   bar \n\n baz  ") == "foo bar\nbaz"
+
+class TestTranslationCache:
+    def test_make_key_ignores_whitespace_differences(self):
+        a = TranslationCache.make_key("Dummy", {}, "foo  bar")
+        b = TranslationCache.make_key("Dummy", {}, " foo bar ")
+        assert a == b
+
+    def test_make_key_depends_on_engine_and_params(self):
+        base = TranslationCache.make_key("Dummy", {"target_lang": "en"}, "text")
+        assert base != TranslationCache.make_key("Other", {"target_lang": "en"}, "text")
+        assert base != TranslationCache.make_key("Dummy", {"target_lang": "pl"}, "text")
+
+    def test_get_after_put_returns_result_and_counts_stats(self):
+        cache = TranslationCache()
+        key = TranslationCache.make_key("Dummy", {}, "text")
+        assert cache.get(key) is None
+
+        cache.put(key, "translated")
+
+        assert cache.get(key) == "translated"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_persisted_cache_survives_restart(self, tmp_path):
+        path = str(tmp_path / "translation_cache.json")
+        key = TranslationCache.make_key("Dummy", {}, "text")
+        cache = TranslationCache(path=path)
+        cache.put(key, "translated")
+        cache.save()
+
+        assert TranslationCache(path=path).get(key) == "translated"
+
+    def test_save_later_writes_once_after_burst(self, tmp_path, mocker):
+        path = str(tmp_path / "translation_cache.json")
+        cache = TranslationCache(path=path, write_delay=0.05)
+        write = mocker.spy(cache._store, "save")
+        for i in range(5):
+            cache.put(TranslationCache.make_key("Dummy", {}, str(i)), "translated")
+            cache.save_later()
+
+        assert write.call_count == 0
+        cache._save_timer.join(1)
+        assert write.call_count == 1
+        assert TranslationCache(path=path).stats()["entries"] == 5
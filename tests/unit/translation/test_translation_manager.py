@@ -1,5 +1,7 @@
+import threading
 import pytest
 
+from Translation.engines.abstract_engine import AbstractTranslationEngine
 from Translation.translation_manager import TranslationManager, TranslationSignals
 
 @pytest.fixture
@@ -51,6 +53,36 @@ class TestTranslationManagerUpdateActiveEngines:
 
         del manager._available_engines["MockEngine"]
 
+class TestTranslationManagerBackgroundLoad:
+    def test_translate_before_load_is_queued_until_engines_are_ready(self, mock_settings, mocker):
+        manager = TranslationManager(["Dummy"], TranslationSignals(), load=False)
+        spy = mocker.spy(manager.threadpool, 'start')
+        assert [status.state for status in manager.statuses()] == ["loading"]
+
+        manager.translate("Hello")
+        assert spy.call_count == 0
+
+        manager.load()
+
+        assert spy.call_count == 1
+        assert [status.state for status in manager.statuses()] == ["ready"]
+
+    def test_failed_engine_reports_error_on_translate(self, mock_settings, mocker, qtbot):
+        mock_engine = mocker.MagicMock()
+        mock_engine.return_value.isWorking = False
+        manager = TranslationManager([], TranslationSignals())
+        manager._available_engines["MockEngine"] = mock_engine
+        try:
+            manager.update_active_engines(["MockEngine"])
+            assert manager.engine_names() == ["MockEngine"]
+            assert manager.statuses()[0].state == "failed"
+
+            with qtbot.waitSignal(manager.signals.translationError) as blocker:
+                request_id = manager.translate("Hello")
+            assert blocker.args[:2] == [request_id, "MockEngine"]
+        finally:
+            del manager._available_engines["MockEngine"]
+
 class TestTranslationManagerTranslate:
     def test_translate_starts_thread_for_every_loaded_engine(self, mocker, mock_settings):
         manager = TranslationManager(["Dummy"], TranslationSignals())
@@ -89,6 +121,271 @@ class TestTranslationManagerTranslate:
         
         assert result is None
 
+    def test_translate_same_text_twice_replays_cached_result(self, mocker, mock_settings, qtbot):
+        signals = TranslationSignals()
+        manager = TranslationManager(["Dummy"], signals)
+
+        with qtbot.waitSignal(signals.translationReady, timeout=2000):
+            manager.translate("text")
+
+        spy = mocker.spy(manager.threadpool, "start")
+        with qtbot.waitSignal(signals.translationReady, timeout=2000) as blocker:
+            request_id = manager.translate("text")
+
+        assert blocker.args == [request_id, "Dummy", "This is dummy translation"]
+        assert spy.call_count == 0
+        assert manager.cache_stats()["hits"] == 1
+
+    def test_translate_without_cache_starts_thread_even_when_cached(self, mocker, mock_settings, qtbot):
+        signals = TranslationSignals()
+        manager = TranslationManager(["Dummy"], signals)
+        with qtbot.waitSignal(signals.translationReady, timeout=2000):
+            manager.translate("text")
+
+        spy = mocker.spy(manager.threadpool, "start")
+        manager.translate("text", use_cache=False)
+
+        assert spy.call_count == 1
+
+class BlockingStreamEngine(AbstractTranslationEngine):
+    """Streams first chunk, then waits for `release` before finishing"""
+    release = None
+    calls = 0
+    aborted = 0
+
+    def _setupEngine(self, **kwargs):
+        pass
+
+    def translate(self, text):
+        return "Hello"
+
+    @property
+    def supports_streaming(self):
+        return True
+
+    def translate_stream(self, text, chunk_callback, complete_callback=None, cancel_token=None):
+        type(self).calls += 1
+        chunk_callback("Hel")
+        if cancel_token is not None:
+            cancel_token.on_cancel(self.release.set)
+        self.release.wait(2)
+        if cancel_token is not None and cancel_token.cancelled:
+            type(self).aborted += 1
+            return
+        chunk_callback("lo")
+        complete_callback()
+
+@pytest.fixture
+def stream_engine():
+    BlockingStreamEngine.release = threading.Event()
+    BlockingStreamEngine.calls = 0
+    BlockingStreamEngine.aborted = 0
+    TranslationManager._available_engines["BlockingStream"] = BlockingStreamEngine
+    yield BlockingStreamEngine
+    BlockingStreamEngine.release.set()
+    del TranslationManager._available_engines["BlockingStream"]
+
+class PausingStreamEngine(BlockingStreamEngine):
+    """Sends two chunks right after each other, then pauses until `release`"""
+    def translate_stream(self, text, chunk_callback, complete_callback=None, cancel_token=None):
+        chunk_callback("Hel")
+        chunk_callback("lo")
+        self.release.wait(2)
+        complete_callback()
+
+class TestTranslationWorkerChunkBatching:
+    def test_batched_chunk_is_sent_while_stream_pauses(self, mock_settings, stream_engine, qtbot):
+        TranslationManager._available_engines["Pausing"] = PausingStreamEngine
+        try:
+            signals = TranslationSignals()
+            manager = TranslationManager(["Pausing"], signals)
+            received = []
+            signals.translationChunk.connect(lambda request_id, engine, chunk: received.append(chunk))
+
+            manager.translate("text", use_cache=False)
+
+            # Second chunk came within batch interval, it must not wait for the stream to go on
+            qtbot.waitUntil(lambda: "".join(received) == "Hello", timeout=1000)
+            with qtbot.waitSignal(signals.translationComplete, timeout=2000):
+                stream_engine.release.set()
+        finally:
+            del TranslationManager._available_engines["Pausing"]
+
+class TestTranslationManagerSingleFlight:
+    def test_identical_request_attaches_to_running_one(self, mock_settings, stream_engine, qtbot):
+        signals = TranslationSignals()
+        manager = TranslationManager(["BlockingStream"], signals)
+        with qtbot.waitSignal(signals.translationChunk, timeout=2000):
+            manager.translate("text")
+
+        # Second request gets what was streamed so far, then shares live chunks
+        with qtbot.waitSignal(signals.translationChunk, timeout=2000) as blocker:
+            request_id = manager.translate("text", use_cache=False)
+        assert blocker.args == [request_id, "BlockingStream", "Hel"]
+
+        with qtbot.waitSignal(signals.translationComplete, timeout=2000):
+            stream_engine.release.set()
+        assert stream_engine.calls == 1
+
+    def test_different_text_starts_own_request(self, mock_settings, stream_engine, mocker):
+        manager = TranslationManager(["BlockingStream"], TranslationSignals())
+        spy = mocker.spy(manager.threadpool, "start")
+
+        manager.translate("text")
+        manager.translate("other text")
+
+        assert spy.call_count == 2
+
+    def test_finished_request_is_no_longer_joined(self, mock_settings, mocker, qtbot):
+        signals = TranslationSignals()
+        manager = TranslationManager(["Dummy"], signals)
+        with qtbot.waitSignal(signals.translationReady, timeout=2000):
+            manager.translate("text")
+        qtbot.waitUntil(lambda: not manager._in_flight, timeout=1000)
+
+        spy = mocker.spy(manager.threadpool, "start")
+        manager.translate("text", use_cache=False)
+
+        assert spy.call_count == 1
+
+class TestTranslationManagerCancel:
+    def test_cancel_aborts_running_stream(self, mock_settings, stream_engine, qtbot):
+        signals = TranslationSignals()
+        manager = TranslationManager(["BlockingStream"], signals)
+        with qtbot.waitSignal(signals.translationChunk, timeout=2000):
+            request_id = manager.translate("text")
+
+        manager.cancel(request_id)
+
+        qtbot.waitUntil(lambda: stream_engine.aborted == 1, timeout=1000)
+        qtbot.waitUntil(lambda: not manager._in_flight and not manager._requests, timeout=1000)
+
+    def test_cancel_all_aborts_running_streams(self, mock_settings, stream_engine, qtbot):
+        signals = TranslationSignals()
+        manager = TranslationManager(["BlockingStream"], signals)
+        with qtbot.waitSignal(signals.translationChunk, timeout=2000):
+            manager.translate("text")
+
+        manager.cancel_all()
+
+        qtbot.waitUntil(lambda: stream_engine.aborted == 1, timeout=1000)
+        qtbot.waitUntil(lambda: not manager._in_flight and not manager._requests, timeout=1000)
+
+    def test_cancelled_request_gets_no_more_signals(self, mock_settings, stream_engine, qtbot):
+        signals = TranslationSignals()
+        manager = TranslationManager(["BlockingStream"], signals)
+        with qtbot.waitSignal(signals.translationChunk, timeout=2000):
+            first = manager.translate("text")
+        second = manager.translate("text", use_cache=False)
+        received = []
+        signals.translationChunk.connect(lambda request_id, engine, chunk: received.append(request_id))
+
+        # Still one request waiting, stream keeps going for it
+        manager.cancel(first)
+        with qtbot.waitSignal(signals.translationComplete, timeout=2000) as blocker:
+            stream_engine.release.set()
+
+        assert blocker.args == [second, "BlockingStream"]
+        assert stream_engine.aborted == 0
+        assert first not in received
+
+    def test_cancel_takes_queued_request_out_of_threadpool(self, mock_settings, mocker):
+        manager = TranslationManager(["Dummy"], TranslationSignals())
+        mocker.patch.object(manager.threadpool, "start")
+        take = mocker.patch.object(manager.threadpool, "tryTake", return_value=True)
+
+        request_id = manager.translate("text")
+        manager.cancel(request_id)
+
+        take.assert_called_once()
+        assert manager._in_flight == {}
+        assert manager._requests == {}
+
+    def test_cancel_before_load_drops_deferred_request(self, mock_settings, mocker):
+        manager = TranslationManager(["Dummy"], TranslationSignals(), load=False)
+        spy = mocker.spy(manager.threadpool, "start")
+
+        manager.cancel(manager.translate("Hello"))
+        manager.load()
+
+        assert spy.call_count == 0
+
+class SilentStreamEngine(BlockingStreamEngine):
+    """Sends nothing until `release` (or cancel)"""
+    def translate_stream(self, text, chunk_callback, complete_callback=None, cancel_token=None):
+        type(self).calls += 1
+        if cancel_token is not None:
+            cancel_token.on_cancel(self.release.set)
+        self.release.wait(2)
+        if cancel_token is not None and cancel_token.cancelled:
+            type(self).aborted += 1
+            return
+        chunk_callback("Hello")
+        complete_callback()
+
+class FailingEngine(AbstractTranslationEngine):
+    def _setupEngine(self, **kwargs):
+        pass
+
+    def translate(self, text):
+        raise RuntimeError("503 Service Unavailable")
+
+@pytest.fixture
+def failover_engines():
+    SilentStreamEngine.release = threading.Event()
+    SilentStreamEngine.calls = 0
+    SilentStreamEngine.aborted = 0
+    TranslationManager._available_engines["Silent"] = SilentStreamEngine
+    TranslationManager._available_engines["Failing"] = FailingEngine
+    yield SilentStreamEngine
+    SilentStreamEngine.release.set()
+    del TranslationManager._available_engines["Silent"]
+    del TranslationManager._available_engines["Failing"]
+
+def enable_failover(mock_settings, primary, fallback, deadline_ms):
+    config = {"enabled": True, "primary": primary, "fallback": fallback, "deadline_ms": deadline_ms}
+    mock_settings.get.side_effect = lambda key: config if key == "translation_failover" else {}
+
+class TestTranslationManagerFailover:
+    def test_fallback_starts_after_deadline_and_wins(self, mock_settings, failover_engines, qtbot):
+        enable_failover(mock_settings, "Silent", "Dummy", 50)
+        signals = TranslationSignals()
+        manager = TranslationManager(["Silent", "Dummy"], signals)
+
+        with qtbot.waitSignal(signals.translationFailover, timeout=2000) as blocker:
+            request_id = manager.translate("late text", use_cache=False)
+
+        assert blocker.args == [request_id, "Dummy", "Silent"]
+        qtbot.waitUntil(lambda: failover_engines.aborted == 1, timeout=1000)
+        record = manager.failover_history()[-1]
+        assert record["winner"] == "Dummy"
+        assert record["deadline_ms"] == 50
+        assert record["fallback_started_ms"] >= 50
+
+    def test_fallback_is_not_started_when_primary_answers_in_time(self, mock_settings, failover_engines, qtbot):
+        enable_failover(mock_settings, "Dummy", "Silent", 1000)
+        signals = TranslationSignals()
+        manager = TranslationManager(["Dummy", "Silent"], signals)
+
+        with qtbot.waitSignal(signals.translationFailover, timeout=2000) as blocker:
+            request_id = manager.translate("quick text", use_cache=False)
+
+        assert blocker.args == [request_id, "Dummy", "Silent"]
+        assert failover_engines.calls == 0
+        assert manager.failover_history()[-1]["fallback_started_ms"] is None
+
+    def test_primary_error_starts_fallback_right_away(self, mock_settings, failover_engines, qtbot):
+        enable_failover(mock_settings, "Failing", "Dummy", 5000)
+        signals = TranslationSignals()
+        manager = TranslationManager(["Failing", "Dummy"], signals)
+
+        with qtbot.waitSignal(signals.translationFailover, timeout=2000) as blocker:
+            request_id = manager.translate("text", use_cache=False)
+
+        assert blocker.args == [request_id, "Dummy", "Failing"]
+        assert manager.failover_history()[-1]["fallback_started_ms"] < 5000
+        assert manager._races == {}
+
 class TestTranslationManagerAvailableEngines:
     def test_available_engines_includes_registered_engines(self, mock_settings):
         manager = TranslationManager(["Dummy"])
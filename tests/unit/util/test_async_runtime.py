@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import pytest
+
+from Util.async_runtime import AsyncRuntime
+from Util.cancellation import CancelToken
+
+@pytest.fixture
+def runtime():
+    runtime = AsyncRuntime()
+    yield runtime
+    runtime.shutdown()
+
+class TestAsyncRuntime:
+    def test_run_returns_result_and_raises_errors(self, runtime):
+        async def double(x):
+            return x * 2
+
+        async def fail():
+            raise ValueError("boom")
+
+        assert runtime.run(double(21)) == 42
+        with pytest.raises(ValueError):
+            runtime.run(fail())
+
+    def test_calls_from_many_threads_share_one_loop(self, runtime):
+        async def loop_thread():
+            await asyncio.sleep(0.2)
+            return threading.current_thread()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(4) as executor:
+            threads = list(executor.map(lambda _: runtime.run(loop_thread()), range(4)))
+
+        # Concurrent, not one after another
+        assert time.perf_counter() - start < 0.6
+        assert len(set(threads)) == 1
+        assert threads[0] is not threading.current_thread()
+
+    def test_cancel_token_cancels_coroutine(self, runtime):
+        token = CancelToken()
+        finished = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                finished.set()
+                raise
+
+        threading.Timer(0.05, token.cancel).start()
+        with pytest.raises(CancelledError):
+            runtime.run(slow(), cancel_token=token)
+        assert finished.wait(1)
+
+    def test_run_from_loop_thread_raises(self, runtime):
+        async def nested():
+            return runtime.run(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError):
+            runtime.run(nested())
+
+    def test_shutdown_stops_loop_and_refuses_new_work(self, runtime):
+        first = runtime.loop
+        runtime.shutdown()
+
+        assert first.is_closed()
+        assert runtime.closed
+        coro = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            runtime.run(coro)
+        # Refused coroutine is closed, not left to warn about never being awaited
+        assert coro.cr_frame is None
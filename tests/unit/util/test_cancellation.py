@@ -0,0 +1,22 @@
+from Util.cancellation import CancelToken
+
+class TestCancelToken:
+    def test_cancel_runs_callbacks_once(self):
+        token = CancelToken()
+        calls = []
+        token.on_cancel(lambda: calls.append(1))
+
+        token.cancel()
+        token.cancel()
+
+        assert token.cancelled is True
+        assert calls == [1]
+
+    def test_callback_registered_after_cancel_runs_right_away(self):
+        token = CancelToken()
+        token.cancel()
+        calls = []
+
+        token.on_cancel(lambda: calls.append(1))
+
+        assert calls == [1]
@@ -0,0 +1,63 @@
+import pytest
+
+from Util.openai_clients import OpenAiClientRegistry
+
+@pytest.fixture
+def registry(mocker):
+    registry = OpenAiClientRegistry()
+    mocker.patch.object(registry, "_create_client", side_effect=lambda url, key: mocker.MagicMock(name=f"{url}:{key}"))
+    mocker.patch.object(registry, "_create_async_client", side_effect=lambda url, key: mocker.AsyncMock(name=f"async {url}:{key}"))
+    return registry
+
+class TestOpenAiClientRegistry:
+    def test_acquire_same_endpoint_shares_client(self, registry):
+        a = registry.acquire("http://localhost/v1", "key")
+        b = registry.acquire("http://localhost/v1", "key")
+
+        assert a is b
+        assert registry._create_client.call_count == 1
+
+    def test_acquire_different_key_creates_new_client(self, registry):
+        a = registry.acquire("http://localhost/v1", "key1")
+        b = registry.acquire("http://localhost/v1", "key2")
+
+        assert a is not b
+        assert len(registry) == 2
+
+    def test_release_closes_client_only_after_last_user(self, registry):
+        client = registry.acquire("http://localhost/v1", "key")
+        registry.acquire("http://localhost/v1", "key")
+
+        registry.release("http://localhost/v1", "key")
+        client.close.assert_not_called()
+
+        registry.release("http://localhost/v1", "key")
+        client.close.assert_called_once()
+        assert len(registry) == 0
+
+    def test_release_unknown_endpoint_does_nothing(self, registry):
+        registry.release("http://unknown/v1", "key")
+        assert len(registry) == 0
+
+    def test_async_client_is_separate_and_closed_on_runtime_loop(self, registry, mocker):
+        submit = mocker.patch("Util.openai_clients.async_runtime.submit", side_effect=lambda coro: coro.close())
+        sync_client = registry.acquire("http://localhost/v1", "key")
+        async_client = registry.acquire("http://localhost/v1", "key", async_client=True)
+
+        assert async_client is not sync_client
+        assert registry._create_async_client.call_count == 1
+
+        registry.release("http://localhost/v1", "key", async_client=True)
+        async_client.close.assert_called_once()
+        submit.assert_called_once()
+        sync_client.close.assert_not_called()
+
+    def test_async_client_released_after_runtime_shutdown_is_dropped(self, registry, mocker):
+        mocker.patch("Util.openai_clients.async_runtime._closed", True)
+        submit = mocker.patch("Util.openai_clients.async_runtime.submit")
+        registry.acquire("http://localhost/v1", "key", async_client=True)
+
+        registry.release("http://localhost/v1", "key", async_client=True)
+
+        submit.assert_not_called()
+        assert len(registry) == 0
@@ -0,0 +1,43 @@
+from Util.persistent_lru import PersistentLruCache
+
+class TestPersistentLruCacheEviction:
+    def test_put_evicts_least_recently_used_over_entry_limit(self):
+        cache = PersistentLruCache(max_entries=2)
+        cache.put("a", 1, 1)
+        cache.put("b", 2, 1)
+        cache.get("a")
+        cache.put("c", 3, 1)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_put_evicts_over_byte_limit(self):
+        cache = PersistentLruCache(max_entries=10, max_bytes=10)
+        cache.put("a", 1, 6)
+        cache.put("b", 2, 6)
+
+        assert "a" not in cache
+        assert cache.total_bytes == 6
+
+    def test_put_ignores_value_bigger_than_limit(self):
+        cache = PersistentLruCache(max_bytes=10)
+        cache.put("a", 1, 11)
+        assert len(cache) == 0
+
+class TestPersistentLruCachePersistence:
+    def test_save_and_load_roundtrip(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+        cache = PersistentLruCache(path=path)
+        cache.put("a", {"text": "hello"}, 5)
+        cache.save()
+
+        loaded = PersistentLruCache(path=path)
+        assert loaded.get("a") == {"text": "hello"}
+
+    def test_load_corrupted_file_starts_empty(self, tmp_path):
+        path = tmp_path / "cache.json"
+        path.write_text("{not json", encoding="utf-8")
+
+        cache = PersistentLruCache(path=str(path))
+        assert len(cache) == 0
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from Util.rate_limiter import RateLimiter, RetryPolicy, call_with_retry, parse_retry_after
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+class ApiError(Exception):
+    """Looks like openai.APIStatusError"""
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+class TestRateLimiter:
+    def test_requests_wait_once_burst_is_used(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=60, clock=clock)  # 1/s, burst 10
+
+        delays = [limiter.reserve() for _ in range(12)]
+
+        assert delays[:10] == [0.0] * 10
+        assert delays[10:] == pytest.approx([1.0, 2.0])
+        clock.now += 5
+        assert limiter.reserve() == pytest.approx(0.0)
+
+    def test_tokens_per_minute_limit(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=600, clock=clock)  # 10/s, burst 100
+
+        assert limiter.reserve(80) == 0.0
+        assert limiter.reserve(40) == pytest.approx(2.0)
+
+    def test_usage_correction_and_pause(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=600, clock=clock)
+        limiter.reserve(10)
+        limiter.record_usage(10, 100)
+
+        assert limiter.reserve(10) == pytest.approx(1.0)
+
+        limiter = RateLimiter(clock=clock)
+        limiter.pause(3)
+        assert limiter.reserve() == pytest.approx(3.0)
+
+class TestRetry:
+    def test_parse_retry_after(self):
+        assert parse_retry_after({"retry-after": "7"}) == 7.0
+        assert parse_retry_after({"retry-after-ms": "1500", "retry-after": "7"}) == 1.5
+        assert parse_retry_after({"retry-after": "Thu, 01 Jan 1970 00:01:40 GMT"}, now=90) == pytest.approx(10.0)
+        assert parse_retry_after({"retry-after": "soon"}) is None
+        assert parse_retry_after({}) is None
+
+    def test_delay_honors_retry_after_and_gives_up(self):
+        policy = RetryPolicy(max_retries=2, base_delay=1.0)
+
+        assert 5.0 <= policy.delay(ApiError(429, {"retry-after": "5"}), 0) <= 5.5
+        assert 0.0 <= policy.delay(ApiError(503), 1) <= 2.0
+        assert policy.delay(ApiError(503), 2) is None
+        assert policy.delay(ApiError(400), 0) is None
+        assert policy.delay(ValueError("bug"), 0) is None
+
+    def test_call_with_retry_retries_429_through_limiter(self):
+        limiter = RateLimiter()
+        responses = [ApiError(429, {"retry-after-ms": "10"}), ApiError(502, {"retry-after-ms": "10"}), "ok"]
+        calls = []
+
+        async def request():
+            calls.append(1)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        assert asyncio.run(call_with_retry(request, limiter, policy=RetryPolicy(max_retries=3))) == "ok"
+        assert len(calls) == 3
+
+    def test_failed_attempts_give_back_their_reservation(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=600, clock=clock)  # burst 100 tokens
+        responses = [ApiError(502, {"retry-after-ms": "10"}), "ok"]
+
+        async def request():
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        assert asyncio.run(call_with_retry(request, limiter, tokens=80)) == "ok"
+        # Only the successful attempt keeps its 80 tokens
+        assert limiter.reserve(20) == 0.0
+
+        async def failing():
+            raise ApiError(401)
+
+        limiter = RateLimiter(tokens_per_minute=600, clock=clock)
+        with pytest.raises(ApiError):
+            asyncio.run(call_with_retry(failing, limiter, tokens=80))
+        assert limiter.reserve(100) == 0.0
+
+    def test_call_with_retry_raises_non_retryable_error(self):
+        async def request():
+            raise ApiError(401)
+
+        with pytest.raises(ApiError):
+            asyncio.run(call_with_retry(request, RateLimiter()))